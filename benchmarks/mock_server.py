@@ -0,0 +1,287 @@
+"""Local stand-in for the Jira Cloud REST API and the Atlassian Organization API.
+
+Serves an in-memory tenant so the app can be exercised and benchmarked
+without a live site:
+
+    GET    /rest/api/3/myself
+    GET    /rest/api/3/users/search          startAt / maxResults paging
+    GET    /rest/api/3/group/bulk            startAt / maxResults, isLast
+    GET    /rest/api/3/group/member          groupname, startAt / maxResults, isLast
+    POST   /rest/api/3/group/user            groupname, {"accountId": ...}
+    DELETE /rest/api/3/group/user            groupname, accountId
+    GET    /rest/api/3/user/groups           accountId
+    GET    /admin/v1/orgs
+    GET    /admin/v1/orgs/{orgId}/users      cursor paging via links.next
+    POST   /users/{accountId}/manage/lifecycle/disable|enable
+
+Knobs: fixed + jittered latency per request, page size caps and 429
+injection (every Nth request, with a Retry-After header).
+
+Datasets come from tenant_generator.py (generated on the fly from a seed,
+or loaded from a file it wrote). Run standalone with
+`python benchmarks/mock_server.py --users 10000` and point the app's Jira
+URL at the printed address.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from tenant_generator import generate_tenant, jira_user, load_dataset
+
+ORG_ID = "mock-org-0001"
+
+
+class MockJiraServer:
+    """Threaded HTTP server holding one mock tenant"""
+
+    def __init__(self, dataset, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0,
+                 page_cap=None, org_page_size=100, rate_limit_every=0, retry_after=1, seed=1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.page_cap = page_cap  # max items per page regardless of maxResults
+        self.org_page_size = org_page_size
+        self.rate_limit_every = rate_limit_every  # 429 on every Nth request (0 = never)
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = Counter()  # "METHOD /path" -> count
+        self.rate_limited = 0
+        self._request_count = 0
+        self.load(dataset)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    def load(self, dataset):
+        with self._lock:
+            self.org_users = dataset["org_users"]
+            self.users_by_id = {u["account_id"]: u for u in self.org_users}
+            self.groups = dataset["groups"]
+            self.members = {name: list(ids) for name, ids in dataset["members"].items()}
+            self.member_sets = {name: set(ids) for name, ids in self.members.items()}
+            for g in self.groups:
+                g["memberCount"] = len(self.members.get(g["name"], ()))
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-jira", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -- request handling -- #
+    def _page_size(self, requested, default):
+        size = requested or default
+        if self.page_cap:
+            size = min(size, self.page_cap)
+        return max(1, size)
+
+    def _before_request(self, key):
+        """Count, delay and maybe rate-limit a request; returns True if it should get a 429"""
+        with self._lock:
+            self.requests[key] += 1
+            self._request_count += 1
+            throttle = self.rate_limit_every and self._request_count % self.rate_limit_every == 0
+            if throttle:
+                self.rate_limited += 1
+            delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+        return throttle
+
+    def handle(self, method, path, query, body):
+        """Route one request; returns (status, payload or None)"""
+        q = {k: v[0] for k, v in parse_qs(query).items()}
+        parts = [p for p in path.split("/") if p]
+
+        if path == "/rest/api/3/myself" and method == "GET":
+            return 200, {"accountId": "mock-admin", "displayName": "Mock Admin", "active": True}
+
+        if path == "/rest/api/3/users/search" and method == "GET":
+            start = int(q.get("startAt", 0))
+            size = self._page_size(int(q.get("maxResults", 50)), 50)
+            return 200, [jira_user(u) for u in self.org_users[start:start + size]]
+
+        if path == "/rest/api/3/group/bulk" and method == "GET":
+            start = int(q.get("startAt", 0))
+            size = self._page_size(int(q.get("maxResults", 50)), 50)
+            page = self.groups[start:start + size]
+            return 200, {
+                "startAt": start,
+                "maxResults": size,
+                "total": len(self.groups),
+                "isLast": start + size >= len(self.groups),
+                "values": [dict(g) for g in page],
+            }
+
+        if path == "/rest/api/3/group/member" and method == "GET":
+            name = q.get("groupname", "")
+            if name not in self.members:
+                return 404, {"errorMessages": [f"Group '{name}' does not exist."]}
+            ids = self.members[name]
+            start = int(q.get("startAt", 0))
+            size = self._page_size(int(q.get("maxResults", 50)), 50)
+            return 200, {
+                "startAt": start,
+                "maxResults": size,
+                "total": len(ids),
+                "isLast": start + size >= len(ids),
+                "values": [jira_user(self.users_by_id[a]) for a in ids[start:start + size]],
+            }
+
+        if path == "/rest/api/3/group/user" and method in ("POST", "DELETE"):
+            name = q.get("groupname", "")
+            if name not in self.members:
+                return 404, {"errorMessages": [f"Group '{name}' does not exist."]}
+            account_id = q.get("accountId") or (json.loads(body or b"{}").get("accountId"))
+            if account_id not in self.users_by_id:
+                return 404, {"errorMessages": ["User does not exist."]}
+            with self._lock:
+                members = self.member_sets[name]
+                if method == "POST":
+                    if account_id in members:
+                        return 400, {"errorMessages": ["Cannot add user. User is already a member of '%s'" % name]}
+                    members.add(account_id)
+                    self.members[name].append(account_id)
+                    return 201, {"name": name}
+                if account_id not in members:
+                    return 400, {"errorMessages": ["Cannot remove user. User is not a member of '%s'" % name]}
+                members.discard(account_id)
+                self.members[name].remove(account_id)
+                return 200, None
+
+        if path == "/rest/api/3/user/groups" and method == "GET":
+            account_id = q.get("accountId", "")
+            if account_id not in self.users_by_id:
+                return 404, {"errorMessages": ["User does not exist."]}
+            with self._lock:
+                return 200, [
+                    {"name": g["name"], "groupId": g.get("groupId")}
+                    for g in self.groups if account_id in self.member_sets.get(g["name"], ())
+                ]
+
+        if path.rstrip("/") == "/admin/v1/orgs" and method == "GET":
+            return 200, {"data": [{"id": ORG_ID, "type": "orgs", "attributes": {"name": "Mock Org"}}]}
+
+        if len(parts) == 5 and parts[:3] == ["admin", "v1", "orgs"] and parts[4] == "users" and method == "GET":
+            if parts[3] != ORG_ID:
+                return 404, {"errors": [{"title": "Organization not found"}]}
+            start = int(q.get("cursor", 0) or 0)
+            size = self._page_size(self.org_page_size, self.org_page_size)
+            page = self.org_users[start:start + size]
+            links = {"self": f"{self.url}{path}"}
+            if start + size < len(self.org_users):
+                links["next"] = f"{self.url}{path}?cursor={start + size}"
+            return 200, {"data": page, "links": links}
+
+        if len(parts) == 5 and parts[0] == "users" and parts[2:4] == ["manage", "lifecycle"] and method == "POST":
+            user = self.users_by_id.get(parts[1])
+            if user is None:
+                return 404, {"errors": [{"title": "User not found"}]}
+            if parts[4] not in ("disable", "enable"):
+                return 404, None
+            with self._lock:
+                user["account_status"] = "inactive" if parts[4] == "disable" else "active"
+            return 204, None
+
+        return 404, {"errorMessages": [f"No mock route for {method} {path}"]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if server._before_request(f"{method} {parts.path}"):
+                    self._send(429, {"errorMessages": ["Rate limit exceeded"]}, {"Retry-After": str(server.retry_after)})
+                    return
+                status, payload = server.handle(method, parts.path, parts.query, body)
+                self._send(status, payload)
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run a mock Jira / Organization API server")
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--groups", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--dataset", default=None, help="dataset file written by tenant_generator.py")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency-ms", type=float, default=0)
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--page-cap", type=int, default=None)
+    ap.add_argument("--org-page-size", type=int, default=100)
+    ap.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    ap.add_argument("--retry-after", type=int, default=1)
+    args = ap.parse_args()
+
+    dataset = load_dataset(args.dataset) if args.dataset else generate_tenant(args.users, args.groups, args.seed)
+    server = MockJiraServer(
+        dataset,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        page_cap=args.page_cap,
+        org_page_size=args.org_page_size,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+    )
+    print(f"Mock Jira listening on {server.url} (org id: {ORG_ID})")
+    print(f"Set ORG_API_BASE in jira_core/client.py to {server.url} to use the Org API endpoints")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Offline benchmark suite for the Jira User & Group Management app.
+
+Starts the local mock API server (benchmarks/mock_server.py) with a
+seeded synthetic tenant (benchmarks/tenant_generator.py), drives the
+real JiraUserApp against it and times the hot paths at several tenant
+sizes:
+
+    fetch users (time-to-first-row and until all rows are shown),
+    fetch groups, filter (narrow / widen), sort, analyze_products and
+    the CSV exports
+
+Results are written to a JSON report that can be compared with an
+earlier run (--compare), e.g. before and after a change.
+
+The app is a Tk GUI, so a display is required; on a headless machine run
+it under a virtual display:
+
+    xvfb-run python benchmarks/run_benchmarks.py --sizes 1000,10000,100000
+
+--headless times the same fetch / filter / analyze / export paths through
+the jira_core data layer alone, without Tk:
+
+    python benchmarks/run_benchmarks.py --headless --sizes 1000,10000,100000
+
+Message boxes are suppressed and credentials are never read from or
+written to the system keyring while benchmarking.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import keyring  # noqa: E402
+from keyring.backends import null  # noqa: E402
+
+from jira_core import client as client_module  # noqa: E402
+from jira_core.client import JiraClient  # noqa: E402
+from jira_core.exporters import write_products_csv, write_users_csv  # noqa: E402
+from jira_core.instrumentation import RequestMetrics  # noqa: E402
+from jira_core.model import UserFilter, analyze_products, filter_users, org_user_values, standard_user_values  # noqa: E402
+from mock_server import ORG_ID, MockJiraServer  # noqa: E402
+from tenant_generator import generate_tenant, load_dataset  # noqa: E402
+
+
+def pump(root, until, timeout):
+    """Run the Tk event loop until `until()` is true"""
+    deadline = time.perf_counter() + timeout
+    while not until():
+        root.update()
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark step timed out")
+        time.sleep(0.001)
+
+
+def settled(app, job):
+    return job.done and app.ui.pending() == 0
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(HERE), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def http_summary(metrics):
+    return {
+        name: {
+            "calls": ep["calls"],
+            "p50_ms": ep["latency_ms"]["p50"],
+            "p95_ms": ep["latency_ms"]["p95"],
+            "retries": ep["retries"],
+            "rate_limited": ep["rate_limited"],
+        }
+        for name, ep in metrics["endpoints"].items()
+    }
+
+
+def run_headless_case(server, size, mode, args):
+    """Benchmark the jira_core data layer (no Tk) for one tenant size and API mode"""
+    org_mode = mode == "org"
+    metrics = RequestMetrics()
+    client = JiraClient(server.url, "bench@example.com", "mock-token", ORG_ID, "mock-org-key", metrics=metrics)
+    result = {"size": size, "mode": mode, "headless": True, "timings_s": {}}
+    timings = result["timings_s"]
+    workdir = tempfile.mkdtemp(prefix="jira_bench_")
+    try:
+        start = time.perf_counter()
+        users = client.fetch_users(org_mode)
+        timings["fetch_users"] = time.perf_counter() - start
+        if len(users) != len(server.org_users):
+            raise RuntimeError(f"fetch_users returned {len(users)} users")
+        timings["fetch_groups"] = timed(client.fetch_groups)
+
+        values = org_user_values if org_mode else standard_user_values
+        timings["format_rows"] = timed(lambda: [values(u) for u in users])
+        timings["filter_narrow"] = timed(lambda: filter_users(users, UserFilter(args.filter_term), org_mode))
+        timings["filter_widen"] = timed(lambda: filter_users(users, UserFilter(""), org_mode))
+        timings["sort_name"] = timed(lambda: sorted(users, key=lambda u: (values(u)[0] or "").lower()))
+
+        if org_mode:
+            products = {}
+            timings["analyze_products"] = timed(lambda: products.update(analyze_products(users)))
+            timings["export_products_csv"] = timed(lambda: write_products_csv(os.path.join(workdir, "products.csv"), products))
+        timings["export_users_csv"] = timed(lambda: write_users_csv(os.path.join(workdir, "users.csv"), users, org_mode))
+
+        result["http"] = http_summary(metrics.snapshot())
+        result["timings_s"] = {k: round(v, 4) for k, v in timings.items()}
+        return result
+    finally:
+        client.close()
+
+
+def run_case(server, size, mode, args):
+    """Benchmark one tenant size in one API mode; returns a result dict"""
+    import tkinter as tk
+    import jira_user_app as app_module
+    root = tk.Tk()
+    root.withdraw()
+    app = app_module.JiraUserApp(root)
+    result = {"size": size, "mode": mode, "timings_s": {}}
+    timings = result["timings_s"]
+    workdir = tempfile.mkdtemp(prefix="jira_bench_")
+    cwd = os.getcwd()
+    try:
+        app.jira_url.set(server.url)
+        app.email.set("bench@example.com")
+        app.api_token.set("mock-token")
+        app.use_org_api.set(mode == "org")
+        if mode == "org":
+            app.org_id.set(ORG_ID)
+            app.org_api_key.set("mock-org-key")
+        pump(root, lambda: True, 1)
+
+        # Fetch users: until the crawl is done and every row is in the tree
+        start = time.perf_counter()
+        job = app.fetch_users_async()
+        pump(root, lambda: settled(app, job), args.timeout)
+        timings["fetch_users"] = time.perf_counter() - start
+        if job.state != "done" or len(app.users_data) != len(server.org_users):
+            raise RuntimeError(f"fetch_users ended as {job.state} with {len(app.users_data)} users")
+
+        # Fetch groups
+        start = time.perf_counter()
+        job = app.fetch_groups_async()
+        pump(root, lambda: settled(app, job), args.timeout)
+        timings["fetch_groups"] = time.perf_counter() - start
+
+        # Back to the users view for filtering and sorting
+        app.data_notebook.select(0)
+        pump(root, lambda: app.ui.pending() == 0, args.timeout)
+
+        def filter_to(term):
+            app.search_var.set(term)  # trace -> filter_data
+            root.update_idletasks()
+
+        timings["filter_narrow"] = timed(lambda: filter_to(args.filter_term))
+        timings["filter_widen"] = timed(lambda: filter_to(""))
+        timings["sort_name"] = timed(lambda: (app.sort_by_column("name"), root.update_idletasks()))
+        timings["sort_name_desc"] = timed(lambda: (app.sort_by_column("name"), root.update_idletasks()))
+
+        os.chdir(workdir)
+        if mode == "org":
+            timings["analyze_products"] = timed(lambda: (app.analyze_products(), root.update_idletasks()))
+            timings["export_products_csv"] = timed(app.export_products_csv)
+        timings["export_users_csv"] = timed(app.export_csv)
+
+        metrics = app.metrics.snapshot()
+        ui = app.watchdog.snapshot()
+        result["time_to_first_row_ms"] = ui["latencies"].get("time_to_first_row", {}).get("last_ms")
+        result["ui"] = {
+            "stalls": len(ui["stalls"]),
+            "max_stall_ms": max((s["duration_ms"] for s in ui["stalls"]), default=0),
+            "loop_latency_p95_ms": ui["loop_latency"]["p95_ms"],
+        }
+        result["http"] = http_summary(metrics)
+        result["timings_s"] = {k: round(v, 4) for k, v in timings.items()}
+        return result
+    finally:
+        os.chdir(cwd)
+        app.scheduler.shutdown()
+        app.ui.stop()
+        app.watchdog.stop()
+        root.destroy()
+
+
+def compare(report, baseline_path):
+    """Print timing ratios against an earlier report (lower is better)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["size"], r["mode"]): r for r in baseline.get("results", [])}
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('git_commit')}):")
+    for r in report["results"]:
+        base = previous.get((r["size"], r["mode"]))
+        if not base:
+            continue
+        for name, value in r["timings_s"].items():
+            before = base["timings_s"].get(name)
+            if before:
+                print(f"  {r['mode']:>8} {r['size']:>7}  {name:<22} {before:9.3f}s -> {value:9.3f}s  x{value / before:5.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline benchmarks against a local mock Jira / Org API")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="comma separated user counts")
+    ap.add_argument("--modes", default="org,standard", help="comma separated: org, standard")
+    ap.add_argument("--groups", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=1, help="synthetic tenant seed")
+    ap.add_argument("--dataset", default=None, help="use a dataset file instead of generating one (single size)")
+    ap.add_argument("--filter-term", default="chen", help="search term for the narrowing filter")
+    ap.add_argument("--latency-ms", type=float, default=0, help="server latency per request")
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--page-cap", type=int, default=None, help="cap items per page")
+    ap.add_argument("--org-page-size", type=int, default=100)
+    ap.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    ap.add_argument("--keep-pacing", action="store_true", help="keep the app's delays between pages")
+    ap.add_argument("--headless", action="store_true", help="benchmark the jira_core data layer without Tk")
+    ap.add_argument("--timeout", type=float, default=1800, help="seconds per step")
+    ap.add_argument("--output", default=None, help="report path (default: benchmark_<timestamp>.json)")
+    ap.add_argument("--compare", default=None, help="earlier report to compare against")
+    args = ap.parse_args()
+
+    if not args.keep_pacing:
+        client_module.PAGE_DELAY_STANDARD_API = 0
+        client_module.PAGE_DELAY_ORG_API = 0
+        client_module.BULK_ACTION_DELAY = 0
+    if args.headless:
+        tk_version = None
+    else:
+        import tkinter as tk
+        import jira_user_app as app_module
+        tk_version = tk.TkVersion
+        # Benchmarks must not touch the real keyring or block on dialogs
+        keyring.set_keyring(null.Keyring())
+        for name in ("showinfo", "showwarning", "showerror"):
+            setattr(app_module.messagebox, name, lambda *a, **k: None)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    if args.dataset:
+        sizes = sizes[:1]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tk": tk_version,
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": [],
+    }
+
+    for size in sizes:
+        if args.dataset:
+            dataset = load_dataset(args.dataset)
+            size = len(dataset["org_users"])
+        else:
+            dataset = generate_tenant(size, args.groups, args.seed)
+        server = MockJiraServer(
+            dataset,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            page_cap=args.page_cap,
+            org_page_size=args.org_page_size,
+            rate_limit_every=args.rate_limit_every,
+        ).start()
+        client_module.ORG_API_BASE = server.url
+        try:
+            for mode in modes:
+                print(f"Benchmarking {size} users ({mode} API)...")
+                result = (run_headless_case if args.headless else run_case)(server, size, mode, args)
+                report["results"].append(result)
+                print("  " + ", ".join(f"{k}={v:.3f}s" for k, v in result["timings_s"].items()))
+        finally:
+            server.stop()
+
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
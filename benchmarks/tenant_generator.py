@@ -0,0 +1,286 @@
+"""Deterministic synthetic tenant generator for scale and memory testing.
+
+Produces datasets shaped like real Organization API and Jira responses:
+
+- users with the Org API fields the app reads (account_id, name, email,
+  account_type, account_status, last_active, product_access[])
+- a mix of account types (atlassian / app / customer) and statuses
+  (active / inactive / closed / invited), invited users without an email,
+  app accounts without an email, a sprinkling of malformed emails and
+  duplicate people (same email with different case, same display name)
+- several products per user, each with its own last_active (or none)
+- thousands of groups with skewed (Zipf-like) membership sizes: a few
+  default groups holding almost everyone, a long tail of small team
+  groups, and some empty or single-member groups
+
+The same seed always gives the same tenant, on any machine. Dates are
+relative to a fixed --as-of date, never to "now".
+
+    python benchmarks/tenant_generator.py --users 100000 --groups 3000 --seed 7 --out tenant.json.gz
+    python benchmarks/tenant_generator.py --users 5000 --pages pages/   # API-shaped page files
+    python benchmarks/mock_server.py --dataset tenant.json.gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+FIRST_NAMES = [
+    "Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+    "Maria", "Wei", "Aisha", "Lars", "Priya", "Kenji", "Fatima", "Diego", "Olga", "Noah",
+    "Emma", "Liam", "Chen", "Ana", "Omar", "Sofia", "Yuki", "Ivan", "Leila", "Mateo",
+]
+LAST_NAMES = [
+    "Smith", "Garcia", "Chen", "Müller", "Kowalski", "Nguyen", "Okafor", "Silva", "Kim", "Patel",
+    "Johansson", "Rossi", "Dubois", "Tanaka", "Haddad", "Novak", "Jones", "Ivanova", "Costa", "Brown",
+]
+TEAMS = [
+    "platform", "payments", "mobile", "web", "data", "infra", "security", "support", "sales",
+    "marketing", "finance", "legal", "hr", "design", "qa", "growth", "search", "ml", "devex", "ops",
+]
+
+# (key, name, url path, share of users with access)
+PRODUCTS = [
+    ("jira-software", "Jira Software", "", 0.80),
+    ("confluence", "Confluence", "/wiki", 0.65),
+    ("jira-servicedesk", "Jira Service Management", "", 0.25),
+    ("jira-core", "Jira Work Management", "", 0.15),
+    ("opsgenie", "Opsgenie", "", 0.05),
+    ("compass", "Compass", "", 0.03),
+]
+
+# account_status -> share of atlassian accounts
+STATUS_MIX = [("active", 0.85), ("inactive", 0.07), ("closed", 0.02), ("invited", 0.06)]
+
+
+def _weighted(rng, choices):
+    roll = rng.random()
+    for value, weight in choices:
+        if roll < weight:
+            return value
+        roll -= weight
+    return choices[-1][0]
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def generate_tenant(users=1000, groups=100, seed=1, site="acme", as_of="2026-01-01",
+                    app_share=0.03, customer_share=0.04, duplicate_share=0.005,
+                    malformed_email_share=0.002, skew=1.1):
+    """Build a tenant dataset: {"org_users": [...], "groups": [...], "members": {name: [accountId]}}"""
+    rng = random.Random(seed)
+    now = datetime.strptime(as_of, "%Y-%m-%d")
+    site_url = f"https://{site}.atlassian.net"
+    domain = f"{site}.example.com"
+
+    org_users = []
+    for i in range(users):
+        account_id = f"5f{seed:04x}{i:014x}"
+        roll = rng.random()
+        if roll < app_share:
+            account_type = "app"
+        elif roll < app_share + customer_share:
+            account_type = "customer"
+        else:
+            account_type = "atlassian"
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if account_type == "app":
+            name = f"{rng.choice(TEAMS).title()} Bot {i}"
+            email = ""
+        else:
+            name = f"{first} {last}"
+            email = f"{first.lower()}.{last.lower()}{i}@{domain if account_type == 'atlassian' else 'customer.example.org'}"
+
+        status = "active" if account_type == "app" else _weighted(rng, STATUS_MIX)
+        if status == "invited":
+            email = ""  # invited users show up without an email until they accept
+
+        if email and rng.random() < malformed_email_share:
+            email = email.split("@")[0]  # missing domain
+        if email and org_users and rng.random() < duplicate_share:
+            # Same person signed up twice: same display name, email in another case
+            twin = org_users[rng.randrange(len(org_users))]
+            if "@" in twin.get("email", ""):
+                name, email = twin["name"], twin["email"].upper()
+
+        # Most users were active recently, a long tail has been dormant for months
+        if status in ("invited",) or rng.random() < 0.04:
+            last_active = None
+        else:
+            days_ago = int(rng.expovariate(1 / 45.0)) if status == "active" else rng.randint(90, 900)
+            last_active = now - timedelta(days=days_ago, seconds=rng.randint(0, 86399))
+
+        product_access = []
+        if status != "invited" and account_type != "customer":
+            for key, pname, path, share in PRODUCTS:
+                if rng.random() < share:
+                    if last_active is None or rng.random() < 0.1:
+                        product_last = None
+                    else:
+                        product_last = last_active - timedelta(days=int(rng.expovariate(1 / 20.0)))
+                    entry = {"key": key, "name": pname, "url": site_url + path}
+                    if product_last is not None:
+                        entry["last_active"] = _iso(product_last)
+                    product_access.append(entry)
+
+        user = {
+            "account_id": account_id,
+            "account_type": account_type,
+            "account_status": status,
+            "name": name,
+            "access_billable": bool(product_access) and account_type == "atlassian",
+            "product_access": product_access,
+            "links": {"self": f"https://api.atlassian.com/users/{account_id}/manage/profile"},
+        }
+        if email:
+            user["email"] = email
+        if last_active is not None:
+            user["last_active"] = _iso(last_active)
+        org_users.append(user)
+
+    group_list, members = _generate_groups(rng, org_users, groups, site, skew)
+    return {
+        "meta": {"generator": "tenant_generator", "seed": seed, "users": users, "groups": groups,
+                 "site": site_url, "as_of": as_of},
+        "org_users": org_users,
+        "groups": group_list,
+        "members": members,
+    }
+
+
+def _generate_groups(rng, org_users, count, site, skew):
+    """Default groups that hold (almost) everyone plus a Zipf-distributed long tail"""
+    candidates = [u["account_id"] for u in org_users if u["account_status"] != "closed"]
+    n = len(candidates)
+    names = [
+        (f"jira-software-users-{site}", 0.85),
+        (f"confluence-users-{site}", 0.65),
+        (f"jira-servicemanagement-users-{site}", 0.25),
+        ("site-admins", None),
+        ("org-admins", None),
+    ][:count]
+
+    i = 0
+    while len(names) < count:
+        team = TEAMS[i % len(TEAMS)]
+        names.append((f"team-{team}-{i // len(TEAMS):04d}", None))
+        i += 1
+
+    group_list, members = [], {}
+    for rank, (name, share) in enumerate(names, 1):
+        if share is not None:
+            size = int(n * share)
+        elif rng.random() < 0.03:
+            size = rng.choice((0, 1))  # abandoned groups
+        else:
+            size = min(n, max(1, int(n * 0.2 / rank ** skew) + rng.randint(0, 3)))
+        ids = rng.sample(candidates, size) if size else []
+        group_list.append({"name": name, "groupId": f"{rng.getrandbits(128):032x}"})
+        members[name] = ids
+    return group_list, members
+
+
+def jira_user(org_user):
+    """Standard-API (users/search, group/member) shape of an Org API user record"""
+    user = {
+        "accountId": org_user["account_id"],
+        "accountType": org_user.get("account_type", "atlassian"),
+        "displayName": org_user.get("name", ""),
+        "active": org_user.get("account_status") == "active",
+    }
+    if org_user.get("email"):
+        user["emailAddress"] = org_user["email"]
+    return user
+
+
+def save_dataset(dataset, path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(dataset, f)
+
+
+def load_dataset(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_api_pages(dataset, directory, org_page_size=100, jira_page_size=1000, group_page_size=50):
+    """Write the dataset as the paged API responses the app receives"""
+    os.makedirs(directory, exist_ok=True)
+    org_users = dataset["org_users"]
+
+    def dump(name, payload):
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+    for page, start in enumerate(range(0, len(org_users), org_page_size)):
+        links = {}
+        if start + org_page_size < len(org_users):
+            links["next"] = f"/admin/v1/orgs/mock/users?cursor={start + org_page_size}"
+        dump(f"org_users_{page:05d}.json", {"data": org_users[start:start + org_page_size], "links": links})
+
+    for page, start in enumerate(range(0, len(org_users), jira_page_size)):
+        dump(f"users_search_{page:05d}.json", [jira_user(u) for u in org_users[start:start + jira_page_size]])
+
+    groups = dataset["groups"]
+    for page, start in enumerate(range(0, len(groups), group_page_size)):
+        dump(f"group_bulk_{page:05d}.json", {
+            "startAt": start,
+            "maxResults": group_page_size,
+            "total": len(groups),
+            "isLast": start + group_page_size >= len(groups),
+            "values": groups[start:start + group_page_size],
+        })
+
+
+def summarize(dataset):
+    users = dataset["org_users"]
+    sizes = sorted((len(ids) for ids in dataset["members"].values()), reverse=True)
+    statuses, types = {}, {}
+    for u in users:
+        statuses[u["account_status"]] = statuses.get(u["account_status"], 0) + 1
+        types[u["account_type"]] = types.get(u["account_type"], 0) + 1
+    return {
+        "users": len(users),
+        "statuses": statuses,
+        "account_types": types,
+        "without_email": sum(1 for u in users if not u.get("email")),
+        "product_grants": sum(len(u["product_access"]) for u in users),
+        "groups": len(sizes),
+        "memberships": sum(sizes),
+        "largest_groups": sizes[:5],
+        "empty_groups": sizes.count(0),
+        "single_member_groups": sizes.count(1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a deterministic synthetic Jira / Org API tenant")
+    ap.add_argument("--users", type=int, default=100000)
+    ap.add_argument("--groups", type=int, default=3000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--site", default="acme")
+    ap.add_argument("--as-of", default="2026-01-01", help="reference date for last_active values")
+    ap.add_argument("--out", default=None, help="dataset file (.json or .json.gz)")
+    ap.add_argument("--pages", default=None, help="directory for API-shaped page files")
+    args = ap.parse_args()
+
+    dataset = generate_tenant(args.users, args.groups, args.seed, args.site, args.as_of)
+    if args.out:
+        save_dataset(dataset, args.out)
+        print(f"Dataset written to {args.out}")
+    if args.pages:
+        write_api_pages(dataset, args.pages)
+        print(f"API pages written to {args.pages}")
+    print(json.dumps(summarize(dataset), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,638 @@
+"""Command line interface for Jira user & group management (no display needed).
+
+Uses the same client, model and exporters as the GUI (jira_core), so it
+can run on a server, e.g. a nightly directory pull from cron:
+
+    python jira_cli.py fetch --org --groups --out directory.json.gz --history
+    python jira_cli.py history products --metric active_30d --period month
+    python jira_cli.py diff --history --out changes.csv                 # latest crawl vs the one before
+    python jira_cli.py overlap --from directory.json.gz --threshold 0.8   # needs a fetch with --members
+    python jira_cli.py quality --from directory.json.gz --issue duplicate_email --out duplicates.csv
+    python jira_cli.py export users --from directory.json.gz --out users.csv
+    python jira_cli.py stale --summary --from directory.json.gz
+    python jira_cli.py stale --days 90 --product jira-software --status active --from directory.json.gz --plan stale.txt
+    python jira_cli.py bulk deactivate --file stale.txt            # dry run
+    python jira_cli.py bulk deactivate --file stale.txt --yes
+    python jira_cli.py reconcile memberships.csv --from directory.json.gz   # dry run
+    python jira_cli.py reconcile memberships.csv --yes --report reconcile.csv
+    python jira_cli.py --jira-url https://beta.atlassian.net workspace add --name beta
+    python jira_cli.py workspace fetch --users-csv all_users.csv          # every profile, in parallel
+
+Credentials come from the command line or the environment: JIRA_URL,
+JIRA_EMAIL, JIRA_API_TOKEN, ATLASSIAN_ORG_ID and ATLASSIAN_ORG_API_KEY.
+Jira URL and email fall back to the values the GUI remembered in the
+system keyring.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+from jira_core.bulk import (
+    ACTIONS, CONCURRENT_RATE, CONCURRENT_WORKERS, GROUP_ACTIONS, plan_bulk_action, run_bulk_action,
+)
+from jira_core.client import GROUP_MEMBERS_PAGE, JiraClient
+from jira_core.diff import KIND_LABELS, KINDS, SnapshotDiff, diff_directories
+from jira_core.exporters import (
+    product_summary, write_changes_csv, write_group_summary_csv, write_groups_csv, write_json,
+    write_overlap_csv, write_products_csv, write_quality_csv, write_reconcile_csv, write_stale_csv, write_stale_summary_csv,
+    write_users_csv, write_workspace_csv,
+)
+from jira_core.history import HistoryStore, RetentionPolicy, default_history_dir
+from jira_core.indexes import UserIndex
+from jira_core.instrumentation import RequestMetrics
+from jira_core.logs import LEVELS, setup_logging
+from jira_core.model import Directory, account_id_of, analyze_products
+from jira_core.overlap import DEFAULT_THRESHOLD, GroupOverlap
+from jira_core.quality import ISSUE_LABELS, ISSUES, NO_GROUPS, DataQualityIndex, user_fields
+from jira_core.reconcile import ReconcilePlan, apply_plan, load_members, read_desired, result_counts
+from jira_core.reports import THRESHOLDS, ActivityReport
+from jira_core.workspace import (
+    HOST_RATE, Profile, crawl_directory, crawl_workspace, delete_secrets, fill_session_secrets, load_profiles, load_secrets,
+    save_profiles, save_secrets,
+)
+
+SERVICE_NAME = "jira_user_app"  # keyring service shared with the GUI
+
+
+def err(msg):
+    print(msg, file=sys.stderr)
+
+
+def remembered(key):
+    """Value the GUI saved in the keyring ("" if none or no keyring backend)"""
+    try:
+        import keyring
+        return keyring.get_password(SERVICE_NAME, key) or ""
+    except Exception:
+        return ""
+
+
+def make_client(args, metrics=None):
+    return JiraClient(
+        jira_url=args.jira_url or os.environ.get("JIRA_URL") or remembered("jira_url"),
+        email=args.email or os.environ.get("JIRA_EMAIL") or remembered("email"),
+        api_token=args.api_token or os.environ.get("JIRA_API_TOKEN", ""),
+        org_id=args.org_id or os.environ.get("ATLASSIAN_ORG_ID", ""),
+        org_api_key=args.org_api_key or os.environ.get("ATLASSIAN_ORG_API_KEY", ""),
+        metrics=metrics,
+    )
+
+
+def fetch_directory(client, org_mode, groups=False, members=False, resume=True, join_site=False):
+    """Crawl a directory; an interrupted crawl of the same site is resumed from its checkpoint unless resume=False"""
+    return crawl_directory(client, org_mode, groups, members, resume, log=err, join_site=join_site)
+
+
+def load_or_fetch(args, client, groups=False, members=False):
+    if getattr(args, "from_file", None):
+        return Directory.load(args.from_file)
+    return fetch_directory(client, args.org, groups=groups, members=members)
+
+
+# ---------------- Commands ---------------- #
+def cmd_validate(args, client):
+    me = client.myself()
+    print(f"API token is valid ({me.get('displayName', '')})")
+    if client.org_api_key:
+        org_id, org_name = client.fetch_org()
+        print(f"Organization: {org_name}\nID: {org_id}")
+
+
+def cmd_fetch(args, client):
+    if args.join_site and not args.org:
+        err("--join-site needs --org")
+        return 2
+    directory = fetch_directory(client, args.org, groups=args.groups, members=args.members, resume=not args.restart, join_site=args.join_site)
+    directory.save(args.out)
+    print(f"Directory written to {args.out}")
+    if args.csv:
+        write_users_csv(args.csv, directory.users, directory.org_mode)
+        print(f"Users exported to {args.csv}")
+    if args.history is not None:
+        path = args.history or default_history_dir(directory.site)
+        entry = HistoryStore(path).record(directory)
+        print(f"Snapshot {entry['id']} ({entry['kind']}, {entry['bytes']} bytes) added to {path}")
+
+
+def print_trend(rows, columns, limit):
+    """Rows of (period, {column: value}) as a table, one column per key (largest first)"""
+    print(f"{'Period':<20}" + "".join(f" {c[:14]:>14}" for c in columns[:limit]))
+    for label, values in rows:
+        print(f"{label:<20}" + "".join(f" {values.get(c, ''):>14}" for c in columns[:limit]))
+
+
+def history_path(args):
+    return args.dir or default_history_dir(args.jira_url or os.environ.get("JIRA_URL") or remembered("jira_url"))
+
+
+def cmd_history(args, client):
+    path = history_path(args)
+    store = HistoryStore(path, RetentionPolicy(keep_all_days=args.keep_all_days))
+    if not store.generations:
+        err(f"No snapshots in {path}")
+        return 2
+    period = None if args.period == "crawl" else args.period
+    if args.what == "list":
+        for g in store.generations:
+            print(f"{g['id']:>6}  {g['taken_at']:<20} {g['kind']:<5} {g['users']:>7} users {g['groups']:>6} groups {g['bytes']:>10} bytes")
+    elif args.what == "products":
+        rows = store.product_trend(args.metric, period)
+        latest = rows[-1][1] if rows else {}
+        print_trend(rows, sorted(latest, key=lambda n: latest[n], reverse=True), args.limit)
+    elif args.what == "groups":
+        names = args.group or store.largest_groups(args.limit)
+        rows = {}
+        for name in names:
+            for label, size in store.group_size_history(name, period):
+                rows.setdefault(label, {})[name] = size
+        print_trend(sorted(rows.items()), names, len(names))
+    elif args.what == "users":
+        rows = store.user_trend(period)
+        statuses = sorted({s for _, _, counts in rows for s in counts})
+        print_trend([(label, dict(counts, total=total)) for label, total, counts in rows], ["total"] + statuses, args.limit + 1)
+    else:
+        removed = store.compact()
+        print(f"{removed} snapshot(s) removed, {len(store.generations)} kept")
+
+
+def cmd_export(args, client):
+    directory = load_or_fetch(args, client, groups=args.what == "groups", members=args.what == "groups" and args.members)
+    out = args.out or f"jira_{args.what}.csv"
+    if args.what == "users":
+        count = write_users_csv(out, directory.users, directory.org_mode)
+        print(f"{count} users exported to {out}")
+    elif args.what == "groups":
+        if directory.members:
+            count = write_groups_csv(out, directory.groups, directory.members)
+        else:
+            count = write_group_summary_csv(out, directory.groups)
+        print(f"{count} groups exported to {out}")
+    else:
+        if not directory.org_mode:
+            err("Product access needs Organization API data (--org)")
+            return 2
+        products = analyze_products(directory.users)
+        if out.endswith(".json"):
+            write_json(out, product_summary(products))
+        else:
+            write_products_csv(out, products)
+        print(f"{len(products)} products exported to {out}")
+
+
+def cmd_stale(args, client):
+    directory = load_or_fetch(args, client)
+    if not directory.org_mode:
+        err("Last-active data needs Organization API data (--org)")
+        return 2
+    as_of = datetime.strptime(args.as_of, "%Y-%m-%d").date() if args.as_of else None
+    report = ActivityReport(directory.users, as_of=as_of)
+    if args.summary:
+        summary = report.summary()
+        print(f"{'Product':<28} {'Users':>7} {'Never':>7}" + "".join(f" {f'{d}d+':>7}" for d in THRESHOLDS))
+        for row in summary:
+            print(f"{row['name']:<28} {row['users']:>7} {row['never']:>7}" + "".join(f" {row['inactive'][d]:>7}" for d in THRESHOLDS))
+        if args.out:
+            write_stale_summary_csv(args.out, summary)
+            print(f"Summary written to {args.out}")
+        return
+    if args.product and report.product_key(args.product) is None:
+        err(f"Unknown product: {args.product}")
+        return 2
+    rows = report.stale(args.days, product=args.product, statuses=args.status)
+    if args.out:
+        write_stale_csv(args.out, rows)
+        print(f"{len(rows)} stale users written to {args.out}")
+    else:
+        for r in rows:
+            days = "never" if r["days_inactive"] is None else f"{r['days_inactive']}d"
+            print(f"{days:>7}  {r['status']:<9} {r['account_id']:<28} {r['name']} <{r['email']}>")
+        print(f"{len(rows)} user(s) inactive for {args.days}+ days")
+    if args.plan:
+        with open(args.plan, "w", encoding="utf-8") as f:
+            f.writelines(f"{r['account_id']}\n" for r in rows)
+        print(f"Bulk plan written to {args.plan} (use: jira_cli.py bulk <action> --file {args.plan})")
+
+
+def cmd_diff(args, client):
+    if args.files:
+        if len(args.files) != 2:
+            err("diff needs two directory files (old and new), or --history")
+            return 2
+        diff = diff_directories(Directory.load(args.files[0]), Directory.load(args.files[1]))
+    else:
+        path = history_path(args)
+        store = HistoryStore(path)
+        ids = [g["id"] for g in store.generations]
+        new_id = args.to_gen if args.to_gen is not None else (ids[-1] if ids else None)
+        if new_id not in ids:
+            err(f"No snapshot {new_id} in {path}" if new_id is not None else f"No snapshots in {path}")
+            return 2
+        old_id = args.from_gen if args.from_gen is not None else (ids[ids.index(new_id) - 1] if ids.index(new_id) else None)
+        if old_id not in ids:
+            err(f"No snapshot {old_id} in {path}" if old_id is not None else "Only one snapshot, nothing to compare")
+            return 2
+        taken = {g["id"]: g["taken_at"] for g in store.generations}
+        diff = SnapshotDiff(store.state(old_id), store.state(new_id), taken[old_id], taken[new_id])
+
+    print(f"Changes from {diff.old_label} to {diff.new_label}:")
+    counts = diff.counts()
+    for kind in KINDS:
+        if kind in counts:
+            print(f"  {KIND_LABELS[kind]:<24} {counts[kind]:>7}")
+    if not counts:
+        print("  no changes")
+    changes = diff.of_kind(*args.kind) if args.kind else diff.changes
+    if args.out:
+        write_changes_csv(args.out, changes)
+        print(f"{len(changes)} change(s) written to {args.out}")
+    elif args.list:
+        for c in changes:
+            who = f"{c['name']} ({c['account_id']})" if c["account_id"] else ""
+            values = f"{c['old']} -> {c['new']}" if c["old"] and c["new"] else c["old"] or c["new"]
+            print(f"{c['kind']:<16} {c['group']:<30} {who} {values}".rstrip())
+
+
+def cmd_overlap(args, client):
+    directory = load_or_fetch(args, client, groups=True, members=True)
+    if not directory.members:
+        err("No group members in this directory file (fetch with --members)")
+        return 2
+    overlap = GroupOverlap(directory.members, directory.groups)
+    similar = overlap.similar(args.threshold)
+    subsets = overlap.subsets()
+    empty, single = overlap.empty(), overlap.single_member()
+    print(f"{len(overlap)} groups with members loaded, {len(overlap.index)} distinct members")
+    if overlap.unloaded:
+        print(f"{len(overlap.unloaded)} group(s) without loaded members were skipped")
+    print(f"\nMost similar pairs (Jaccard >= {args.threshold}): {len(similar)}")
+    for p in similar[:args.limit]:
+        print(f"  {p['jaccard']:6.1%}  {p['relation']:<9} {p['group']} ({p['size']}) / {p['other']} ({p['other_size']}), {p['shared']} shared")
+    print(f"\nSubsets (every member also in a larger group): {len(subsets)}")
+    for p in subsets[:args.limit]:
+        print(f"  {p['group']} ({p['size']}) in {p['other']} ({p['other_size']})")
+    print(f"\nEmpty groups: {len(empty)}")
+    for name in empty[:args.limit]:
+        print(f"  {name}")
+    print(f"\nSingle-member groups: {len(single)}")
+    for name in single[:args.limit]:
+        print(f"  {name}")
+    if args.out:
+        count = write_overlap_csv(args.out, similar, subsets, empty, single)
+        print(f"\n{count} row(s) written to {args.out}")
+
+
+def cmd_quality(args, client):
+    directory = load_or_fetch(args, client)
+    index = DataQualityIndex(directory.users)
+    members = directory.members or None
+    counts = index.counts(members)
+    print(f"{len(index)} users checked")
+    for issue in ISSUES:
+        if issue in counts:
+            print(f"  {ISSUE_LABELS[issue]:<24} {counts[issue]:>7}")
+    if members is None:
+        print(f"  ({ISSUE_LABELS[NO_GROUPS]} needs a directory fetched with --members)")
+    rows = index.rows(args.issue, members)
+    if args.out:
+        write_quality_csv(args.out, rows)
+        print(f"{len(rows)} row(s) written to {args.out}")
+    elif args.list:
+        for r in rows:
+            print(f"{r['issue']:<22} {r['account_id']:<28} {r['name']} <{r['email']}> {r['detail']}".rstrip())
+    if args.domains:
+        print("\nEmail domains:")
+        for domain, count in index.domains()[:args.domains]:
+            print(f"  {count:>7}  {domain}")
+
+
+def read_user_keys(path):
+    """accountIds / emails from a text file (one per line) or a CSV with an id or email column"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if not path.lower().endswith(".csv"):
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        keys = []
+        for row in csv.DictReader(f):
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+            key = row.get("account_id") or row.get("account id") or row.get("accountid") or row.get("email")
+            if key:
+                keys.append(key)
+        return keys
+
+
+def cmd_bulk(args, client):
+    if args.action in GROUP_ACTIONS and not args.group:
+        err(f"{args.action} needs --group")
+        return 2
+    keys = read_user_keys(args.file)
+    needs_lookup = args.from_file or any("@" in k for k in keys)
+    directory = load_or_fetch(args, client) if needs_lookup else None
+    index = UserIndex(directory.users if directory else ())
+
+    users, unknown = [], []
+    seen = set()
+    for key in keys:
+        u = index.resolve(key)
+        if u is None and "@" not in key and not index.by_id:
+            u = {"account_id": key}  # bare accountId, nothing to resolve against
+        if u is None:
+            unknown.append(key)
+            continue
+        account_id = u.get("account_id") or u.get("accountId")
+        if account_id in seen:
+            continue
+        seen.add(account_id)
+        name, email, _, status, _ = user_fields(u)
+        users.append({
+            "account_id": account_id,
+            "name": name or account_id,
+            "email": email,
+            "status": status,
+        })
+
+    # Known group membership drops adds / removes that would change nothing
+    members, complete = None, False
+    if args.action in GROUP_ACTIONS:
+        loaded = directory.members.get(args.group) if directory else None
+        if loaded is None:
+            loaded = client.group_members(args.group, max_results=GROUP_MEMBERS_PAGE)
+            complete = len(loaded) < GROUP_MEMBERS_PAGE
+        else:
+            count = next((g.get("memberCount") for g in directory.groups if g.get("name") == args.group), None)
+            complete = count is not None and len(loaded) >= count
+        members = {account_id_of(m) for m in loaded}
+    plan = plan_bulk_action(users, args.action, args.group, members, complete)
+
+    print(f"{len(users)} user(s)" + (f", {len(unknown)} not found" if unknown else ""))
+    for key in unknown:
+        err(f"  not found: {key}")
+    print(plan.summary_text(client.metrics.latency(plan.endpoint) if client.metrics else None))
+    if not args.yes:
+        for u in plan.calls[:20]:
+            print(f"  • {u['name']} ({u['account_id']})")
+        if len(plan.calls) > 20:
+            print(f"  ... and {len(plan.calls) - 20} more")
+        print("Dry run - add --yes to execute")
+        return 0
+
+    def progress(i, total, user):
+        err(f"[{i}/{total}] {user['name']}")
+
+    result = run_bulk_action(client, plan.calls, args.action, args.group, progress=progress)
+    print(f"Bulk action completed: {result.success} success, {result.failed} failed, {len(plan.skipped)} not needed")
+    if args.report:
+        report = result.to_dict()
+        report["not_needed"] = [{"account_id": u["account_id"], "name": u["name"], "reason": reason} for u, reason in plan.skipped]
+        write_json(args.report, report)
+        print(f"Report written to {args.report}")
+    return 1 if result.failed else 0
+
+
+def cmd_reconcile(args, client):
+    desired = read_desired(args.file)
+    keys = [key for group_keys in desired.values() for key in group_keys]
+    needs_lookup = args.from_file or any("@" in k for k in keys)
+    index = UserIndex(load_or_fetch(args, client).users if needs_lookup else ())
+
+    def new_client():
+        return make_client(args, client.metrics)
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            err(f"[{done}/{total}]")
+
+    err(f"Reading the members of {len(desired)} group(s)...")
+    current, errors = load_members(new_client, desired, args.workers, args.rate, progress=progress)
+    plan = ReconcilePlan(desired, current, index, remove=not args.no_remove, errors=errors)
+    print(plan.summary_text(client.metrics.latency("POST group/user") if client.metrics else None, args.workers, args.rate))
+    for group in plan.unknown_groups:
+        err(f"  {group}: {errors.get(group, 'group not found')}")
+    if not args.yes:
+        for action, group, user in plan.operations()[:20]:
+            print(f"  {'+' if action == 'add_group' else '-'} {group}: {user['name']} ({user['account_id']})")
+        if len(plan) > 20:
+            print(f"  ... and {len(plan) - 20} more")
+        if args.report:
+            write_reconcile_csv(args.report, plan.rows())
+            print(f"Plan written to {args.report}")
+        print("Dry run - add --yes to execute")
+        return 0
+
+    rows = apply_plan(new_client, plan, args.workers, args.rate, progress=progress)
+    counts = result_counts(rows)
+    print(f"Reconcile completed: {counts.get('done', 0)} done, {counts.get('failed', 0)} failed")
+    if args.report:
+        write_reconcile_csv(args.report, rows)
+        print(f"Report written to {args.report}")
+    return 1 if counts.get("failed") else 0
+
+
+def cmd_workspace(args, client):
+    profiles = load_profiles(args.file)
+    by_name = {p.name: p for p in profiles}
+    if args.what == "add":
+        if not args.name:
+            err("workspace add needs --name")
+            return 2
+        profile = Profile(args.name, client.jira_url, client.email, client.org_id, args.org, client.api_token, client.org_api_key)
+        if not profile.jira_url:
+            err("workspace add needs --jira-url (or JIRA_URL)")
+            return 2
+        by_name[profile.name] = profile
+        save_profiles(list(by_name.values()), args.file)
+        print(f"Profile {profile.name} saved ({profile.jira_url}{', Org API' if profile.org_mode else ''})")
+        try:
+            save_secrets(profile, SERVICE_NAME)
+        except Exception as e:
+            err(f"API token / Org API key not saved ({e}); 'workspace fetch' will use JIRA_API_TOKEN / ATLASSIAN_ORG_API_KEY")
+    elif args.what == "remove":
+        profile = by_name.pop(args.name or "", None)
+        if profile is None:
+            err(f"No profile named {args.name!r}")
+            return 2
+        save_profiles(list(by_name.values()), args.file)
+        delete_secrets(profile, SERVICE_NAME)
+        print(f"Profile {profile.name} removed")
+    elif args.what == "list":
+        for p in profiles:
+            print(f"{p.name:<20} {p.jira_url:<40} {p.email:<30} {'Org API ' + p.org_id if p.org_mode else ''}")
+    else:
+        if args.name:
+            profiles = [p for p in profiles if p.name in set(args.name.split(","))]
+        if not profiles:
+            err("No profiles to fetch (add some with 'workspace add')")
+            return 2
+        load_secrets(profiles, SERVICE_NAME)
+        # The command line / environment secrets only go to the profile(s) of that site and email
+        missing = fill_session_secrets(profiles, client.jira_url, client.email, client.org_id, client.api_token, client.org_api_key)
+        if missing:
+            err(f"No API token for {', '.join(missing)} (save one with 'workspace add' using that site's credentials)")
+            return 2
+        merged = crawl_workspace(
+            profiles, lambda p: JiraClient(metrics=client.metrics, **p.credentials()),
+            groups=True, members=args.members, rate=args.rate, resume=not args.restart,
+            progress=lambda name, message: err(f"[{name}] {message}"),
+        )
+        print(merged.summary_text())
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            for name, directory in merged.sources.items():
+                directory.save(os.path.join(args.out, f"{name}.json.gz"))
+            print(f"Directories written to {args.out}")
+        for what in ("users", "groups", "products"):
+            path = getattr(args, f"{what}_csv")
+            if path:
+                count = write_workspace_csv(path, what, getattr(merged, what)())
+                print(f"{count} merged {what} exported to {path}")
+        return 1 if merged.errors else 0
+
+
+# ---------------- Entry Point ---------------- #
+def build_parser():
+    ap = argparse.ArgumentParser(description="Jira user & group management from the command line", allow_abbrev=False)
+    ap.add_argument("--jira-url", default=None)
+    ap.add_argument("--email", default=None)
+    ap.add_argument("--api-token", default=None, help="prefer the JIRA_API_TOKEN environment variable")
+    ap.add_argument("--org-id", default=None)
+    ap.add_argument("--org-api-key", default=None, help="prefer the ATLASSIAN_ORG_API_KEY environment variable")
+    ap.add_argument("--metrics", default=None, help="write HTTP metrics (JSON) to this file")
+    ap.add_argument("--log-level", default=None, type=str.upper, choices=LEVELS,
+                    help="diagnostics on stderr (default: $JIRA_USER_APP_LOG_LEVEL or INFO; DEBUG shows every page)")
+    ap.add_argument("--log-file", default=None, help="also log to this file (rotated at 2 MB)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def source(p):
+        p.add_argument("--org", action="store_true", help="use the Organization API (last active, product access)")
+        p.add_argument("--from", dest="from_file", default=None, help="use a directory file written by 'fetch' instead of fetching")
+
+    sub.add_parser("validate", help="check the API token (and Org API key)")
+
+    p = sub.add_parser("fetch", help="fetch users (and groups) and save them to a directory file")
+    p.add_argument("--org", action="store_true", help="use the Organization API (last active, product access)")
+    p.add_argument("--groups", action="store_true", help="also fetch groups")
+    p.add_argument("--members", action="store_true", help="also fetch every group's members")
+    p.add_argument("--join-site", action="store_true",
+                   help="with --org: also crawl the site's users at the same time and join in their site status")
+    p.add_argument("--out", default="directory.json.gz", help="directory file (.json or .json.gz)")
+    p.add_argument("--csv", default=None, help="also export users to this CSV")
+    p.add_argument("--history", nargs="?", const="", default=None, metavar="DIR",
+                   help="also add the crawl to a snapshot history (default: ~/.jira_user_app/history/<site>)")
+    p.add_argument("--restart", action="store_true",
+                   help="start from page one even if an interrupted crawl of this site can be resumed")
+
+    p = sub.add_parser("export", help="export users, groups or products to CSV")
+    p.add_argument("what", choices=["users", "groups", "products"])
+    source(p)
+    p.add_argument("--members", action="store_true", help="groups: include members (one row per member)")
+    p.add_argument("--out", default=None)
+
+    p = sub.add_parser("stale", help="users inactive for N+ days")
+    source(p)
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--product", default=None, help="product key or name (default: any activity)")
+    p.add_argument("--as-of", default=None, help="count inactivity up to this date (YYYY-mm-dd, default today)")
+    p.add_argument("--status", action="append", default=None, help="only accounts with this status (repeatable, e.g. --status active)")
+    p.add_argument("--summary", action="store_true", help=f"per-product counts of users inactive for {'/'.join(map(str, THRESHOLDS))}+ days")
+    p.add_argument("--out", default=None, help="write the report (or the summary) as CSV")
+    p.add_argument("--plan", default=None, help="write the account ids for 'bulk --file'")
+
+    p = sub.add_parser("history", help="trends from the snapshot history written by 'fetch --history'")
+    p.add_argument("what", choices=["list", "products", "groups", "users", "compact"])
+    p.add_argument("--dir", default=None, help="history directory (default: the one for --jira-url)")
+    p.add_argument("--period", choices=["crawl", "day", "week", "month"], default="week", help="one row per period (its last snapshot)")
+    p.add_argument("--metric", choices=["users", "active_7d", "active_30d"], default="active_7d", help="products: value to show")
+    p.add_argument("--group", action="append", default=None, help="groups: group to show (repeatable, default: the largest)")
+    p.add_argument("--limit", type=int, default=8, help="columns to show")
+    p.add_argument("--keep-all-days", type=int, default=14, help="compact: keep every snapshot this recent")
+
+    p = sub.add_parser("diff", help="changes between two crawls: new / removed accounts, status, email, product and membership changes")
+    p.add_argument("files", nargs="*", metavar="FILE", help="old and new directory files written by 'fetch'")
+    p.add_argument("--history", action="store_true", help="compare snapshots from the snapshot history (the default without files)")
+    p.add_argument("--dir", default=None, help="history directory (default: the one for --jira-url)")
+    p.add_argument("--from-gen", type=int, default=None, help="old snapshot id (default: the one before --to-gen)")
+    p.add_argument("--to-gen", type=int, default=None, help="new snapshot id (default: the latest)")
+    p.add_argument("--kind", action="append", choices=KINDS, default=None, help="only these changes (repeatable)")
+    p.add_argument("--list", action="store_true", help="print every change")
+    p.add_argument("--out", default=None, help="write the changes as CSV")
+
+    p = sub.add_parser("overlap", help="near-duplicate, subset, empty and single-member groups")
+    source(p)
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum Jaccard similarity for a pair (0-1)")
+    p.add_argument("--limit", type=int, default=20, help="rows to print per section")
+    p.add_argument("--out", default=None, help="write every pair / group as CSV")
+
+    p = sub.add_parser("quality", help="duplicate accounts, missing / malformed emails, never-active invites, users in no group")
+    source(p)
+    p.add_argument("--issue", choices=ISSUES, default=None, help="only this issue")
+    p.add_argument("--list", action="store_true", help="print every flagged account")
+    p.add_argument("--domains", type=int, default=0, metavar="N", help="also print the N largest email domains")
+    p.add_argument("--out", default=None, help="write the flagged accounts as CSV")
+
+    p = sub.add_parser("bulk", help="run a bulk action on users listed in a file")
+    p.add_argument("action", choices=ACTIONS)
+    p.add_argument("--file", required=True, help="accountIds or emails, one per line, or a CSV with an account_id / email column")
+    p.add_argument("--group", default=None, help="group for add_group / remove_group")
+    source(p)
+    p.add_argument("--yes", action="store_true", help="execute (default is a dry run)")
+    p.add_argument("--report", default=None, help="write the results as JSON")
+
+    p = sub.add_parser("reconcile", help="make group memberships match a file of desired members")
+    p.add_argument("file", help="CSV with group and account_id / email columns, or JSON {group: [accountId or email]}")
+    source(p)
+    p.add_argument("--no-remove", action="store_true", help="only add missing members, keep members not in the file")
+    p.add_argument("--workers", type=int, default=CONCURRENT_WORKERS, help="requests in parallel")
+    p.add_argument("--rate", type=float, default=CONCURRENT_RATE, help="requests per second across all workers")
+    p.add_argument("--yes", action="store_true", help="execute (default is a dry run)")
+    p.add_argument("--report", default=None, help="write the plan (dry run) or the results as CSV")
+
+    p = sub.add_parser("workspace", help="several sites / orgs: saved profiles, crawled in parallel into one merged view")
+    p.add_argument("what", choices=["list", "add", "remove", "fetch"])
+    p.add_argument("--name", default=None, help="add / remove: profile name; fetch: only these profiles (comma separated)")
+    p.add_argument("--org", action="store_true", help="add: crawl this profile with the Organization API")
+    p.add_argument("--file", default=None, help="workspace file (default: ~/.jira_user_app/workspace.json)")
+    p.add_argument("--members", action="store_true", help="fetch: also every group's members")
+    p.add_argument("--rate", type=float, default=HOST_RATE, help="fetch: requests per second per host, across profiles")
+    p.add_argument("--restart", action="store_true", help="fetch: ignore interrupted crawls and start from page one")
+    p.add_argument("--out", default=None, metavar="DIR", help="fetch: write each site's directory file (<profile>.json.gz) here")
+    p.add_argument("--users-csv", default=None, help="fetch: merged users, one row per account with the sites it is on")
+    p.add_argument("--groups-csv", default=None, help="fetch: every site's groups")
+    p.add_argument("--products-csv", default=None, help="fetch: product access across the Org API profiles")
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(args.log_level, log_file=args.log_file, console_format="%(message)s")
+    metrics = RequestMetrics()
+    client = make_client(args, metrics)
+    commands = {
+        "validate": cmd_validate,
+        "fetch": cmd_fetch,
+        "export": cmd_export,
+        "stale": cmd_stale,
+        "history": cmd_history,
+        "diff": cmd_diff,
+        "overlap": cmd_overlap,
+        "quality": cmd_quality,
+        "bulk": cmd_bulk,
+        "reconcile": cmd_reconcile,
+        "workspace": cmd_workspace,
+    }
+    try:
+        code = commands[args.command](args, client) or 0
+    except Exception as e:
+        err(f"Error: {e}")
+        code = 1
+    finally:
+        client.close()
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            json.dump(metrics.snapshot(), f, indent=2)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
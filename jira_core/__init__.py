@@ -0,0 +1,52 @@
+"""Headless data layer for the Jira User & Group Management app.
+
+Everything that talks to the APIs, holds the directory data, filters it
+and writes exports lives here without any Tk dependency, so the GUI
+(jira_user_app.py), the command line (jira_cli.py) and the benchmarks all
+run the same code.
+
+The names below are imported from their submodules on first access, so
+`import jira_core` stays cheap and requests / dateutil are only loaded
+by the code that needs them.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ACTIONS": "bulk",
+    "GROUP_ACTIONS": "bulk",
+    "BulkResult": "bulk",
+    "run_bulk_action": "bulk",
+    "JiraAPIError": "client",
+    "JiraClient": "client",
+    "UserIndex": "indexes",
+    "RequestMetrics": "instrumentation",
+    "classify_endpoint": "instrumentation",
+    "create_session": "transport",
+    "percentile": "instrumentation",
+    "LANE_BACKGROUND": "jobs",
+    "LANE_INTERACTIVE": "jobs",
+    "Job": "jobs",
+    "JobCancelled": "jobs",
+    "JobScheduler": "jobs",
+    "Directory": "model",
+    "UserFilter": "model",
+    "analyze_products": "model",
+    "filter_groups": "model",
+    "filter_users": "model",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,295 @@
+"""Bulk user actions (deactivate, reactivate, add/remove group) shared by
+the GUI's Bulk Edit dialog and the CLI."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import client as client_module
+from .jobs import JobCancelled
+from .model import status_tag
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("deactivate", "reactivate", "add_group", "remove_group")
+GROUP_ACTIONS = ("add_group", "remove_group")
+ACTION_LABELS = {
+    "deactivate": "Deactivate",
+    "reactivate": "Reactivate",
+    "add_group": "Add to group",
+    "remove_group": "Remove from group",
+}
+ENDPOINTS = {
+    "deactivate": "POST lifecycle",
+    "reactivate": "POST lifecycle",
+    "add_group": "POST group/user",
+    "remove_group": "DELETE group/user",
+}
+DEFAULT_LATENCY = 0.3  # seconds per request when none has been measured yet
+CONCURRENT_WORKERS = 4  # threads for run_concurrent
+CONCURRENT_RATE = 10.0  # requests per second across all of them
+
+
+def perform_action(client, user, action, group_name=None, job=None):
+    """Send the request for one user (retried by the client if throttled); returns the response"""
+    if action == "deactivate":
+        return client.set_lifecycle(user["account_id"], enable=False, job=job)
+    if action == "reactivate":
+        return client.set_lifecycle(user["account_id"], enable=True, job=job)
+    if action == "add_group":
+        return client.add_to_group(user["account_id"], group_name, job=job)
+    if action == "remove_group":
+        return client.remove_from_group(user["account_id"], group_name, job=job)
+    raise ValueError(f"Unknown bulk action: {action}")
+
+
+class BulkResult:
+    def __init__(self, total):
+        self.total = total
+        self.success = 0
+        self.failed = 0
+        self.cancelled = False
+        self.failures = []  # (user, message)
+
+    @property
+    def skipped(self):
+        return self.total - self.success - self.failed
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "success": self.success,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled,
+            "failures": [{"account_id": u.get("account_id"), "name": u.get("name"), "error": msg} for u, msg in self.failures],
+        }
+
+
+class BulkPlan:
+    """The requests a bulk run will send, after dropping duplicates and no-ops.
+
+    `calls` are the users a request goes out for, in order; `skipped` holds
+    (user, reason) for those whose request would change nothing (already
+    in the state asked for, as far as the known membership / status tells).
+    """
+
+    def __init__(self, action, group_name=None):
+        self.action = action
+        self.group_name = group_name
+        self.calls = []
+        self.skipped = []
+        self.duplicates = 0
+
+    def __len__(self):
+        return len(self.calls)
+
+    @property
+    def endpoint(self):
+        return ENDPOINTS[self.action]
+
+    def estimate_seconds(self, latency=None):
+        """Run time: one request plus the pacing delay per call"""
+        per_call = (DEFAULT_LATENCY if latency is None else latency) + client_module.BULK_ACTION_DELAY
+        return len(self.calls) * per_call
+
+    def skip_counts(self):
+        """{reason: users skipped for it}"""
+        counts = {}
+        for _, reason in self.skipped:
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+    def summary_text(self, latency=None):
+        """Dry-run description: requests to send, no-ops dropped and the estimated duration"""
+        target = f" '{self.group_name}'" if self.group_name else ""
+        lines = [f"{ACTION_LABELS[self.action]}{target}: {len(self.calls)} request(s) ({self.endpoint})"]
+        dropped = [f"{count} {reason}" for reason, count in sorted(self.skip_counts().items())]
+        if self.duplicates:
+            dropped.append(f"{self.duplicates} duplicate(s)")
+        if dropped:
+            lines.append("Skipped: " + ", ".join(dropped))
+        if self.calls:
+            measured = "measured" if latency is not None else "estimated"
+            per_request = DEFAULT_LATENCY if latency is None else latency
+            lines.append(
+                f"Estimated time: {format_duration(self.estimate_seconds(latency))} "
+                f"({client_module.BULK_ACTION_DELAY:g}s pacing + {per_request:.2f}s per request, {measured})"
+            )
+        return "\n".join(lines)
+
+
+def plan_bulk_action(users, action, group_name=None, members=None, complete=False):
+    """BulkPlan for `users` ({"account_id", "name", ... "status"} dicts).
+
+    Users listed twice are sent once. `members` is the set of accountIds
+    known to be in the group: adds skip them, and when `complete` (every
+    member is known) removes skip everyone else. Deactivate / reactivate
+    skip users whose "status" already says inactive / active; unknown
+    statuses are always sent.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action}")
+    if action in GROUP_ACTIONS and not group_name:
+        raise ValueError(f"{action} needs a group name")
+
+    plan = BulkPlan(action, group_name)
+    seen = set()
+    for user in users:
+        account_id = user["account_id"]
+        if account_id in seen:
+            plan.duplicates += 1
+            continue
+        seen.add(account_id)
+        reason = None
+        if action == "add_group" and members is not None and account_id in members:
+            reason = "already member(s)"
+        elif action == "remove_group" and members is not None and complete and account_id not in members:
+            reason = "not member(s)"
+        elif action == "deactivate" and status_tag(user.get("status")) == "inactive":
+            reason = "already inactive"
+        elif action == "reactivate" and status_tag(user.get("status")) == "active":
+            reason = "already active"
+        if reason:
+            plan.skipped.append((user, reason))
+        else:
+            plan.calls.append(user)
+    return plan
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def run_bulk_action(client, users, action, group_name=None, job=None, progress=None):
+    """Apply `action` to each user in turn, pacing between calls.
+
+    users are dicts with at least "account_id" and "name"; progress(i, total,
+    user) is called before each request. Stops early if `job` is cancelled.
+    A BulkPlan's `calls` can be passed as `users` to send only the requests
+    that change something.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action}")
+    if action in GROUP_ACTIONS and not group_name:
+        raise ValueError(f"{action} needs a group name")
+
+    result = BulkResult(len(users))
+    for i, user in enumerate(users, 1):
+        if job is not None and job.cancelled:
+            break
+        try:
+            if progress is not None:
+                progress(i, result.total, user)
+            response = perform_action(client, user, action, group_name, job)
+            if client_module.write_succeeded(response, action):
+                result.success += 1
+            else:
+                result.failed += 1
+                result.failures.append((user, f"{response.status_code} - {response.text}"))
+                logger.warning("Failed for %s: %s - %s", user["name"], response.status_code, response.text)
+
+            # Small delay to avoid rate limiting
+            client.pace(job, client_module.BULK_ACTION_DELAY, client_module.response_endpoint(response))
+        except JobCancelled:
+            break
+        except Exception as e:
+            result.failed += 1
+            result.failures.append((user, str(e)))
+            logger.warning("Error processing %s: %s", user["name"], e)
+
+    result.cancelled = job is not None and job.cancelled
+    return result
+
+
+class RateLimiter:
+    """Spaces calls at least 1 / rate seconds apart, across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._held_until = 0.0
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        """The limiter for a request to `url` (JiraClient.limiter interface): one budget for every host"""
+        return self
+
+    def hold(self, seconds):
+        """Let no call start for `seconds` (a server asked to back off), including calls already waiting"""
+        with self._lock:
+            self._held_until = max(self._held_until, time.monotonic() + seconds)
+            self._next = max(self._next, self._held_until)
+
+    def wait(self, job=None):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        while start > now:
+            if job is not None:
+                job.sleep(start - now)
+            else:
+                time.sleep(start - now)
+            with self._lock:
+                now = time.monotonic()
+                if self._held_until > now:  # held while this call was waiting for its turn
+                    start = self._next
+                    self._next = start + self.interval
+
+
+def run_concurrent(make_client, items, fn, workers=CONCURRENT_WORKERS, rate=CONCURRENT_RATE, job=None, progress=None):
+    """fn(client, item) for every item on `workers` threads, at most `rate` calls per second overall.
+
+    Each thread gets its own client from make_client() (closed at the end),
+    all sharing one RateLimiter that every request they send waits on.
+    Returns [(item, result, error)] in item order; items not run because
+    `job` was cancelled get None. progress(done, total) is called after
+    each item, from the worker threads.
+    """
+    limiter = RateLimiter(rate)
+    local = threading.local()
+    clients = []
+    lock = threading.Lock()
+    results = [None] * len(items)
+    finished = [0]
+
+    def client():
+        c = getattr(local, "client", None)
+        if c is None:
+            c = local.client = make_client()
+            c.limiter = limiter
+            with lock:
+                clients.append(c)
+        return c
+
+    def work(i):
+        if job is not None and job.cancelled:
+            return
+        try:
+            results[i] = (items[i], fn(client(), items[i]), None)
+        except JobCancelled:
+            return
+        except Exception as e:
+            results[i] = (items[i], None, e)
+        with lock:
+            finished[0] += 1
+            done = finished[0]
+        if progress is not None:
+            progress(done, len(items))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            list(pool.map(work, range(len(items))))
+    finally:
+        for c in clients:
+            c.close()
+    return results
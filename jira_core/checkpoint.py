@@ -0,0 +1,194 @@
+"""Crawl checkpoints: resume an interrupted user, group or membership crawl.
+
+While a crawl runs, every page it receives is written to
+~/.jira_user_app/crawls/<site host>/<kind>/ (one gzip JSON file per page)
+and checkpoint.json then records where the next page starts: the Org API
+cursor or the startAt offset. If the crawl fails or the app is closed,
+the next crawl of the same kind can replay the stored pages from disk and
+carry on from that position instead of starting again at page one. A
+crawl that completes deletes its checkpoint.
+
+Membership crawls store one page per group, so a resumed one only reads
+the groups it had not finished.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_VERSION = 1
+MAX_AGE = timedelta(hours=24)  # older checkpoints are dropped: their pages would be mixed with today's data
+
+USERS_ORG = "users_org"
+USERS_STANDARD = "users_standard"
+GROUPS = "groups"
+MEMBERS = "members"
+KIND_LABELS = {
+    USERS_ORG: "users (Org API)",
+    USERS_STANDARD: "users",
+    GROUPS: "groups",
+    MEMBERS: "group members",
+}
+
+
+def default_crawl_dir(site):
+    """~/.jira_user_app/crawls/<site host>"""
+    host = urlsplit(site).netloc or site or "default"
+    safe = "".join(c if c.isalnum() or c in ".-" else "_" for c in host)
+    return os.path.join(os.path.expanduser("~"), ".jira_user_app", "crawls", safe)
+
+
+def _write_atomic(path, data, opener=open):
+    tmp = path + ".tmp"
+    with opener(tmp, "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class CrawlCheckpoint:
+    """The stored pages and next position of one kind of crawl of one site.
+
+    `state` is None when there is nothing to resume (no checkpoint, or one
+    for another organization, or older than MAX_AGE).
+    """
+
+    def __init__(self, root, kind, org_id=""):
+        self.kind = kind
+        self.org_id = org_id or ""
+        self.path = os.path.join(root, kind)
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.path, CHECKPOINT_FILE), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != CHECKPOINT_VERSION or state.get("org_id", "") != self.org_id:
+            return None
+        try:
+            if datetime.now() - datetime.fromisoformat(state["updated_at"]) > MAX_AGE:
+                return None
+        except (KeyError, ValueError):
+            return None
+        return state
+
+    @property
+    def resumable(self):
+        return self.state is not None and self.state["pages"] > 0
+
+    @property
+    def position(self):
+        return self.state["next"] if self.state else None
+
+    def describe(self):
+        """E.g. "120 page(s) (119,400 users), saved 2026-01-01 10:00:00" """
+        if not self.resumable:
+            return ""
+        saved = self.state["updated_at"].replace("T", " ")
+        if self.kind == MEMBERS:
+            return f"{self.state['items']:,} group(s) done, saved {saved}"
+        return f"{self.state['pages']} page(s) ({self.state['items']:,} {KIND_LABELS.get(self.kind, self.kind)}), saved {saved}"
+
+    def _page_path(self, n):
+        return os.path.join(self.path, f"{n:06d}.json.gz")
+
+    def pages(self):
+        """Yield the stored pages in crawl order"""
+        for n in range(1, self.state["pages"] + 1):
+            with gzip.open(self._page_path(n), "rt", encoding="utf-8") as f:
+                yield json.load(f)
+
+    def start(self):
+        """Begin a fresh crawl, dropping any stored pages"""
+        self.clear()
+        os.makedirs(self.path, exist_ok=True)
+        now = datetime.now().isoformat(timespec="seconds")
+        self.state = {
+            "version": CHECKPOINT_VERSION,
+            "kind": self.kind,
+            "org_id": self.org_id,
+            "started_at": now,
+            "updated_at": now,
+            "pages": 0,
+            "items": 0,
+            "next": None,
+            "done": False,
+        }
+
+    def save_page(self, batch, next_position):
+        """Store a page, then record the position after it (None: that was the last page)"""
+        n = self.state["pages"] + 1
+        _write_atomic(self._page_path(n), batch, gzip.open)
+        self.state.update(
+            pages=n,
+            items=self.state["items"] + len(batch),
+            next=next_position,
+            done=next_position is None,
+            updated_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        _write_atomic(os.path.join(self.path, CHECKPOINT_FILE), self.state)
+
+    def clear(self):
+        self.state = None
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def checkpointed_pages(checkpoint, fetch_pages, resume=True):
+    """Yield every page of a crawl, storing each one as it arrives.
+
+    fetch_pages(position) yields (page, next position) from `position`
+    on (None: the start). With resume and a resumable checkpoint the
+    stored pages come first, then the crawl continues where they end. The
+    checkpoint is deleted once the last page has been handed out; if the
+    consumer stops early (cancel, error) it stays for the next run.
+    """
+    if resume and checkpoint.resumable:
+        logger.info("Resuming %s crawl: %s", KIND_LABELS.get(checkpoint.kind, checkpoint.kind), checkpoint.describe())
+        for batch in checkpoint.pages():
+            yield batch
+        done = checkpoint.state["done"]
+    else:
+        checkpoint.start()
+        done = False
+    if not done:
+        for batch, next_position in fetch_pages(checkpoint.position):
+            checkpoint.save_page(batch, next_position)
+            yield batch
+    checkpoint.clear()
+
+
+def crawl_members(checkpoint, client, names, job=None, resume=True, progress=None):
+    """{group name: [member]} with every member of each group in `names`.
+
+    One stored page per group ({name: members}), so a resumed crawl skips
+    the groups it already has; groups a finished checkpoint does not hold
+    are still fetched. progress(done, total) after each group.
+    """
+    members = {}
+    names = list(names)
+    wanted = set(names)
+
+    def fetch(_):
+        remaining = [name for name in names if name not in members]
+        for i, name in enumerate(remaining, 1):
+            yield {name: client.all_group_members(name, job)}, None if i == len(remaining) else name
+
+    for page in checkpointed_pages(checkpoint, fetch, resume):
+        members.update(page)
+        if progress is not None:
+            progress(len(wanted.intersection(members)), len(names))
+    # A checkpoint finished for other groups (the run died before clearing it) fetched nothing for these
+    for name in names:
+        if name not in members:
+            members[name] = client.all_group_members(name, job)
+            if progress is not None:
+                progress(len(wanted.intersection(members)), len(names))
+    return {name: members[name] for name in names if name in members}
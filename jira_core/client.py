@@ -0,0 +1,392 @@
+"""Jira Cloud REST and Atlassian Organization API client.
+
+Holds one site's credentials and wraps every call the app makes. Crawls
+are generators that yield one page at a time, so the GUI can stream rows
+while a crawl runs and the CLI can simply collect them. Long crawls take
+an optional Job for cooperative cancellation and deliberate pacing.
+
+Reads are retried by the session (transport.create_session). Writes are
+retried here, and only the ones that are safe to repeat: lifecycle
+enable/disable and group add/remove end in the same state however often
+they are sent, and a repeat that finds the work already done ("already a
+member" for an add, "not a member" for a remove) counts as success
+(write_succeeded).
+"""
+
+import email.utils
+import json
+import logging
+import random
+import time
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from .instrumentation import classify_endpoint
+from .transport import create_session
+
+logger = logging.getLogger(__name__)
+
+# Atlassian admin / Organization API host (overridable for offline benchmarks)
+ORG_API_BASE = "https://api.atlassian.com"
+
+# Delays between consecutive requests, in seconds, to stay under rate limits
+PAGE_DELAY_STANDARD_API = 0.3
+PAGE_DELAY_ORG_API = 0.5
+BULK_ACTION_DELAY = 0.5
+GROUP_MEMBERS_PAGE = 1000  # members returned by group_members (one page)
+
+# Write retries: jittered exponential backoff, or the server's Retry-After
+WRITE_RETRIES = 5
+WRITE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+WRITE_BACKOFF = 0.5  # first backoff ceiling, doubled per attempt
+WRITE_BACKOFF_MAX = 30.0
+ALREADY_APPLIED = {"add_group": "already a member", "remove_group": "not a member"}  # per bulk action
+
+
+class JiraAPIError(Exception):
+    """A call returned an unexpected status"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class JiraClient:
+    """Credentials for one site / org plus a shared instrumented session"""
+
+    def __init__(self, jira_url="", email="", api_token="", org_id="", org_api_key="",
+                 metrics=None, session=None):
+        self.jira_url = (jira_url or "").strip().rstrip("/")
+        self.email = (email or "").strip()
+        self.api_token = (api_token or "").strip()
+        self.org_id = (org_id or "").strip()
+        self.org_api_key = (org_api_key or "").strip()
+        self.metrics = metrics
+        self.session = session or create_session(metrics)
+        # Request budget shared with other clients (bulk.RateLimiter or workspace.HostBudgets):
+        # every crawl page and write waits its turn, and write backoff holds it
+        self.limiter = None
+
+    def close(self):
+        self.session.close()
+
+    def copy(self):
+        """Same credentials and request budget, with a session of its own (for another thread)"""
+        clone = JiraClient(self.jira_url, self.email, self.api_token, self.org_id, self.org_api_key, metrics=self.metrics)
+        clone.limiter = self.limiter
+        return clone
+
+    # -- plumbing -- #
+    def auth(self):
+        return HTTPBasicAuth(self.email, self.api_token)
+
+    def org_headers(self):
+        return {"Accept": "application/json", "Authorization": f"Bearer {self.org_api_key}"}
+
+    def pace(self, job, seconds, endpoint):
+        """Deliberate delay between requests, reported as pacing time for `endpoint`"""
+        if not seconds:
+            return
+        start = time.perf_counter()
+        try:
+            if job is not None:
+                job.sleep(seconds)
+            else:
+                time.sleep(seconds)
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_pacing(endpoint, time.perf_counter() - start)
+
+    def _wait_turn(self, method, url, job=None):
+        """Wait for the shared budget of url's host, if any; reported as pacing"""
+        if self.limiter is None:
+            return
+        start = time.perf_counter()
+        self.limiter.for_url(url).wait(job)
+        if self.metrics is not None:
+            self.metrics.record_pacing(classify_endpoint(method, url), time.perf_counter() - start)
+
+    def _jira_get(self, path, params=None, timeout=30, job=None):
+        self._wait_turn("GET", f"{self.jira_url}{path}", job)
+        r = self.session.get(
+            f"{self.jira_url}{path}",
+            params=params,
+            auth=self.auth(),
+            headers={"Accept": "application/json"},
+            timeout=timeout
+        )
+        r.raise_for_status()
+        return r.json()
+
+    # -- identity -- #
+    def myself(self):
+        """Validate the Jira API token; returns the calling user"""
+        r = self.session.get(
+            f"{self.jira_url}/rest/api/3/myself",
+            auth=self.auth(),
+            headers={"Accept": "application/json"},
+            timeout=30
+        )
+        if r.status_code != 200:
+            raise JiraAPIError(r.text, r.status_code)
+        return r.json()
+
+    def fetch_org(self):
+        """First organization visible to the Org API key: (org_id, org_name)"""
+        if not self.org_api_key:
+            raise JiraAPIError("No Organization API key configured")
+        r = self.session.get(f"{ORG_API_BASE}/admin/v1/orgs", headers=self.org_headers(), timeout=30)
+        r.raise_for_status()
+        data = r.json()
+        if not data.get("data"):
+            raise JiraAPIError("No organizations found for this account")
+        org = data["data"][0]
+        return org.get("id"), org.get("attributes", {}).get("name", "Unknown")
+
+    # -- users -- #
+    def iter_users_standard(self, job=None, page_size=1000):
+        """Yield pages of users from /rest/api/3/users/search"""
+        for batch, _ in self.users_standard_pages(job, page_size=page_size):
+            yield batch
+
+    def users_standard_pages(self, job=None, start=None, page_size=1000):
+        """Yield (page of users, startAt of the next page) from /rest/api/3/users/search, from `start` on"""
+        start = start or 0
+        page = start // page_size
+        while True:
+            if job is not None:
+                job.raise_if_cancelled()
+            page += 1
+            logger.debug("Fetching users page %d, start=%d", page, start)
+            batch = self._jira_get("/rest/api/3/users/search", {"startAt": start, "maxResults": page_size}, job=job)
+            if not batch:
+                break
+            logger.debug("Users page %d: %d users", page, len(batch))
+            start += page_size
+            yield batch, start
+            self.pace(job, PAGE_DELAY_STANDARD_API, "GET users/search")
+
+    def iter_users_org(self, job=None):
+        """Yield pages of users from the Organization API (cursor paging)"""
+        for batch, _ in self.users_org_pages(job):
+            yield batch
+
+    def users_org_pages(self, job=None, cursor=None):
+        """Yield (page of users, cursor of the next page or None) from the Organization API, from `cursor` on"""
+        if not self.org_id:
+            raise JiraAPIError("No Organization ID configured")
+        if not self.org_api_key:
+            raise JiraAPIError("No Organization API key configured")
+
+        url = f"{ORG_API_BASE}/admin/v1/orgs/{self.org_id}/users"
+        page = 0
+        total = 0
+        while True:
+            if job is not None:
+                job.raise_if_cancelled()
+            page += 1
+            params = {"cursor": cursor} if cursor else {}
+            logger.debug("Fetching Org API users page %d", page)
+
+            self._wait_turn("GET", url, job)
+            try:
+                r = self.session.get(url, params=params, headers=self.org_headers(), timeout=30)
+                r.raise_for_status()
+            except requests.exceptions.Timeout:
+                logger.warning("Timeout on Org API users page %d, retrying", page)
+                if job is not None:
+                    job.sleep(2)
+                else:
+                    time.sleep(2)
+                if self.metrics is not None:
+                    self.metrics.record_retry("GET org users", 2)
+                r = self.session.get(url, params=params, headers=self.org_headers(), timeout=60)
+                r.raise_for_status()
+
+            data = r.json()
+            if not total and data.get("data") and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("First user from Org API:\n%s", json.dumps(data["data"][0], indent=2))
+
+            batch = data.get("data", [])
+            if not batch:
+                break
+            total += len(batch)
+            logger.debug("Org API users page %d: %d users, %d so far", page, len(batch), total)
+
+            next_url = data.get("links", {}).get("next")
+            cursor = next_url.split("cursor=")[-1].split("&")[0] if next_url and "cursor=" in next_url else None
+            yield batch, cursor
+            if cursor is None:
+                break
+            self.pace(job, PAGE_DELAY_ORG_API, "GET org users")
+
+    def fetch_users(self, org_mode, job=None):
+        pages = self.iter_users_org(job) if org_mode else self.iter_users_standard(job)
+        users = []
+        for batch in pages:
+            users.extend(batch)
+        logger.info("Total users fetched: %d", len(users))
+        return users
+
+    # -- groups -- #
+    def iter_groups(self, job=None, page_size=50):
+        """Yield pages of groups from /rest/api/3/group/bulk"""
+        for batch, _ in self.groups_pages(job, page_size=page_size):
+            yield batch
+
+    def groups_pages(self, job=None, start=None, page_size=50):
+        """Yield (page of groups, startAt of the next page or None) from /rest/api/3/group/bulk, from `start` on"""
+        start = start or 0
+        while True:
+            if job is not None:
+                job.raise_if_cancelled()
+            data = self._jira_get("/rest/api/3/group/bulk", {"startAt": start, "maxResults": page_size}, job=job)
+            start = None if data.get("isLast", True) else start + page_size
+            yield data.get("values", []), start
+            if start is None:
+                break
+
+    def fetch_groups(self, job=None):
+        groups = []
+        for batch in self.iter_groups(job):
+            groups.extend(batch)
+        return groups
+
+    def group_members(self, group_name, max_results=GROUP_MEMBERS_PAGE):
+        """First page (up to max_results) of a group's members"""
+        data = self._jira_get("/rest/api/3/group/member", {"groupname": group_name, "maxResults": max_results})
+        return data.get("values", [])
+
+    def all_group_members(self, group_name, job=None, page_size=GROUP_MEMBERS_PAGE):
+        """Every member of a group, following startAt paging"""
+        members = []
+        start = 0
+        while True:
+            if job is not None:
+                job.raise_if_cancelled()
+            data = self._jira_get("/rest/api/3/group/member", {"groupname": group_name, "startAt": start, "maxResults": page_size}, job=job)
+            values = data.get("values", [])
+            members.extend(values)
+            if data.get("isLast", True) or not values:
+                return members
+            start += len(values)
+
+    def user_groups(self, account_id):
+        """Groups a user belongs to: [{"name", "groupId"}]"""
+        return self._jira_get("/rest/api/3/user/groups", {"accountId": account_id})
+
+    # -- writes -- #
+    def _write(self, method, url, job=None, **kwargs):
+        """Send a write that is safe to repeat, retrying 429 / 5xx and connection errors.
+
+        Waits the Retry-After the server asks for, otherwise a jittered
+        exponential backoff; returns the last response (check it with
+        write_succeeded). Only for calls whose repeat cannot change more
+        than the first attempt would have.
+        """
+        endpoint = classify_endpoint(method, url)
+        for attempt in range(WRITE_RETRIES + 1):
+            self._wait_turn(method, url, job)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == WRITE_RETRIES:
+                    raise
+                self._backoff(job, url, endpoint, attempt, None)
+                continue
+            if response.status_code not in WRITE_RETRY_STATUSES or attempt == WRITE_RETRIES:
+                return response
+            self._backoff(job, url, endpoint, attempt, response)
+
+    def _backoff(self, job, url, endpoint, attempt, response):
+        delay = random.uniform(0, min(WRITE_BACKOFF_MAX, WRITE_BACKOFF * 2 ** attempt))
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, WRITE_BACKOFF)  # spread the threads that were told the same time
+        if self.limiter is not None:
+            self.limiter.for_url(url).hold(delay)  # the other clients on this host back off too
+        start = time.perf_counter()
+        try:
+            if job is not None:
+                job.sleep(delay)
+            else:
+                time.sleep(delay)
+        finally:
+            if self.metrics is not None:
+                rate_limited = response is not None and (response.status_code == 429 or retry_after is not None)
+                self.metrics.record_retry(endpoint, time.perf_counter() - start, rate_limited)
+
+    def set_lifecycle(self, account_id, enable, job=None):
+        """Deactivate (enable=False) or reactivate a managed account via the Org API"""
+        if not self.org_api_key:
+            raise JiraAPIError("User lifecycle changes require the Organization API key")
+        action = "enable" if enable else "disable"
+        return self._write(
+            "POST",
+            f"{ORG_API_BASE}/users/{account_id}/manage/lifecycle/{action}",
+            job,
+            headers=self.org_headers(),
+            timeout=30
+        )
+
+    def add_to_group(self, account_id, group_name, job=None):
+        return self._write(
+            "POST",
+            f"{self.jira_url}/rest/api/3/group/user",
+            job,
+            params={"groupname": group_name},
+            json={"accountId": account_id},
+            auth=self.auth(),
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            timeout=30
+        )
+
+    def remove_from_group(self, account_id, group_name, job=None):
+        return self._write(
+            "DELETE",
+            f"{self.jira_url}/rest/api/3/group/user",
+            job,
+            params={"groupname": group_name, "accountId": account_id},
+            auth=self.auth(),
+            headers={"Accept": "application/json"},
+            timeout=30
+        )
+
+
+def response_endpoint(response):
+    """Endpoint label of a finished request (for pacing metrics)"""
+    return classify_endpoint(response.request.method, response.request.url)
+
+
+def retry_after_seconds(response):
+    """Seconds the server asked to wait (Retry-After as seconds or an HTTP date), or None"""
+    value = (response.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def already_applied(response, action):
+    """True if a group write failed only because it was already done (a repeat of a call that went through).
+
+    `action` is "add_group" or "remove_group": only an add may find the
+    user "already a member", only a remove "not a member".
+    """
+    phrase = ALREADY_APPLIED.get(action)
+    if phrase is None or response.status_code not in (400, 404):
+        return False
+    return phrase in (response.text or "").lower()
+
+
+def write_succeeded(response, action=None):
+    """True if a write went through; for a group `action` (see already_applied) also if it was already done"""
+    return response.status_code in (200, 201, 204) or already_applied(response, action)
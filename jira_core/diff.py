@@ -0,0 +1,155 @@
+"""What changed between two crawls of a site.
+
+Works on the compact states of jira_core.history (directory_state() or
+HistoryStore.state()): users keyed by accountId, groups keyed by name
+with their groupId. Users are joined on accountId and groups on groupId
+(so a renamed group is a rename, not a delete plus a create); every
+lookup is a dict / set operation, so a diff is linear in the size of the
+two snapshots.
+"""
+
+from .history import directory_state
+
+# Change kinds, in the order they are listed
+JOINED = "joined"
+LEFT = "left"
+STATUS = "status"
+EMAIL = "email"
+NAME = "name"
+TYPE = "type"
+PRODUCT_ADDED = "product_added"
+PRODUCT_REMOVED = "product_removed"
+MEMBER_ADDED = "member_added"
+MEMBER_REMOVED = "member_removed"
+GROUP_CREATED = "group_created"
+GROUP_DELETED = "group_deleted"
+GROUP_RENAMED = "group_renamed"
+
+KINDS = (
+    JOINED, LEFT, STATUS, EMAIL, NAME, TYPE, PRODUCT_ADDED, PRODUCT_REMOVED,
+    MEMBER_ADDED, MEMBER_REMOVED, GROUP_CREATED, GROUP_DELETED, GROUP_RENAMED,
+)
+KIND_LABELS = {
+    JOINED: "New account",
+    LEFT: "Removed account",
+    STATUS: "Status changed",
+    EMAIL: "Email changed",
+    NAME: "Name changed",
+    TYPE: "Type changed",
+    PRODUCT_ADDED: "Product access added",
+    PRODUCT_REMOVED: "Product access removed",
+    MEMBER_ADDED: "Added to group",
+    MEMBER_REMOVED: "Removed from group",
+    GROUP_CREATED: "Group created",
+    GROUP_DELETED: "Group deleted",
+    GROUP_RENAMED: "Group renamed",
+}
+_FIELDS = ((STATUS, "status"), (EMAIL, "email"), (NAME, "name"), (TYPE, "type"))
+
+
+class SnapshotDiff:
+    """Changes from one snapshot state to another.
+
+    `changes` is a list of {"kind", "account_id", "name", "email", "group", "old", "new"}
+    sorted by kind, then group, then user name. "group" is empty for user
+    changes; "account_id" / "name" / "email" are empty for group changes.
+    """
+
+    def __init__(self, old, new, old_label="", new_label=""):
+        self.old_label = old_label
+        self.new_label = new_label
+        self.changes = []
+        self._users(old["users"], new["users"])
+        self._groups(old["groups"], new["groups"], old["users"], new["users"])
+        order = {kind: i for i, kind in enumerate(KINDS)}
+        self.changes.sort(key=lambda c: (order[c["kind"]], c["group"].lower(), c["name"].lower(), c["account_id"]))
+
+    def _add(self, kind, rec=None, account_id="", group="", old="", new=""):
+        rec = rec or {}
+        self.changes.append({
+            "kind": kind,
+            "account_id": account_id,
+            "name": rec.get("name", ""),
+            "email": rec.get("email", ""),
+            "group": group,
+            "old": old,
+            "new": new,
+        })
+
+    def _users(self, old_users, new_users):
+        for account_id, rec in new_users.items():
+            before = old_users.get(account_id)
+            if before is None:
+                self._add(JOINED, rec, account_id, new=rec.get("status", ""))
+                continue
+            if before == rec:
+                continue
+            for kind, field in _FIELDS:
+                if before.get(field, "") != rec.get(field, ""):
+                    self._add(kind, rec, account_id, old=before.get(field, ""), new=rec.get(field, ""))
+            old_products, new_products = before.get("products") or {}, rec.get("products") or {}
+            for key in new_products.keys() - old_products.keys():
+                self._add(PRODUCT_ADDED, rec, account_id, new=key)
+            for key in old_products.keys() - new_products.keys():
+                self._add(PRODUCT_REMOVED, rec, account_id, old=key)
+        for account_id, rec in old_users.items():
+            if account_id not in new_users:
+                self._add(LEFT, rec, account_id, old=rec.get("status", ""))
+
+    def _groups(self, old_groups, new_groups, old_users, new_users):
+        # Join on groupId; groups without one fall back to their name
+        old_by_id = {rec.get("id") or f"name:{name}": name for name, rec in old_groups.items()}
+        seen = set()
+        for name, rec in new_groups.items():
+            group_id = rec.get("id") or f"name:{name}"
+            old_name = old_by_id.get(group_id)
+            if old_name is None:
+                self._add(GROUP_CREATED, group=name, new=_size_text(rec))
+                continue
+            seen.add(group_id)
+            if old_name != name:
+                self._add(GROUP_RENAMED, group=name, old=old_name, new=name)
+            before = old_groups[old_name]
+            if "members" not in rec or "members" not in before:
+                continue  # members not loaded in one of the crawls
+            old_members, new_members = set(before["members"]), set(rec["members"])
+            for account_id in new_members - old_members:
+                self._add(MEMBER_ADDED, new_users.get(account_id) or old_users.get(account_id), account_id, group=name)
+            for account_id in old_members - new_members:
+                self._add(MEMBER_REMOVED, new_users.get(account_id) or old_users.get(account_id), account_id, group=name)
+        for group_id, name in old_by_id.items():
+            if group_id not in seen:
+                self._add(GROUP_DELETED, group=name, old=_size_text(old_groups[name]))
+
+    def counts(self):
+        """{kind: number of changes} for every kind that has any"""
+        counts = {}
+        for c in self.changes:
+            counts[c["kind"]] = counts.get(c["kind"], 0) + 1
+        return counts
+
+    def of_kind(self, *kinds):
+        wanted = set(kinds)
+        return [c for c in self.changes if c["kind"] in wanted]
+
+    def summary_text(self):
+        counts = self.counts()
+        if not counts:
+            return "No changes"
+        return ", ".join(f"{counts[k]} {KIND_LABELS[k].lower()}" for k in KINDS if k in counts)
+
+    def __len__(self):
+        return len(self.changes)
+
+
+def _size_text(rec):
+    if "members" in rec:
+        return f"{len(rec['members'])} members"
+    if rec.get("count") is not None:
+        return f"{rec['count']} members"
+    return ""
+
+
+def diff_directories(old, new):
+    """SnapshotDiff between two Directory objects"""
+    return SnapshotDiff(directory_state(old), directory_state(new), old.fetched_at, new.fetched_at)
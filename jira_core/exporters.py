@@ -0,0 +1,205 @@
+"""CSV / JSON writers for users, groups, products and reports.
+
+Each writer takes an already-open path and the model data, so the GUI
+and the CLI produce byte-identical files.
+"""
+
+import csv
+import json
+from datetime import datetime
+
+from .model import format_timestamp, most_recent_activity
+
+USER_COLUMNS = ["Display Name", "Email", "Account ID", "Account Type", "Status", "Last Active"]
+GROUP_MEMBER_COLUMNS = ["Group Name", "Group ID", "Member Count", "Member Name", "Member Email", "Member ID", "Member Type", "Member Status", "Last Active"]
+GROUP_COLUMNS = ["Group Name", "Group ID", "Member Count"]
+PRODUCT_COLUMNS = ["Product Name", "Product URL", "User Name", "User Email", "User Status", "Last Active in Product"]
+STALE_COLUMNS = ["account_id", "name", "email", "status", "product", "last_active", "days_inactive"]
+CHANGE_COLUMNS = ["kind", "account_id", "name", "email", "group", "old", "new"]
+QUALITY_COLUMNS = ["issue", "account_id", "name", "email", "type", "status", "detail"]
+OVERLAP_COLUMNS = ["kind", "group", "other", "relation", "size", "other_size", "shared", "jaccard"]
+RECONCILE_COLUMNS = ["group", "action", "account_id", "name", "email", "result", "error"]
+WORKSPACE_COLUMNS = {
+    "users": ["account_id", "name", "email", "type", "sites", "status", "last_active", "products"],
+    "groups": ["site", "name", "group_id", "members"],
+    "products": ["name", "key", "url", "sites", "users", "most_recent"],
+}
+
+
+def timestamped_filename(prefix, ext="csv"):
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
+
+
+def user_export_row(u, org_mode, joined=False):
+    if org_mode:
+        row = [
+            u.get("name", ""),
+            u.get("email", ""),
+            u.get("account_id", ""),
+            u.get("account_type", ""),
+            u.get("account_status", ""),
+            format_timestamp(u.get("last_active", ""))
+        ]
+        if joined:
+            row.append("" if "active" not in u else "Active" if u["active"] else "Inactive")
+        return row
+    return [
+        u.get("displayName", ""),
+        u.get("emailAddress", ""),
+        u.get("accountId", ""),
+        u.get("accountType", ""),
+        "Active" if u.get("active") else "Inactive",
+        "N/A (use Org API)"
+    ]
+
+
+def write_users_csv(path, users, org_mode):
+    """Org API users joined with the site's users (jira_core.joined) get a "Site Status" column"""
+    joined = org_mode and any("active" in u for u in users)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(USER_COLUMNS + ["Site Status"] if joined else USER_COLUMNS)
+        writer.writerows(user_export_row(u, org_mode, joined) for u in users)
+    return len(users)
+
+
+def write_groups_csv(path, groups, members):
+    """One row per loaded group member (or one empty row for groups without loaded members)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(GROUP_MEMBER_COLUMNS)
+        for g in groups:
+            group_name = g.get("name", "")
+            group_id = g.get("groupId", "")
+            group_members = members.get(group_name, [])
+            if not group_members:
+                writer.writerow([group_name, group_id, 0, "", "", "", "", "", ""])
+                continue
+            for m in group_members:
+                writer.writerow([
+                    group_name,
+                    group_id,
+                    len(group_members),
+                    m.get("displayName", ""),
+                    m.get("emailAddress", ""),
+                    m.get("accountId", ""),
+                    m.get("accountType", ""),
+                    "Active" if m.get("active") else "Inactive",
+                    "N/A"
+                ])
+    return len(groups)
+
+
+def write_group_summary_csv(path, groups):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(GROUP_COLUMNS)
+        for g in groups:
+            writer.writerow([g.get("name", ""), g.get("groupId", ""), g.get("memberCount", "")])
+    return len(groups)
+
+
+def write_products_csv(path, products):
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(PRODUCT_COLUMNS)
+        for product in sorted(products.values(), key=lambda p: p["name"]):
+            for user in sorted(product["users"], key=lambda u: u["name"]):
+                writer.writerow([
+                    product["name"],
+                    product["url"],
+                    user["name"],
+                    user["email"],
+                    user["status"],
+                    user["last_active"]
+                ])
+                rows += 1
+    return rows
+
+
+def product_summary(products):
+    """[{"name", "key", "url", "users", "most_recent"}] sorted by name"""
+    return [
+        {
+            "name": p["name"],
+            "key": p["key"],
+            "url": p["url"],
+            "users": len(p["users"]),
+            "most_recent": most_recent_activity(p),
+        }
+        for p in sorted(products.values(), key=lambda p: p["name"])
+    ]
+
+
+def write_stale_csv(path, rows):
+    """ActivityReport.stale() rows (days_inactive is empty for never-active users)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=STALE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_stale_summary_csv(path, summary):
+    """ActivityReport.summary() rows: one per product with the N+ days inactive counts"""
+    thresholds = list(summary[0]["inactive"]) if summary else []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Product", "Product Key", "Users", "Never Active"] + [f"Inactive {d}+ days" for d in thresholds])
+        for row in summary:
+            writer.writerow([row["name"], row["product"], row["users"], row["never"]] + [row["inactive"][d] for d in thresholds])
+    return len(summary)
+
+
+def write_changes_csv(path, changes):
+    """SnapshotDiff.changes rows, one per change"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(changes)
+    return len(changes)
+
+
+def write_quality_csv(path, rows):
+    """DataQualityIndex.rows(): one row per account and issue"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=QUALITY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_reconcile_csv(path, rows):
+    """ReconcilePlan.rows() / apply_plan() rows: one row per membership change or skipped entry"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RECONCILE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_workspace_csv(path, what, rows):
+    """MergedDirectory.users() / groups() / products() rows (`what` names which)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=WORKSPACE_COLUMNS[what])
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_overlap_csv(path, similar, subsets, empty=(), single=()):
+    """GroupOverlap results: similar pairs, subsets, then empty and single-member groups"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=OVERLAP_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for kind, pairs in (("similar", similar), ("subset", subsets)):
+            writer.writerows(dict(p, kind=kind) for p in pairs)
+        writer.writerows({"kind": "empty", "group": name, "size": 0} for name in empty)
+        writer.writerows({"kind": "single_member", "group": name, "size": 1} for name in single)
+    return len(similar) + len(subsets) + len(empty) + len(single)
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
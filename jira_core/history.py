@@ -0,0 +1,448 @@
+"""Snapshot history: every crawl of a site kept as a compact generation.
+
+A history directory holds one gzip file per generation plus index.json.
+Most generations are deltas against the previous one: users added,
+changed or removed by accountId, and group members added or removed. A
+full keyframe is written every `keyframe_every` generations, so rebuilding
+one state never replays more than that many files. Users are stored as
+compact records with last_active cut to the day, so a user who only
+logged in again on the same day does not show up in the next delta.
+
+index.json also keeps a small summary per generation: user counts by
+status, users / active users per product, and group sizes. The trend
+queries (users per product per week, group size history...) read only
+these summaries and never open a generation file.
+
+RetentionPolicy decides which generations stay when the history is
+compacted: everything recent, then one per day, then one per week.
+Compaction deletes the others; only a kept generation right after a
+dropped one is rewritten (its delta pointed at a deleted file), the
+rest of the files stay as they are.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from .model import account_id_of
+from .reports import ActivityReport
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+
+def default_history_dir(site):
+    """~/.jira_user_app/history/<site host>"""
+    host = urlsplit(site).netloc or site or "default"
+    safe = "".join(c if c.isalnum() or c in ".-" else "_" for c in host)
+    return os.path.join(os.path.expanduser("~"), ".jira_user_app", "history", safe)
+
+
+# ---------------- Records ---------------- #
+def user_record(u):
+    """Compact history record of a user (either API shape); empty fields are left out"""
+    if "account_id" in u:
+        rec = {
+            "name": u.get("name", ""),
+            "email": u.get("email") or u.get("emailAddress") or "",
+            "type": u.get("account_type", ""),
+            "status": u.get("account_status", ""),
+            "last_active": (u.get("last_active") or "")[:10],
+        }
+        products = {}
+        for p in u.get("product_access") or ():
+            key = p.get("key") or p.get("name") or "unknown"
+            day = (p.get("last_active") or "")[:10]
+            products[key] = max(products.get(key, ""), day)
+        if products:
+            rec["products"] = products
+    else:
+        rec = {
+            "name": u.get("displayName", ""),
+            "email": u.get("emailAddress", ""),
+            "type": u.get("accountType", ""),
+            "status": "active" if u.get("active") else "inactive",
+        }
+    return {k: v for k, v in rec.items() if v}
+
+
+def directory_state(directory):
+    """{"users": {accountId: record}, "groups": {name: {"id", "members" or "count"}}}"""
+    users = {}
+    for u in directory.users:
+        account_id = account_id_of(u)
+        if account_id:
+            users[account_id] = user_record(u)
+    groups = {}
+    for g in directory.groups:
+        name = g.get("name", "")
+        rec = {"id": g.get("groupId", "")}
+        if name in directory.members:
+            rec["members"] = sorted({account_id_of(m) for m in directory.members[name]} - {""})
+        elif g.get("memberCount") not in (None, ""):
+            rec["count"] = g["memberCount"]
+        groups[name] = rec
+    return {"users": users, "groups": groups}
+
+
+def group_size(rec):
+    if "members" in rec:
+        return len(rec["members"])
+    return rec.get("count")
+
+
+# ---------------- Delta encoding ---------------- #
+def encode_delta(old, new):
+    """Changes from state `old` to state `new`"""
+    old_users, new_users = old["users"], new["users"]
+    users = {
+        "set": {k: v for k, v in new_users.items() if old_users.get(k) != v},
+        "del": [k for k in old_users if k not in new_users],
+    }
+    groups = {"set": {}, "del": [k for k in old["groups"] if k not in new["groups"]], "add": {}, "remove": {}}
+    for name, rec in new["groups"].items():
+        before = old["groups"].get(name)
+        meta = {k: v for k, v in rec.items() if k != "members"}
+        if before is None or {k: v for k, v in before.items() if k != "members"} != meta or ("members" in before) != ("members" in rec):
+            groups["set"][name] = meta
+            if "members" in rec:
+                groups["add"][name] = rec["members"]  # membership restated in full
+            continue
+        if "members" in rec:
+            old_members, new_members = set(before["members"]), set(rec["members"])
+            if new_members - old_members:
+                groups["add"][name] = sorted(new_members - old_members)
+            if old_members - new_members:
+                groups["remove"][name] = sorted(old_members - new_members)
+    return {"users": users, "groups": groups}
+
+
+def copy_state(state):
+    """Copy deep enough that apply_delta on the copy leaves `state` alone"""
+    return {"users": dict(state["users"]), "groups": {k: dict(v) for k, v in state["groups"].items()}}
+
+
+def apply_delta(state, delta):
+    """Apply an encode_delta() result to `state` in place"""
+    users = state["users"]
+    for k in delta["users"]["del"]:
+        users.pop(k, None)
+    users.update(delta["users"]["set"])
+
+    groups = state["groups"]
+    d = delta["groups"]
+    for name in d["del"]:
+        groups.pop(name, None)
+    for name, meta in d["set"].items():
+        groups[name] = dict(meta)
+        if name in d["add"]:
+            groups[name]["members"] = []
+    for name, ids in d["remove"].items():
+        gone = set(ids)
+        groups[name]["members"] = [m for m in groups[name]["members"] if m not in gone]
+    for name, ids in d["add"].items():
+        groups[name]["members"] = sorted(set(groups[name].get("members", ())) | set(ids))
+    return state
+
+
+# ---------------- Summaries ---------------- #
+def summarize(directory, state):
+    """Per-generation aggregates the trend queries read"""
+    taken = _parse_time(directory.fetched_at)
+    statuses = {}
+    for rec in state["users"].values():
+        status = rec.get("status", "unknown")
+        statuses[status] = statuses.get(status, 0) + 1
+    products = {}
+    if directory.org_mode:
+        report = ActivityReport(directory.users, as_of=taken.date())
+        for row in report.summary(thresholds=(7, 30)):
+            if not row["product"]:
+                continue
+            products[row["product"]] = {
+                "name": row["name"],
+                "users": row["users"],
+                "active_7d": row["users"] - row["inactive"][7],
+                "active_30d": row["users"] - row["inactive"][30],
+            }
+    return {
+        "users": len(state["users"]),
+        "statuses": statuses,
+        "products": products,
+        "groups": {name: group_size(rec) for name, rec in state["groups"].items() if group_size(rec) is not None},
+    }
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+
+# ---------------- Retention ---------------- #
+class RetentionPolicy:
+    """Which generations compaction keeps, by age of the crawl"""
+
+    def __init__(self, keep_all_days=14, daily_days=90, weekly_days=730, keyframe_every=10):
+        self.keep_all_days = keep_all_days
+        self.daily_days = daily_days
+        self.weekly_days = weekly_days
+        self.keyframe_every = keyframe_every
+
+    def select(self, generations, now=None):
+        """Ids of the generations to keep (generations are index entries, oldest first)"""
+        now = now or datetime.now()
+        keep = set()
+        latest_per_bucket = {}
+        for gen in generations:
+            age = now - _parse_time(gen["taken_at"])
+            taken = _parse_time(gen["taken_at"])
+            if age <= timedelta(days=self.keep_all_days):
+                keep.add(gen["id"])
+            elif age <= timedelta(days=self.daily_days):
+                latest_per_bucket[("day", taken.date())] = gen["id"]
+            elif age <= timedelta(days=self.weekly_days):
+                latest_per_bucket[("week",) + tuple(taken.isocalendar()[:2])] = gen["id"]
+        keep.update(latest_per_bucket.values())
+        if generations:
+            keep.add(generations[-1]["id"])  # never drop the latest crawl
+        return keep
+
+
+# ---------------- Store ---------------- #
+class HistoryStore:
+    """Generations of one site's directory in `path` (see the module docstring)"""
+
+    def __init__(self, path, policy=None):
+        self.path = path
+        self.policy = policy or RetentionPolicy()
+        self.index = self._load_index()
+
+    # -- index -- #
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.path, INDEX_FILE), encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {"version": INDEX_VERSION, "next_id": 1, "epoch": 0, "generations": [], "summaries": []}
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported history index version: {index.get('version')}")
+        return index
+
+    def _save_index(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+
+    @property
+    def generations(self):
+        return self.index["generations"]
+
+    @property
+    def summaries(self):
+        return self.index["summaries"]
+
+    # -- files -- #
+    def _write(self, name, payload):
+        os.makedirs(self.path, exist_ok=True)
+        with gzip.open(os.path.join(self.path, name), "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        return os.path.getsize(os.path.join(self.path, name))
+
+    def _read(self, name):
+        with gzip.open(os.path.join(self.path, name), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _file_name(self, gen_id):
+        return f"g{gen_id:06d}.{self.index['epoch']}.json.gz"
+
+    # -- writing -- #
+    def record(self, directory, compact=True):
+        """Store a crawl as a new generation; returns its index entry"""
+        state = directory_state(directory)
+        gens = self.generations
+        gen_id = self.index["next_id"]
+        since_key = 0
+        for gen in reversed(gens):
+            if gen["kind"] == "key":
+                break
+            since_key += 1
+        entry = {
+            "id": gen_id,
+            "taken_at": directory.fetched_at,
+            "site": directory.site,
+            "org_mode": directory.org_mode,
+            "file": self._file_name(gen_id),
+            "users": len(state["users"]),
+            "groups": len(state["groups"]),
+        }
+        if not gens or since_key + 1 >= self.policy.keyframe_every:
+            entry["kind"] = "key"
+            entry["bytes"] = self._write(entry["file"], state)
+        else:
+            entry["kind"] = "delta"
+            entry["base"] = gens[-1]["id"]
+            entry["bytes"] = self._write(entry["file"], encode_delta(self.state(gens[-1]["id"]), state))
+        summary = dict(summarize(directory, state), id=gen_id, taken_at=directory.fetched_at)
+
+        self.index["next_id"] = gen_id + 1
+        gens.append(entry)
+        self.summaries.append(summary)
+        self._save_index()
+        if compact:
+            self.compact()
+        return entry
+
+    def compact(self, now=None):
+        """Drop generations the retention policy no longer keeps.
+
+        A kept delta right after a dropped generation is rewritten, as a
+        delta against the previous kept generation or, when that would
+        make the chain from its keyframe too long, as a keyframe. Every
+        other kept file is left untouched. Summaries older than the
+        policy's weekly window are dropped too; newer ones are kept even
+        for dropped generations (they are tiny). Returns the number of
+        generations removed.
+        """
+        now = now or datetime.now()
+        gens = self.generations
+        keep = self.policy.select(gens, now)
+        cutoff = now - timedelta(days=self.policy.weekly_days)
+        summaries = [s for s in self.summaries if _parse_time(s["taken_at"]) >= cutoff or s["id"] in keep]
+        if len(keep) == len(gens):
+            if len(summaries) != len(self.summaries):
+                self.index["summaries"] = summaries
+                self._save_index()
+            return 0
+
+        # The states to rewrite (and the ones they are encoded against), read before anything changes
+        kept = [g for g in gens if g["id"] in keep]
+        states = {}
+        rewrite = set()
+        after_drop = False
+        previous = None
+        for gen in gens:
+            if gen["id"] not in keep:
+                after_drop = True
+                continue
+            if after_drop and gen["kind"] != "key":
+                rewrite.add(gen["id"])
+                states[gen["id"]] = self.state(gen["id"])
+                if previous is not None and previous["id"] not in states:
+                    states[previous["id"]] = self.state(previous["id"])
+            after_drop = False
+            previous = gen
+
+        self.index["epoch"] += 1
+        result = []
+        for pos, gen in enumerate(kept):
+            entry = dict(gen)
+            if gen["id"] in rewrite:
+                entry["file"] = self._file_name(gen["id"])
+                entry.pop("base", None)
+                # deltas that will follow this one before the next keyframe or rewritten generation
+                tail = 0
+                for later in kept[pos + 1:]:
+                    if later["kind"] == "key" or later["id"] in rewrite:
+                        break
+                    tail += 1
+                if result and self._depth(result) + 1 + tail < self.policy.keyframe_every:
+                    entry["kind"] = "delta"
+                    entry["base"] = result[-1]["id"]
+                    entry["bytes"] = self._write(entry["file"], encode_delta(states[result[-1]["id"]], states[gen["id"]]))
+                else:
+                    entry["kind"] = "key"
+                    entry["bytes"] = self._write(entry["file"], states[gen["id"]])
+            result.append(entry)
+        removed = len(gens) - len(result)
+        old_files = {g["file"] for g in gens}
+        self.index["generations"] = result
+        self.index["summaries"] = summaries
+        self._save_index()
+        for name in old_files - {g["file"] for g in result}:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+        return removed
+
+    @staticmethod
+    def _depth(gens):
+        """Deltas after the last keyframe of `gens`"""
+        depth = 0
+        for gen in reversed(gens):
+            if gen["kind"] == "key":
+                break
+            depth += 1
+        return depth
+
+    # -- reading -- #
+    def state(self, gen_id=None):
+        """Rebuild one generation (default: the latest) from its keyframe and the deltas after it"""
+        gens = self.generations
+        if not gens:
+            return None
+        pos = len(gens) - 1 if gen_id is None else next((i for i, g in enumerate(gens) if g["id"] == gen_id), None)
+        if pos is None:
+            raise KeyError(f"No generation {gen_id}")
+        start = pos
+        while gens[start]["kind"] != "key":
+            start -= 1
+        state = self._read(gens[start]["file"])
+        for gen in gens[start + 1:pos + 1]:
+            apply_delta(state, self._read(gen["file"]))
+        return state
+
+    def find(self, when):
+        """Latest generation taken at or before `when` (datetime or ISO string); None if none"""
+        when = _parse_time(when) if isinstance(when, str) else when
+        found = None
+        for gen in self.generations:
+            if _parse_time(gen["taken_at"]) <= when:
+                found = gen
+        return found
+
+    # -- trend queries (summaries only) -- #
+    def _per_period(self, period):
+        """Latest summary per day / week / month, oldest first: [(label, summary)]"""
+        buckets = {}
+        for s in self.summaries:
+            taken = _parse_time(s["taken_at"])
+            if period == "day":
+                label = taken.date().isoformat()
+            elif period == "week":
+                year, week, _ = taken.isocalendar()
+                label = f"{year}-W{week:02d}"
+            elif period == "month":
+                label = taken.strftime("%Y-%m")
+            else:
+                label = s["taken_at"]
+            buckets[label] = s
+        return sorted(buckets.items())
+
+    def product_trend(self, metric="active_7d", period="week"):
+        """[(period, {product name: value})]; metric is "users", "active_7d" or "active_30d" """
+        return [
+            (label, {p["name"]: p[metric] for p in s["products"].values()})
+            for label, s in self._per_period(period)
+        ]
+
+    def user_trend(self, period="week"):
+        """[(period, total users, {status: count})]"""
+        return [(label, s["users"], s["statuses"]) for label, s in self._per_period(period)]
+
+    def group_size_history(self, name, period=None):
+        """[(period or taken_at, member count)] for one group (crawls without it are skipped)"""
+        return [(label, s["groups"][name]) for label, s in self._per_period(period) if name in s["groups"]]
+
+    def largest_groups(self, count=10):
+        """Names of the largest groups in the latest summary"""
+        if not self.summaries:
+            return []
+        sizes = self.summaries[-1]["groups"]
+        return sorted(sizes, key=lambda n: sizes[n], reverse=True)[:count]
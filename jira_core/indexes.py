@@ -0,0 +1,211 @@
+"""Lookup indexes over users (either API shape) and groups."""
+
+import bisect
+import threading
+
+from .model import account_id_of, add_product_access, org_user_email
+
+
+class UserIndex:
+    """accountId and case-insensitive email -> user"""
+
+    def __init__(self, users=()):
+        self.by_id = {}
+        self.by_email = {}
+        for u in users:
+            self.add(u)
+
+    def add(self, u):
+        account_id = account_id_of(u)
+        if account_id:
+            self.by_id[account_id] = u
+        email = (org_user_email(u) or "").strip().lower()
+        if email:
+            self.by_email.setdefault(email, u)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def resolve(self, key):
+        """Find a user by accountId or email; None if unknown"""
+        key = (key or "").strip()
+        return self.by_id.get(key) or self.by_email.get(key.lower())
+
+
+class ProductIndex:
+    """Product -> users with access, kept current while Org API pages arrive.
+
+    The fetch worker adds each page as it is ingested and the Tk thread
+    reads it, so every access takes the lock and readers get copies.
+    `version` changes on every update.
+
+    Per product, the name-sorted member list and a lowercase text of all
+    member names / emails (for substring search) are cached and extended
+    with the members added since they were last built.
+    """
+
+    def __init__(self, users=()):
+        self.products = {}  # product_id -> analyze_products() entry
+        self.version = 0
+        self._sorted = {}  # product_id -> (users sorted by name, how many users it covers)
+        self._text = {}  # product_id -> ("\nname\nemail..." lowercased, how many users it covers)
+        self._lock = threading.Lock()
+        self.add_users(users)
+
+    def add_users(self, users):
+        with self._lock:
+            for u in users:
+                add_product_access(self.products, u)
+            self.version += 1
+
+    def __len__(self):
+        return len(self.products)
+
+    def rows(self):
+        """[(product_id, name, url, user_count, last_active)] sorted by product name"""
+        with self._lock:
+            rows = [(pid, p["name"], p["url"], len(p["users"]), p["last_active"]) for pid, p in self.products.items()]
+        rows.sort(key=lambda r: r[1])
+        return rows
+
+    def page(self, pid, start=0, count=None):
+        """(users[start:start + count] sorted by name, total users) for one product"""
+        with self._lock:
+            product = self.products.get(pid)
+            if product is None:
+                return [], 0
+            ordered = self._sorted_users(pid, product)
+            end = len(ordered) if count is None else start + count
+            return ordered[start:end], len(ordered)
+
+    def users(self, pid):
+        """One product's users sorted by name ([] if unknown)"""
+        return self.page(pid)[0]
+
+    def search(self, term):
+        """Ids of the products whose name, URL or any member's name / email contains `term` (any case)"""
+        term = (term or "").lower()
+        with self._lock:
+            if not term:
+                return set(self.products)
+            return {
+                pid for pid, p in self.products.items()
+                if term in p["name"].lower() or term in p["url"].lower() or term in self._member_text(pid, p)
+            }
+
+    def prepare(self):
+        """Bring the sorted member lists and search text up to date (from a worker, after ingest)"""
+        with self._lock:
+            for pid, p in self.products.items():
+                self._sorted_users(pid, p)
+                self._member_text(pid, p)
+
+    def snapshot(self):
+        """Copy in the analyze_products() shape (for exports)"""
+        with self._lock:
+            return {pid: dict(p, users=list(p["users"])) for pid, p in self.products.items()}
+
+    def _sorted_users(self, pid, product):
+        ordered, covered = self._sorted.get(pid, ([], 0))
+        users = product["users"]
+        if covered < len(users):
+            # Timsort merges the new tail into the already sorted run cheaply
+            ordered.extend(users[covered:])
+            ordered.sort(key=lambda u: u["name"])
+            self._sorted[pid] = (ordered, len(users))
+        return ordered
+
+    def _member_text(self, pid, product):
+        text, covered = self._text.get(pid, ("", 0))
+        users = product["users"]
+        if covered < len(users):
+            text += "".join(f"\n{u['name']}\n{u['email']}" for u in users[covered:]).lower()
+            self._text[pid] = (text, len(users))
+        return text
+
+
+class GroupIndex:
+    """Group name lookup for the group pickers, built once per groups list.
+
+    search() ranks matches: the exact name, then names starting with the
+    term, then names with a word starting with it, then any other name
+    containing it (alphabetical within each rank). Prefix and word-prefix
+    matches come from bisecting sorted keys; substring matches from
+    str.find over one text of all names, or, while the user keeps typing,
+    from the previous term's matches only.
+    """
+
+    def __init__(self, groups=()):
+        self.groups = {}  # name -> group
+        for g in groups:
+            if g.get("name"):
+                self.groups.setdefault(g["name"], g)
+        self.names = sorted(self.groups, key=lambda n: (n.casefold(), n))
+        self._keys = [n.casefold() for n in self.names]
+        self._words = sorted(
+            (word, i)
+            for i, key in enumerate(self._keys)
+            for word in _word_starts(key)
+        )
+        self._text = "\n".join(self._keys)
+        self._starts = []  # offset of each key in _text
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+        self._last = ("", None)  # (term, positions containing it) of the last search
+
+    def __len__(self):
+        return len(self.names)
+
+    def member_count(self, name):
+        """Member count reported by the API (None if unknown)"""
+        return (self.groups.get(name) or {}).get("memberCount")
+
+    def search(self, term, within=None):
+        """Names containing `term` (any case), best matches first; `within` limits them to a set of names"""
+        term = (term or "").casefold().strip()
+        if not term:
+            names = self.names
+        else:
+            exact, prefix, words, contains = self._ranked(term)
+            names = [self.names[i] for i in exact + prefix + words + contains]
+        if within is not None:
+            names = [n for n in names if n in within]
+        return names
+
+    def _ranked(self, term):
+        keys = self._keys
+        lo = bisect.bisect_left(keys, term)
+        hi = bisect.bisect_left(keys, term + "\uffff", lo)
+        exact = [i for i in range(lo, hi) if keys[i] == term]
+        prefix = [i for i in range(lo, hi) if keys[i] != term]
+        taken = set(range(lo, hi))
+
+        w_lo = bisect.bisect_left(self._words, (term,))
+        w_hi = bisect.bisect_left(self._words, (term + "\uffff",), w_lo)
+        words = sorted({i for _, i in self._words[w_lo:w_hi]} - taken)
+        taken.update(words)
+
+        last_term, last_hits = self._last
+        if last_hits is not None and last_term and term.startswith(last_term):
+            hits = [i for i in last_hits if term in keys[i]]  # typing on: narrow the last matches
+        else:
+            hits = []
+            pos = self._text.find(term)
+            while pos != -1:
+                i = bisect.bisect_right(self._starts, pos) - 1
+                hits.append(i)
+                pos = self._text.find(term, self._starts[i] + len(keys[i]) + 1)  # next name
+        self._last = (term, hits)
+        contains = [i for i in hits if i not in taken]
+        return exact, prefix, words, contains
+
+
+def _word_starts(key):
+    """Words of a casefolded group name after the first ("jira-software-users" -> software-users, users)"""
+    starts = []
+    for i in range(1, len(key)):
+        if not key[i - 1].isalnum() and key[i].isalnum():
+            starts.append(key[i:])
+    return starts
@@ -0,0 +1,223 @@
+"""HTTP instrumentation: per-endpoint latency/status/retry metrics.
+
+The instrumented requests session every outbound call goes through lives
+in transport.py; it is re-exported here on first use so that importing
+the metrics does not import requests."""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# (regex, label) used to group outbound calls by API endpoint
+ENDPOINT_PATTERNS = [
+    (re.compile(r"/rest/api/3/users/search"), "users/search"),
+    (re.compile(r"/rest/api/3/group/bulk"), "group/bulk"),
+    (re.compile(r"/rest/api/3/group/member"), "group/member"),
+    (re.compile(r"/rest/api/3/group/user"), "group/user"),
+    (re.compile(r"/rest/api/3/user/groups"), "user/groups"),
+    (re.compile(r"/rest/api/3/myself"), "myself"),
+    (re.compile(r"/admin/v1/orgs/[^/]+/users"), "org users"),
+    (re.compile(r"/admin/v1/orgs/?$"), "orgs"),
+    (re.compile(r"/users/[^/]+/manage/lifecycle/"), "lifecycle"),
+]
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+_request_context = threading.local()  # endpoint/metrics of the call in flight on this thread
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sequence of numbers (0.0 if empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def classify_endpoint(method, url):
+    path = urlsplit(url).path
+    for pattern, label in ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return f"{method.upper()} {label}"
+    return f"{method.upper()} {path}"
+
+
+class EndpointStats:
+    """Counters for one endpoint"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0  # transport errors (no response)
+        self.status_codes = Counter()
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+        self.latencies = deque(maxlen=2000)  # recent samples in ms, for percentiles
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.rate_limited = 0  # retries caused by 429 / Retry-After
+        self.wait_seconds = 0.0  # retry backoff and Retry-After sleeps
+        self.pacing_seconds = 0.0  # deliberate delays between pages
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "latency_ms": {
+                "avg": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+                "p50": round(percentile(self.latencies, 50), 1),
+                "p95": round(percentile(self.latencies, 95), 1),
+                "max": round(self.max_ms, 1),
+                "histogram": {
+                    ("inf" if b == float("inf") else f"<={b}"): n
+                    for b, n in zip(LATENCY_BUCKETS_MS, self.histogram)
+                },
+            },
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "pacing_seconds": round(self.pacing_seconds, 3),
+        }
+
+
+class OperationStats:
+    """Wall time of a user-level operation split into HTTP, waiting and client-side time"""
+
+    def __init__(self):
+        self.runs = 0
+        self.wall_seconds = 0.0
+        self.http_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.last = None
+
+    def to_dict(self):
+        client = max(0.0, self.wall_seconds - self.http_seconds - self.wait_seconds)
+        return {
+            "runs": self.runs,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "http_seconds": round(self.http_seconds, 3),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "client_seconds": round(client, 3),
+            "last": self.last,
+        }
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint HTTP metrics plus per-operation time breakdown"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()  # active operation accumulators for this thread
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.endpoints = {}
+            self.operations = {}
+
+    def _endpoint(self, endpoint):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_request(self, endpoint, elapsed, status=None, bytes_in=0, bytes_out=0):
+        ms = elapsed * 1000.0
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.calls += 1
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.status_codes[status] += 1
+            stats.histogram[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            stats.latencies.append(ms)
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+        op = getattr(self._local, "op", None)
+        if op is not None:
+            op["http"] += elapsed
+
+    def record_retry(self, endpoint, waited, rate_limited=False):
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.retries += 1
+            stats.wait_seconds += waited
+            if rate_limited:
+                stats.rate_limited += 1
+        op = getattr(self._local, "op", None)
+        if op is not None:
+            op["wait"] += waited
+
+    def record_pacing(self, endpoint, waited):
+        with self._lock:
+            self._endpoint(endpoint).pacing_seconds += waited
+        op = getattr(self._local, "op", None)
+        if op is not None:
+            op["wait"] += waited
+
+    @contextmanager
+    def operation(self, name):
+        """Time a user-level operation (e.g. a full crawl) on the current thread"""
+        op = {"http": 0.0, "wait": 0.0}
+        outer = getattr(self._local, "op", None)
+        self._local.op = op
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            self._local.op = outer
+            if outer is not None:
+                outer["http"] += op["http"]
+                outer["wait"] += op["wait"]
+            with self._lock:
+                stats = self.operations.get(name)
+                if stats is None:
+                    stats = self.operations[name] = OperationStats()
+                stats.runs += 1
+                stats.wall_seconds += wall
+                stats.http_seconds += op["http"]
+                stats.wait_seconds += op["wait"]
+                stats.last = {
+                    "wall_seconds": round(wall, 3),
+                    "http_seconds": round(op["http"], 3),
+                    "wait_seconds": round(op["wait"], 3),
+                }
+
+    def latency(self, endpoint):
+        """Median latency of `endpoint` in seconds over the recent samples (None if never called)"""
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            samples = list(stats.latencies) if stats else []
+        return percentile(samples, 50) / 1000.0 if samples else None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "endpoints": {k: v.to_dict() for k, v in sorted(self.endpoints.items())},
+                "operations": {k: v.to_dict() for k, v in sorted(self.operations.items())},
+            }
+
+
+def __getattr__(name):
+    # The session classes need requests, which is slow to import
+    if name in ("InstrumentedRetry", "InstrumentedSession", "create_session"):
+        from . import transport
+        return getattr(transport, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,215 @@
+"""Named background jobs with dedupe, dependencies, priority lanes and
+cooperative cancellation. Headless: UI callbacks go through `dispatch`."""
+
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+LANE_INTERACTIVE = 0  # user-initiated actions (validate, single-user edits)
+LANE_BACKGROUND = 1   # long crawls and bulk runs
+
+
+class JobCancelled(Exception):
+    """Raised inside a job body once the job has been cancelled"""
+
+
+class Job:
+    """A named unit of work tracked by JobScheduler"""
+
+    def __init__(self, name, fn=None, args=(), lane=LANE_BACKGROUND, deps=(), on_ui=False, on_done=None):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.lane = lane
+        self.deps = deps
+        self.on_ui = on_ui
+        self.on_done = on_done
+        self.state = "pending"  # pending -> running -> done / failed / cancelled
+        self.result = None
+        self.error = None
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._subjobs = []
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self):
+        return self._done_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        for sub in list(self._subjobs):
+            sub.cancel()
+
+    def subjob(self, name):
+        """A Job for a helper thread of this one: cancelled with it, or on its own"""
+        sub = Job(f"{self.name}/{name}", lane=self.lane)
+        self._subjobs.append(sub)
+        if self.cancelled:
+            sub.cancel()
+        return sub
+
+    def raise_if_cancelled(self):
+        """Cooperative cancellation point for long-running job bodies"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def sleep(self, seconds):
+        """Sleep between requests, waking up early if the job is cancelled"""
+        if self._cancel_event.wait(seconds):
+            raise JobCancelled(self.name)
+
+    def wait(self, timeout=None):
+        return self._done_event.wait(timeout)
+
+
+class JobScheduler:
+    """Runs named jobs on a small worker pool with priority lanes.
+
+    - Submitting a name that is already in flight returns the existing job
+      instead of starting a second, overlapping run.
+    - Jobs can depend on other jobs (by name or Job); a dependent starts only
+      when all of its dependencies finished successfully and is cancelled
+      otherwise.
+    - Interactive jobs are always picked ahead of background ones, and one
+      worker only serves the interactive lane so a crawl never blocks a click.
+    - Jobs with on_ui=True run on the Tk thread through `dispatch`.
+    """
+
+    def __init__(self, dispatch, workers=4, metrics=None):
+        self.dispatch = dispatch  # callable(fn) that runs fn on the UI thread
+        self.metrics = metrics  # optional RequestMetrics; each job is timed as an operation
+        self._lock = threading.Condition()
+        self._lanes = {LANE_INTERACTIVE: deque(), LANE_BACKGROUND: deque()}
+        self._inflight = {}  # name -> Job (queued, waiting or running)
+        self._waiting = []  # jobs blocked on dependencies
+        self._shutdown = False
+
+        for i in range(workers):
+            lanes = (LANE_INTERACTIVE,) if i == 0 else (LANE_INTERACTIVE, LANE_BACKGROUND)
+            threading.Thread(target=self._worker, args=(lanes,), name=f"job-worker-{i}", daemon=True).start()
+
+    def submit(self, name, fn, *args, lane=LANE_BACKGROUND, after=(), on_ui=False, on_done=None):
+        """Schedule fn(job, *args) under `name` and return its Job"""
+        if isinstance(after, (str, Job)):
+            after = (after,)
+
+        with self._lock:
+            existing = self._inflight.get(name)
+            if existing is not None and not existing.cancelled:
+                return existing
+
+            deps = []
+            for dep in after:
+                dep_job = self._inflight.get(dep) if isinstance(dep, str) else dep
+                if dep_job is not None:
+                    deps.append(dep_job)
+
+            job = Job(name, fn, args, lane, deps, on_ui, on_done)
+            self._inflight[name] = job
+            self._schedule(job)
+        return job
+
+    def get(self, name):
+        with self._lock:
+            return self._inflight.get(name)
+
+    def is_running(self, name):
+        return self.get(name) is not None
+
+    def cancel(self, name):
+        with self._lock:
+            job = self._inflight.get(name)
+        if job is not None:
+            self._cancel(job)
+        return job
+
+    def cancel_all(self, lane=None):
+        with self._lock:
+            jobs = [j for j in self._inflight.values() if lane is None or j.lane == lane]
+        for job in jobs:
+            self._cancel(job)
+        return len(jobs)
+
+    def shutdown(self):
+        self.cancel_all()
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+
+    # -- internals (callers hold self._lock where noted) -- #
+    def _cancel(self, job):
+        job.cancel()
+        with self._lock:
+            waiting = job in self._waiting
+            if waiting:
+                self._waiting.remove(job)
+        if waiting:
+            self._finish(job, "cancelled")
+
+    def _schedule(self, job):
+        """Queue a job whose dependencies are met (lock held)"""
+        if any(not d.done for d in job.deps):
+            self._waiting.append(job)
+            return
+        if any(d.state != "done" for d in job.deps):
+            job.cancel()
+        if job.on_ui:
+            self.dispatch(lambda: self._run(job))
+        else:
+            self._lanes[job.lane].append(job)
+            self._lock.notify_all()
+
+    def _worker(self, lanes):
+        while True:
+            with self._lock:
+                job = None
+                while job is None:
+                    if self._shutdown:
+                        return
+                    for lane in lanes:
+                        if self._lanes[lane]:
+                            job = self._lanes[lane].popleft()
+                            break
+                    else:
+                        self._lock.wait()
+            self._run(job)
+
+    def _run(self, job):
+        if job.cancelled:
+            self._finish(job, "cancelled")
+            return
+        job.state = "running"
+        try:
+            if self.metrics is not None:
+                # "deactivate:<accountId>" and friends are reported as one operation
+                with self.metrics.operation(job.name.split(":")[0]):
+                    job.result = job.fn(job, *job.args)
+            else:
+                job.result = job.fn(job, *job.args)
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = e
+            logger.error("Job '%s' failed: %s", job.name, e)
+            self._finish(job, "failed")
+        else:
+            self._finish(job, "cancelled" if job.cancelled else "done")
+
+    def _finish(self, job, state):
+        with self._lock:
+            job.state = state
+            job._done_event.set()
+            if self._inflight.get(job.name) is job:
+                del self._inflight[job.name]
+            ready = [j for j in self._waiting if all(d.done for d in j.deps)]
+            for j in ready:
+                self._waiting.remove(j)
+                self._schedule(j)
+        if job.on_done is not None:
+            self.dispatch(lambda: job.on_done(job))
@@ -0,0 +1,117 @@
+"""Joined mode: Org API users enriched with the site's own view of each account.
+
+The Organization API knows when each account was last active and which
+products it can use, but not whether the account is active on this Jira
+site; /users/search knows that (and the site's accountType) but nothing
+about activity. In joined mode both are crawled at the same time (the
+site's users on a helper thread, SiteUsersCrawl) and hash-joined on
+accountId once both are complete, so one load gives the full picture.
+
+Joined records keep the Org API shape, so everything that handles Org API
+users handles them unchanged, and gain the site's "active" and
+"accountType". Site users the Org API did not return (e.g. accounts of
+another organization) are converted to that shape with "in_org": False
+and no activity data; org users not on the site have no "active" key.
+"""
+
+import threading
+
+from .checkpoint import checkpointed_pages
+from .jobs import Job
+
+
+def site_only_user(u):
+    """A /users/search user the Org API did not return, in the Org API shape"""
+    return {
+        "account_id": u.get("accountId", ""),
+        "name": u.get("displayName", ""),
+        "email": u.get("emailAddress", ""),
+        "account_type": u.get("accountType", ""),
+        "account_status": "active" if u.get("active") else "inactive",
+        "last_active": "",
+        "product_access": [],
+        "active": bool(u.get("active")),
+        "accountType": u.get("accountType", ""),
+        "in_org": False,
+    }
+
+
+def join_site_users(org_users, site_users):
+    """Org API users with the site's "active" / "accountType" joined in on accountId.
+
+    One pass to hash the site users, one over the org users probing it;
+    the site users left over come last (see site_only_user). Org order is
+    kept, and the input records are not modified.
+    """
+    site = {}
+    for u in site_users:
+        account_id = u.get("accountId")
+        if account_id:
+            site.setdefault(account_id, u)
+    joined = []
+    for u in org_users:
+        match = site.pop(u.get("account_id"), None)
+        if match is None:
+            joined.append(u)
+        else:
+            joined.append(dict(u, active=bool(match.get("active")), accountType=match.get("accountType", "")))
+    joined.extend(site_only_user(u) for u in site.values())
+    return joined
+
+
+def join_counts(users):
+    """(on the site and in the org, site only, org only) over join_site_users() records"""
+    both = site_only = org_only = 0
+    for u in users:
+        if "active" not in u:
+            org_only += 1
+        elif u.get("in_org", True):
+            both += 1
+        else:
+            site_only += 1
+    return both, site_only, org_only
+
+
+def join_summary(users):
+    both, site_only, org_only = join_counts(users)
+    return f"{both} on the site and in the org, {site_only} site only, {org_only} org only"
+
+
+class SiteUsersCrawl:
+    """The site's /users/search users, crawled on a thread of its own.
+
+    Started as soon as it is created, so it runs alongside the Org API
+    crawl of the caller. It stops when `job` is cancelled, or on stop();
+    `client` is closed when it ends. With a checkpoint (see
+    jira_core.checkpoint) its pages are saved and can be resumed.
+    """
+
+    def __init__(self, client, job=None, checkpoint=None, resume=True):
+        self.job = job.subjob("site_users") if job is not None else Job("site_users")
+        self.users = []
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(client, checkpoint, resume), name="site-users", daemon=True)
+        self._thread.start()
+
+    def _run(self, client, checkpoint, resume):
+        fetch = lambda start: client.users_standard_pages(self.job, start)
+        pages = checkpointed_pages(checkpoint, fetch, resume) if checkpoint is not None else (batch for batch, _ in fetch(None))
+        try:
+            for batch in pages:
+                self.users.extend(batch)
+        except Exception as e:
+            self.error = e
+        finally:
+            client.close()
+
+    def stop(self):
+        """Cancel the crawl and wait for its thread"""
+        self.job.cancel()
+        self._thread.join()
+
+    def result(self):
+        """Every site user, once the crawl has finished; raises its error if it failed"""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.users
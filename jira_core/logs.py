@@ -0,0 +1,140 @@
+"""Leveled logging for the GUI, the command line and jira_core.
+
+Modules log through logging.getLogger(__name__) with %-style arguments,
+so a message below the active level costs one level check and is never
+formatted; anything more expensive (e.g. dumping a record as JSON) sits
+behind isEnabledFor(). Per-row and per-page diagnostics are DEBUG.
+
+setup_logging() routes every logger through a QueueHandler: the calling
+thread (a crawl worker, or the Tk thread) only puts the record on a queue,
+and a QueueListener thread writes it to the console and to a rotating
+file, ~/.jira_user_app/logs/jira_user_app.log by default. A SampleFilter
+in front of the queue lets the first few records of each DEBUG / INFO
+message template through, then one in `every` with the number dropped
+since, so a 100k-user crawl at DEBUG does not flood the console.
+
+The level is INFO unless the JIRA_USER_APP_LOG_LEVEL environment
+variable (or the caller) says otherwise; set_level() changes it at run
+time.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LEVEL_ENV = "JIRA_USER_APP_LOG_LEVEL"
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+MAX_BYTES = 2 * 1024 * 1024  # per log file
+BACKUPS = 3  # rotated files kept
+SAMPLE_BURST = 20  # records of one template always let through
+SAMPLE_EVERY = 100  # then one in this many
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+FILE_FORMAT = "%(asctime)s %(levelname)-7s [%(threadName)s] %(name)s: %(message)s"
+
+_listener = None
+_lock = threading.Lock()
+
+
+def default_log_file():
+    return os.path.join(os.path.expanduser("~"), ".jira_user_app", "logs", "jira_user_app.log")
+
+
+def parse_level(level):
+    """"debug" / "INFO" / 10 / None -> a logging level (None: the environment variable, else INFO)"""
+    if level is None:
+        level = os.environ.get(LEVEL_ENV) or "INFO"
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return value
+
+
+class SampleFilter(logging.Filter):
+    """Thin out repetitive records: per (logger, message template), the first
+    `burst` pass, then one in `every`, which says how many were dropped.
+
+    Records above `level` (warnings and errors by default) always pass.
+    """
+
+    def __init__(self, burst=SAMPLE_BURST, every=SAMPLE_EVERY, level=logging.INFO):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.level = level
+        self._seen = {}  # (logger name, template) -> records seen
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.level:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._seen.get(key, 0) + 1
+            self._seen[key] = seen
+        if seen <= self.burst:
+            return True
+        if (seen - self.burst) % self.every:
+            return False
+        if isinstance(record.args, tuple) and record.args:  # a %-style template: add the count as one more argument
+            record.msg = f"{record.msg} (%d similar suppressed)"
+            record.args = record.args + (self.every - 1,)
+        return True
+
+
+def setup_logging(level=None, console=True, log_file="", max_bytes=MAX_BYTES, backups=BACKUPS,
+                  console_format=CONSOLE_FORMAT, sample=True):
+    """Send every logger through a queue to the console (stderr) and a rotating file; returns the level.
+
+    log_file="" is default_log_file(), None writes no file. Calling it
+    again only changes the level. The listener is stopped (and the queue
+    flushed) at exit.
+    """
+    global _listener
+    level = parse_level(level)
+    with _lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _listener is not None:
+            return level
+
+        handlers = []
+        if console:
+            stream = logging.StreamHandler()
+            stream.setFormatter(logging.Formatter(console_format, "%H:%M:%S"))
+            handlers.append(stream)
+        if log_file is not None:
+            path = log_file or default_log_file()
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                rotating = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+                rotating.setFormatter(logging.Formatter(FILE_FORMAT))
+                handlers.append(rotating)
+            except OSError as e:
+                print(f"Could not open the log file {path}: {e}", file=sys.stderr)  # stdout is the CLI's output
+
+        records = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(records)
+        if sample:
+            handler.addFilter(SampleFilter())
+        root.addHandler(handler)
+        _listener = logging.handlers.QueueListener(records, *handlers)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return level
+
+
+def set_level(level):
+    """Change the level of every logger at run time"""
+    level = parse_level(level)
+    logging.getLogger().setLevel(level)
+    return level
+
+
+def current_level():
+    return logging.getLevelName(logging.getLogger().getEffectiveLevel())
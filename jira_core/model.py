@@ -0,0 +1,352 @@
+"""Directory data model: user/group records as returned by the APIs, the
+display formatting shared by the GUI and the exports, filtering and
+product analysis."""
+
+import gzip
+import json
+from datetime import datetime
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_isoparse = None
+
+
+def isoparse(value):
+    """dateutil's isoparse, imported on first use (dateutil is slow to import)"""
+    global _isoparse
+    if _isoparse is None:
+        from dateutil.parser import isoparse as _isoparse  # pip install python-dateutil
+    return _isoparse(value)
+
+
+def format_timestamp(value, default=""):
+    """ISO timestamp from the API -> "YYYY-mm-dd HH:MM:SS" (unchanged if unparseable)"""
+    if not value:
+        return default
+    # The APIs send "YYYY-mm-ddTHH:MM:SS[.fff][Z|+hh:mm]"; the wall-clock part
+    # is what isoparse + strftime would print, so skip the parse for it
+    if len(value) >= 19 and value[10] == "T" and value[:4].isdigit() and value[13] == ":" and value[16] == ":":
+        return f"{value[:10]} {value[11:19]}"
+    try:
+        return isoparse(value).strftime(TIMESTAMP_FORMAT)
+    except (ValueError, OverflowError):
+        return value
+
+
+def org_user_email(u):
+    """Email of an Org API user; the field name varies between account kinds"""
+    email = u.get("email") or u.get("emailAddress") or u.get("user_email") or ""
+    # For invited users, email might be in a nested field
+    if not email and "account" in u:
+        email = u["account"].get("email", "")
+    return email
+
+
+def is_invited(status):
+    return bool(status) and "invited" in status.lower()
+
+
+def status_tag(status):
+    """Row tag for an Org API account_status (None if it gets no colour)"""
+    if not status:
+        return None
+    status_lower = status.lower()
+    if "active" in status_lower and "inactive" not in status_lower:
+        return "active"
+    if "inactive" in status_lower:
+        return "inactive"
+    if "invited" in status_lower:
+        return "invited"
+    return None
+
+
+def org_user_values(u):
+    """(name, email, account_id, type, status, last_active) as shown for an Org API user"""
+    status = u.get("account_status", "")
+    email = org_user_email(u)
+    if not email:
+        email = "(Invited - email pending)" if is_invited(status) else "(No email)"
+    if u.get("active") is False and status.lower() == "active":
+        status = f"{status} (inactive on site)"  # joined with the site's users (jira_core.joined)
+    return (
+        u.get("name", ""),
+        email,
+        u.get("account_id", ""),
+        u.get("account_type", ""),
+        status,
+        format_timestamp(u.get("last_active", ""), "Never logged in" if u.get("in_org", True) else "N/A (not in org)"),
+    )
+
+
+def standard_user_values(u):
+    """(name, email, account_id, type, status, last_active) as shown for a users/search user"""
+    return (
+        u.get("displayName", ""),
+        u.get("emailAddress", "") or "(No email)",
+        u.get("accountId", ""),
+        u.get("accountType", ""),
+        "Active" if u.get("active") else "Inactive",
+        "N/A (use Org API)",
+    )
+
+
+def account_id_of(u):
+    return u.get("account_id") or u.get("accountId") or ""
+
+
+# ---------------- Filtering ---------------- #
+def parse_date_range(date_from, date_to):
+    """"YYYY-mm-dd" strings -> (datetime or None, datetime or None); date_to is inclusive"""
+    start = end = None
+    try:
+        if date_from:
+            start = datetime.strptime(date_from, "%Y-%m-%d")
+        if date_to:
+            end = datetime.strptime(date_to, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
+    except ValueError:
+        pass
+    return start, end
+
+
+class UserFilter:
+    """The Users view filters: search term, status, account type and last-active range"""
+
+    def __init__(self, term="", status="All", account_type="All", date_from=None, date_to=None):
+        self.term = (term or "").lower()
+        self.status = status or "All"
+        self.account_type = account_type or "All"
+        self.date_from = date_from
+        self.date_to = date_to
+
+    @property
+    def active(self):
+        return bool(self.term or self.status != "All" or self.account_type != "All" or self.date_from or self.date_to)
+
+    def match_org(self, u):
+        if self.term and not (
+            self.term in (u.get("name", "") or "").lower() or
+            self.term in (u.get("email", "") or "").lower() or
+            self.term in (u.get("account_id", "") or "").lower()
+        ):
+            return False
+        if self.status != "All" and u.get("account_status", "").lower() != self.status.lower():
+            return False
+        if self.account_type != "All" and u.get("account_type", "") != self.account_type:
+            return False
+        if self.date_from or self.date_to:
+            last_active = u.get("last_active", "")
+            if not last_active:
+                return False
+            try:
+                user_date = isoparse(last_active)
+                # Compare as naive datetimes, like the date pickers
+                user_date = user_date.replace(tzinfo=None)
+            except (ValueError, OverflowError):
+                return False
+            if self.date_from and user_date < self.date_from:
+                return False
+            if self.date_to and user_date > self.date_to:
+                return False
+        return True
+
+    def match_standard(self, u):
+        if self.term and not (
+            self.term in (u.get("displayName", "") or "").lower() or
+            self.term in (u.get("emailAddress", "") or "").lower() or
+            self.term in (u.get("accountId", "") or "").lower()
+        ):
+            return False
+        if self.status != "All":
+            is_active = u.get("active", False)
+            if self.status == "Active" and not is_active:
+                return False
+            if self.status == "Inactive" and is_active:
+                return False
+        if self.account_type != "All" and u.get("accountType", "") != self.account_type:
+            return False
+        return True
+
+
+def filter_users(users, criteria, org_mode):
+    match = criteria.match_org if org_mode else criteria.match_standard
+    return [u for u in users if match(u)]
+
+
+def filter_groups(groups, term):
+    term = (term or "").lower()
+    if not term:
+        return groups
+    return [
+        g for g in groups
+        if term in (g.get("name", "") or "").lower() or
+           term in (g.get("groupId", "") or "").lower()
+    ]
+
+
+# ---------------- Selection ---------------- #
+class Selection:
+    """accountIds picked for a bulk action, independent of the rows on screen.
+
+    Re-filtering or re-sorting the Users view rebuilds its rows but leaves
+    the selection alone; rows are drawn checked if their user is in it.
+    """
+
+    def __init__(self):
+        self.ids = set()
+
+    def __contains__(self, account_id):
+        return account_id in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def toggle(self, account_id):
+        """Flip one user; returns True if now selected"""
+        if account_id in self.ids:
+            self.ids.discard(account_id)
+            return False
+        self.ids.add(account_id)
+        return True
+
+    def covers(self, users):
+        """True if every one of `users` is selected"""
+        return all(account_id_of(u) in self.ids for u in users)
+
+    def select(self, users):
+        self.ids.update(account_id_of(u) for u in users)
+        self.ids.discard("")
+
+    def deselect(self, users):
+        self.ids.difference_update(account_id_of(u) for u in users)
+
+    def clear(self):
+        self.ids.clear()
+
+    def retain(self, known_ids):
+        """Drop users no longer in the directory (after a new crawl)"""
+        self.ids.intersection_update(known_ids)
+
+    def users(self, index):
+        """Selected users as the {"account_id", "name", "email", "status"} dicts bulk actions take"""
+        result = []
+        for account_id in self.ids:
+            u = index.by_id.get(account_id)
+            if u is None:
+                continue
+            if "account_id" in u:
+                name, email, status = u.get("name", ""), org_user_email(u), u.get("account_status", "")
+            else:
+                name, email, status = u.get("displayName", ""), u.get("emailAddress", ""), "Active" if u.get("active") else "Inactive"
+            result.append({"account_id": account_id, "name": name or account_id, "email": email, "status": status})
+        result.sort(key=lambda u: u["name"].lower())
+        return result
+
+
+# ---------------- Products ---------------- #
+def product_id(name, url):
+    return f"{name}|{url}"
+
+
+def add_product_access(products, user):
+    """Add one Org API user's product grants to `products` (see analyze_products)"""
+    entry_user = {
+        "name": user.get("name", ""),
+        "email": user.get("email", "") or "(No email)",
+        "id": user.get("account_id", ""),
+        "status": user.get("account_status", ""),
+    }
+    for product in user.get("product_access", []):
+        product_name = product.get("name", "Unknown")
+        product_url = product.get("url", "")
+        pid = product_id(product_name, product_url)
+        entry = products.get(pid)
+        if entry is None:
+            entry = products[pid] = {
+                "name": product_name,
+                "key": product.get("key", ""),
+                "url": product_url,
+                "users": [],
+                "last_active": "Never",  # most recent activity of any user
+            }
+        last_active = format_timestamp(product.get("last_active", ""), "Never")
+        entry["users"].append(dict(entry_user, last_active=last_active))
+        if last_active != "Never" and (entry["last_active"] == "Never" or last_active > entry["last_active"]):
+            entry["last_active"] = last_active
+
+
+def analyze_products(users):
+    """Org API users -> {product_id: {"name", "key", "url", "users": [...], "last_active"}}"""
+    products = {}
+    for user in users:
+        add_product_access(products, user)
+    return products
+
+
+def most_recent_activity(product):
+    if "last_active" in product:
+        return product["last_active"]
+    last_actives = [u["last_active"] for u in product["users"] if u["last_active"] != "Never"]
+    return max(last_actives) if last_actives else "Never"
+
+
+def filter_products(products, term):
+    term = (term or "").lower()
+    if not term:
+        return products
+    return {
+        pid: pdata for pid, pdata in products.items()
+        if term in pdata["name"].lower() or
+           term in pdata["url"].lower() or
+           any(term in u["name"].lower() or term in u["email"].lower() for u in pdata["users"])
+    }
+
+
+# ---------------- Directory ---------------- #
+class Directory:
+    """One crawl of a site: users, groups and the group members loaded so far"""
+
+    def __init__(self, users=None, groups=None, members=None, org_mode=False, site="", fetched_at=None):
+        self.users = users or []
+        self.groups = groups or []
+        self.members = members or {}  # group name -> [standard API user]
+        self.org_mode = org_mode
+        self.site = site
+        self.fetched_at = fetched_at or datetime.now().isoformat(timespec="seconds")
+
+    def user_values(self, u):
+        return org_user_values(u) if self.org_mode else standard_user_values(u)
+
+    def to_dict(self):
+        return {
+            "fetched_at": self.fetched_at,
+            "site": self.site,
+            "org_mode": self.org_mode,
+            "users": self.users,
+            "groups": self.groups,
+            "members": self.members,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            users=data.get("users", []),
+            groups=data.get("groups", []),
+            members=data.get("members", {}),
+            org_mode=data.get("org_mode", False),
+            site=data.get("site", ""),
+            fetched_at=data.get("fetched_at"),
+        )
+
+    def save(self, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,157 @@
+"""Group overlap / redundancy analysis over loaded group memberships.
+
+Every member gets a dense index (one bit) and every group a bitset (a
+Python int), so the members two groups share are one AND and a popcount.
+Near-duplicate pairs are found without comparing every pair of groups:
+
+- size bound: Jaccard(A, B) <= |A| / |B| for |A| <= |B|, so a group is
+  only compared with groups close to its size
+- prefix filter: with members ordered rarest first, two groups with
+  Jaccard >= t must share one of the first |G| - ceil(t * |G|) + 1
+  members of each, so candidates come from an inverted index over those
+  prefixes only (exact - no pair above the threshold is missed)
+
+Subset candidates come the same way from each group's rarest member:
+every group containing A also contains that member.
+"""
+
+import math
+
+from .model import account_id_of
+
+DEFAULT_THRESHOLD = 0.5  # minimum Jaccard similarity for a "similar" pair
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(x):
+        return bin(x).count("1")
+
+
+class GroupOverlap:
+    """Bitset per group over `members` ({group name: [standard API user]}).
+
+    `groups` (groups_data) adds the groups whose members are not loaded,
+    so they can be reported as such.
+    """
+
+    def __init__(self, members, groups=()):
+        self.index = {}  # accountId -> bit
+        ids = {}
+        for name, users in members.items():
+            group_ids = set()
+            for u in users:
+                account_id = account_id_of(u)
+                if account_id:
+                    group_ids.add(self.index.setdefault(account_id, len(self.index)))
+            ids[name] = group_ids
+
+        self.sizes = {name: len(bits) for name, bits in ids.items()}
+        self.bits = {}
+        width = (len(self.index) + 7) // 8
+        for name, group_ids in ids.items():
+            buf = bytearray(width)
+            for i in group_ids:
+                buf[i >> 3] |= 1 << (i & 7)
+            self.bits[name] = int.from_bytes(buf, "little")
+
+        # Rarest members first: how many groups each member is in
+        self.frequency = [0] * len(self.index)
+        for group_ids in ids.values():
+            for i in group_ids:
+                self.frequency[i] += 1
+        self._ordered = {
+            name: sorted(group_ids, key=lambda i: (self.frequency[i], i))
+            for name, group_ids in ids.items()
+        }
+        self.unloaded = sorted(g["name"] for g in groups if g.get("name") and g["name"] not in members)
+        self.checked = 0  # candidate pairs verified by the last similar() / subsets() call
+
+    def __len__(self):
+        return len(self.bits)
+
+    def shared(self, a, b):
+        return _popcount(self.bits[a] & self.bits[b])
+
+    def similar(self, threshold=DEFAULT_THRESHOLD, limit=None):
+        """Pairs with Jaccard >= threshold, most similar first.
+
+        [{"group", "other", "size", "other_size", "shared", "jaccard", "relation"}] with
+        relation "identical", "subset" (group is inside other) or "overlap".
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.checked = 0
+        postings = {}  # member bit -> groups indexed under it (ascending size)
+        pairs = []
+        for name in sorted(self._ordered, key=lambda n: (self.sizes[n], n)):
+            size = self.sizes[name]
+            if size == 0:
+                continue
+            prefix = self._ordered[name][:size - math.ceil(threshold * size) + 1]
+            candidates = set()
+            for i in prefix:
+                for other in postings.get(i, ()):
+                    if self.sizes[other] >= threshold * size:
+                        candidates.add(other)
+            for other in candidates:
+                self.checked += 1
+                shared = self.shared(name, other)
+                jaccard = shared / (size + self.sizes[other] - shared)
+                if jaccard >= threshold:
+                    pairs.append(self._pair(other, name, shared, jaccard))
+            for i in prefix:
+                postings.setdefault(i, []).append(name)
+        pairs.sort(key=lambda p: (-p["jaccard"], -p["shared"], p["group"], p["other"]))
+        return pairs[:limit] if limit else pairs
+
+    def _pair(self, small, large, shared, jaccard):
+        size, other_size = self.sizes[small], self.sizes[large]
+        if shared == size == other_size:
+            relation = "identical"
+        elif shared == size:
+            relation = "subset"
+        else:
+            relation = "overlap"
+        return {
+            "group": small,
+            "other": large,
+            "size": size,
+            "other_size": other_size,
+            "shared": shared,
+            "jaccard": round(jaccard, 4),
+            "relation": relation,
+        }
+
+    def subsets(self, min_size=2, limit=None):
+        """Groups whose members all belong to a larger group, largest first.
+
+        [{"group", "other", "size", "other_size", "shared", "jaccard", "relation": "subset"}];
+        groups smaller than min_size (by default single-member ones, which are
+        listed by single_member()) and identical groups are left out.
+        """
+        self.checked = 0
+        members_of = {}  # member bit -> groups containing it
+        for name, ordered in self._ordered.items():
+            for i in ordered:
+                members_of.setdefault(i, []).append(name)
+        result = []
+        for name, ordered in self._ordered.items():
+            size = self.sizes[name]
+            if size < min_size:
+                continue
+            bits = self.bits[name]
+            for other in members_of[ordered[0]]:  # every superset holds the rarest member
+                if other == name or self.sizes[other] <= size:
+                    continue
+                self.checked += 1
+                if bits & self.bits[other] == bits:
+                    result.append(self._pair(name, other, size, size / self.sizes[other]))
+        result.sort(key=lambda p: (-p["size"], p["other_size"], p["group"], p["other"]))
+        return result[:limit] if limit else result
+
+    def empty(self):
+        return sorted(name for name, size in self.sizes.items() if size == 0)
+
+    def single_member(self):
+        return sorted(name for name, size in self.sizes.items() if size == 1)
@@ -0,0 +1,156 @@
+"""Directory data quality: duplicate accounts, bad emails, dormant invites, users in no group.
+
+DataQualityIndex is filled in the same pass that ingests user pages
+(add_users, from the fetch worker), keeping hash indexes over normalized
+email, display name and email domain and the issues a single record
+shows on its own. Nothing is rescanned afterwards: duplicates are the
+index keys with more than one account, and the "no groups" check is one
+pass over the loaded group members.
+"""
+
+import re
+import threading
+
+from .model import account_id_of, is_invited, org_user_email
+
+DUPLICATE_EMAIL = "duplicate_email"
+DUPLICATE_NAME = "duplicate_name"
+MISSING_EMAIL = "missing_email"
+MALFORMED_EMAIL = "malformed_email"
+INVITED_NEVER_ACTIVE = "invited_never_active"
+NO_GROUPS = "no_groups"
+
+ISSUES = (DUPLICATE_EMAIL, DUPLICATE_NAME, MISSING_EMAIL, MALFORMED_EMAIL, INVITED_NEVER_ACTIVE, NO_GROUPS)
+ISSUE_LABELS = {
+    DUPLICATE_EMAIL: "Duplicate email",
+    DUPLICATE_NAME: "Duplicate display name",
+    MISSING_EMAIL: "Missing email",
+    MALFORMED_EMAIL: "Malformed email",
+    INVITED_NEVER_ACTIVE: "Invited, never active",
+    NO_GROUPS: "In no group",
+}
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def normalize_name(name):
+    return " ".join((name or "").casefold().split())
+
+
+def email_domain(email):
+    """Domain of a normalized, well-formed email ("" otherwise)"""
+    return email.rsplit("@", 1)[1] if _EMAIL.fullmatch(email) else ""
+
+
+def user_fields(u):
+    """(name, email, type, status, last_active) of an Org API or standard API user"""
+    if "account_id" in u:
+        return u.get("name", ""), org_user_email(u), u.get("account_type", ""), u.get("account_status", ""), u.get("last_active") or ""
+    return u.get("displayName", ""), u.get("emailAddress", ""), u.get("accountType", ""), "active" if u.get("active") else "inactive", ""
+
+
+class DataQualityIndex:
+    """Hash indexes and per-user issues, built incrementally as user pages arrive"""
+
+    def __init__(self, users=()):
+        self.users = {}  # accountId -> user
+        self.by_email = {}  # normalized email -> [accountId]
+        self.by_name = {}  # normalized display name -> [accountId]
+        self.by_domain = {}  # email domain -> user count
+        self.flagged = {MISSING_EMAIL: [], MALFORMED_EMAIL: [], INVITED_NEVER_ACTIVE: []}
+        self.version = 0
+        self._lock = threading.Lock()
+        self.add_users(users)
+
+    def add_users(self, users):
+        with self._lock:
+            for u in users:
+                account_id = account_id_of(u)
+                if not account_id or account_id in self.users:
+                    continue
+                self.users[account_id] = u
+                name, email, account_type, status, last_active = user_fields(u)
+                key = normalize_name(name)
+                if key:
+                    self.by_name.setdefault(key, []).append(account_id)
+                email = normalize_email(email)
+                if email:
+                    self.by_email.setdefault(email, []).append(account_id)
+                    domain = email_domain(email)
+                    if domain:
+                        self.by_domain[domain] = self.by_domain.get(domain, 0) + 1
+                    else:
+                        self.flagged[MALFORMED_EMAIL].append(account_id)
+                elif account_type != "app" and not is_invited(status):
+                    # app accounts have no email, and invites show none until accepted
+                    self.flagged[MISSING_EMAIL].append(account_id)
+                if is_invited(status) and not last_active:
+                    self.flagged[INVITED_NEVER_ACTIVE].append(account_id)
+            self.version += 1
+
+    def __len__(self):
+        return len(self.users)
+
+    def duplicates(self, issue):
+        """{normalized email / name: [accountId]} for keys shared by several accounts"""
+        index = self.by_email if issue == DUPLICATE_EMAIL else self.by_name
+        with self._lock:
+            return {key: list(ids) for key, ids in index.items() if len(ids) > 1}
+
+    def without_groups(self, members):
+        """accountIds in no group of `members` ({group name: [user]}, the loaded memberships)"""
+        grouped = {account_id_of(m) for users in members.values() for m in users}
+        with self._lock:
+            return [account_id for account_id in self.users if account_id not in grouped]
+
+    def counts(self, members=None):
+        """{issue: number of accounts}; NO_GROUPS only when `members` is given"""
+        counts = {issue: sum(len(ids) for ids in self.duplicates(issue).values()) for issue in (DUPLICATE_EMAIL, DUPLICATE_NAME)}
+        with self._lock:
+            counts.update((issue, len(ids)) for issue, ids in self.flagged.items())
+        if members is not None:
+            counts[NO_GROUPS] = len(self.without_groups(members))
+        return counts
+
+    def rows(self, issue=None, members=None):
+        """[{"issue", "account_id", "name", "email", "type", "status", "detail"}], duplicates grouped together.
+
+        `issue` limits the rows to one kind; NO_GROUPS rows need `members`.
+        """
+        issues = (issue,) if issue else ISSUES
+        rows = []
+        for kind in issues:
+            if kind in (DUPLICATE_EMAIL, DUPLICATE_NAME):
+                for key, ids in sorted(self.duplicates(kind).items()):
+                    for account_id in ids:
+                        rows.append(self._row(kind, account_id, f"{len(ids)} accounts share '{key}'"))
+            elif kind == NO_GROUPS:
+                if members is not None:
+                    detail = f"none of {len(members)} loaded group(s)"
+                    rows.extend(self._row(kind, account_id, detail) for account_id in self.without_groups(members))
+            else:
+                with self._lock:
+                    ids = list(self.flagged[kind])
+                rows.extend(self._row(kind, account_id, "") for account_id in ids)
+        return rows
+
+    def _row(self, issue, account_id, detail):
+        name, email, account_type, status, _ = user_fields(self.users[account_id])
+        return {
+            "issue": issue,
+            "account_id": account_id,
+            "name": name,
+            "email": email,
+            "type": account_type,
+            "status": status,
+            "detail": detail,
+        }
+
+    def domains(self):
+        """[(email domain, user count)], most users first"""
+        with self._lock:
+            return sorted(self.by_domain.items(), key=lambda kv: (-kv[1], kv[0]))
@@ -0,0 +1,246 @@
+"""Group membership reconciliation: make groups match a desired-state file.
+
+The file says who should be in each group: a CSV with one row per
+membership (a group column and an account_id or email column) or JSON
+({group: [accountId or email]}, or a list of {"group", "members"}).
+Only the groups it names are touched.
+
+Planning is a hash join: file keys are resolved to accountIds through a
+UserIndex, each group's current members become a set, and the adds and
+removes are the two set differences, so a run over thousands of groups
+is linear in the number of memberships. Current members are read and the
+changes applied through bulk.run_concurrent (a few threads behind one
+request-rate limit).
+"""
+
+import csv
+import json
+
+from .bulk import CONCURRENT_RATE, CONCURRENT_WORKERS, DEFAULT_LATENCY, format_duration, perform_action, run_concurrent
+from .client import write_succeeded
+from .model import account_id_of
+
+GROUP_FIELDS = ("group", "group_name", "groupname")
+MEMBER_FIELDS = ("account_id", "accountid", "email", "member", "user")
+
+
+def read_desired(path):
+    """{group name: [accountId or email, "" for a row without one]} from a CSV or JSON desired-state file"""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return {str(group): [str(k or "").strip() for k in keys] for group, keys in data.items()}
+        desired = {}
+        for entry in data:
+            members = entry.get("members")
+            if members is None:
+                members = [entry.get("account_id") or entry.get("email") or ""]
+            keys = desired.setdefault(entry["group"], [])
+            keys.extend(str(k or "").strip() for k in members)
+        return desired
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or ()}
+        group_field = next((fields[n] for n in GROUP_FIELDS if n in fields), None)
+        member_fields = [fields[n] for n in MEMBER_FIELDS if n in fields]
+        if group_field is None or not member_fields:
+            raise ValueError(f"{path}: needs a group column and an account_id or email column")
+        desired = {}
+        for row in reader:
+            group = (row.get(group_field) or "").strip()
+            if not group:
+                continue
+            keys = desired.setdefault(group, [])
+            # A blank member cell is kept as "" (an invalid row in the plan), not dropped:
+            # dropping it would make that member look unwanted and plan their removal
+            keys.append(next(((row.get(n) or "").strip() for n in member_fields if (row.get(n) or "").strip()), ""))
+        return desired
+
+
+class ReconcilePlan:
+    """The adds and removes that make each desired group match the file.
+
+    A group whose listed members are not all known (not found, or a blank
+    row) gets its adds but no removals (`held`): an unresolved key may be
+    a current member the file wants kept.
+
+    `current` is {group name: [standard API member]} (complete member
+    lists); groups of the file missing from it are `unknown_groups` and
+    left alone (`errors` says why, e.g. {group: "404 ..."} from
+    load_members). File keys that resolve to no user are `unknown_users`.
+    With remove=False members missing from the file are kept.
+    """
+
+    def __init__(self, desired, current, index=None, remove=True, errors=None):
+        self.remove = remove
+        self.errors = errors or {}
+        self.adds = []  # (group, account_id)
+        self.removes = []
+        self.unknown_users = []  # (group, key)
+        self.unknown_groups = []
+        self.invalid = []  # groups of file rows with no accountId or email
+        self.held = []  # (group, members kept): removals withheld, the group's listed members are not all known
+        self.unchanged = 0  # memberships already as desired
+        self.groups = 0
+        self.users = {}  # accountId -> {"account_id", "name", "email"} for the report
+
+        resolved = {}  # file key -> accountId (None if unknown), each key resolved once
+        for group, keys in sorted(desired.items()):
+            members = current.get(group)
+            if members is None:
+                self.unknown_groups.append(group)
+                continue
+            self.groups += 1
+            have = set()
+            for m in members:
+                account_id = account_id_of(m)
+                have.add(account_id)
+                self._remember(account_id, m)
+            want = set()
+            complete = True  # every listed member resolved: only then is "not listed" safe to remove
+            for key in keys:
+                if not key:
+                    self.invalid.append(group)
+                    complete = False
+                    continue
+                if key not in resolved:
+                    resolved[key] = self._resolve(key, index)
+                account_id = resolved[key]
+                if account_id is None:
+                    self.unknown_users.append((group, key))
+                    complete = False
+                else:
+                    want.add(account_id)
+            self.adds.extend((group, a) for a in sorted(want - have))
+            if remove and complete:
+                self.removes.extend((group, a) for a in sorted(have - want))
+            elif remove and have - want:
+                self.held.append((group, len(have - want)))
+            self.unchanged += len(want & have)
+
+    def _resolve(self, key, index):
+        u = index.resolve(key) if index is not None else None
+        if u is not None:
+            account_id = account_id_of(u)
+            self._remember(account_id, u)
+            return account_id
+        if "@" in key or (index is not None and len(index)):
+            return None  # an email needs the directory; an accountId must be in it when there is one
+        return key
+
+    def _remember(self, account_id, u):
+        if account_id not in self.users:
+            name = u.get("name") or u.get("displayName") or account_id
+            email = u.get("email") or u.get("emailAddress") or ""
+            self.users[account_id] = {"account_id": account_id, "name": name, "email": email}
+
+    def __len__(self):
+        return len(self.adds) + len(self.removes)
+
+    def operations(self):
+        """[(action, group, user)] for bulk.perform_action, group by group"""
+        ops = [("add_group", g, a) for g, a in self.adds] + [("remove_group", g, a) for g, a in self.removes]
+        ops.sort(key=lambda op: (op[1], op[0]))
+        return [(action, group, self.users.get(a) or {"account_id": a, "name": a, "email": ""}) for action, group, a in ops]
+
+    def rows(self):
+        """Report rows {"group", "action", "account_id", "name", "email", "result", "error"} (result empty until applied)"""
+        rows = [
+            {"group": group, "action": action, "account_id": u["account_id"], "name": u["name"], "email": u["email"], "result": "", "error": ""}
+            for action, group, u in self.operations()
+        ]
+        rows.extend(
+            {"group": group, "action": "unknown_user", "account_id": "", "name": key, "email": "", "result": "skipped", "error": "not found"}
+            for group, key in self.unknown_users
+        )
+        rows.extend(
+            {"group": group, "action": "invalid_row", "account_id": "", "name": "", "email": "", "result": "skipped",
+             "error": "no account_id or email"}
+            for group in self.invalid
+        )
+        rows.extend(
+            {"group": group, "action": "removals_held", "account_id": "", "name": "", "email": "", "result": "skipped",
+             "error": f"{kept} member(s) not in the file kept: some listed members were not found"}
+            for group, kept in self.held
+        )
+        rows.extend(
+            {"group": group, "action": "unknown_group", "account_id": "", "name": "", "email": "", "result": "skipped",
+             "error": self.errors.get(group, "group not found")}
+            for group in self.unknown_groups
+        )
+        return rows
+
+    def estimate_seconds(self, latency=None, workers=CONCURRENT_WORKERS, rate=CONCURRENT_RATE):
+        """Whichever is slower: the rate limit or the requests spread over the workers"""
+        per_request = DEFAULT_LATENCY if latency is None else latency
+        return max(len(self) / rate if rate else 0.0, len(self) * per_request / max(1, workers))
+
+    def summary_text(self, latency=None, workers=CONCURRENT_WORKERS, rate=CONCURRENT_RATE):
+        lines = [
+            f"{self.groups} group(s): {len(self.adds)} to add, {len(self.removes)} to remove, "
+            f"{self.unchanged} already as listed" + ("" if self.remove else " (removals off)")
+        ]
+        if self.unknown_users:
+            lines.append(f"{len(self.unknown_users)} listed member(s) not found")
+        if self.invalid:
+            lines.append(f"{len(self.invalid)} row(s) without an account_id or email")
+        if self.held:
+            lines.append(f"No removals in {len(self.held)} group(s) with members not found or blank rows "
+                         f"({sum(kept for _, kept in self.held)} member(s) kept): " + ", ".join(g for g, _ in self.held[:5]) +
+                         (" ..." if len(self.held) > 5 else ""))
+        if self.unknown_groups:
+            lines.append(f"{len(self.unknown_groups)} group(s) not found or not readable: " + ", ".join(self.unknown_groups[:5]) +
+                         (" ..." if len(self.unknown_groups) > 5 else ""))
+        if len(self):
+            lines.append(
+                f"Estimated time: {format_duration(self.estimate_seconds(latency, workers, rate))} "
+                f"({workers} parallel, up to {rate:g} requests/s)"
+            )
+        return "\n".join(lines)
+
+
+def load_members(make_client, groups, workers=CONCURRENT_WORKERS, rate=CONCURRENT_RATE, job=None, progress=None):
+    """({group: [member]}, {group: error}) - every member of each group, read concurrently"""
+    results = run_concurrent(make_client, list(groups), lambda client, name: client.all_group_members(name, job), workers, rate, job, progress)
+    members, errors = {}, {}
+    for entry in results:
+        if entry is None:
+            continue
+        name, value, error = entry
+        if error is None:
+            members[name] = value
+        else:
+            errors[name] = str(error)
+    return members, errors
+
+
+def apply_plan(make_client, plan, workers=CONCURRENT_WORKERS, rate=CONCURRENT_RATE, job=None, progress=None):
+    """Send the plan's adds and removes; returns its rows() with result "done", "failed" or "cancelled" filled in"""
+    ops = plan.operations()
+
+    def send(client, op):
+        action, group, user = op
+        response = perform_action(client, user, action, group, job)
+        if not write_succeeded(response, action):
+            raise RuntimeError(f"{response.status_code} - {response.text}")
+
+    results = run_concurrent(make_client, ops, send, workers, rate, job, progress)
+    rows = plan.rows()
+    for row, entry in zip(rows, results):  # the first len(ops) rows are the operations, in order
+        if entry is None:
+            row["result"] = "cancelled"
+        elif entry[2] is None:
+            row["result"] = "done"
+        else:
+            row["result"], row["error"] = "failed", str(entry[2])
+    return rows
+
+
+def result_counts(rows):
+    """{result: rows} over apply_plan() rows"""
+    counts = {}
+    for row in rows:
+        counts[row["result"]] = counts.get(row["result"], 0) + 1
+    return counts
@@ -0,0 +1,211 @@
+"""Reports over a fetched directory.
+
+ActivityReport is the stale-account / license-reclamation engine: it turns
+every account-wide and per-product last_active into whole days of
+inactivity once, stored as flat integer arrays, and answers "how many /
+which users have been inactive for N+ days" from those arrays.
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timezone
+
+from .model import org_user_email
+
+THRESHOLDS = (30, 60, 90, 180)
+ANY_PRODUCT = ""  # report key for the account-wide last_active
+NEVER = 1 << 30  # days_inactive stored for users who were never active
+
+DEFAULT_STATUSES = ("active",)  # accounts a reclamation plan targets by default
+
+
+def _today(as_of):
+    if as_of is None:
+        return datetime.now(timezone.utc).date()
+    if isinstance(as_of, datetime):
+        if as_of.tzinfo is not None:
+            as_of = as_of.astimezone(timezone.utc)
+        return as_of.date()
+    return as_of
+
+
+def _utc_date(value):
+    """"2026-01-01T08:00:00+10:00" -> "2025-12-31"; `value` unchanged if it does not parse"""
+    try:
+        return datetime.fromisoformat(value).astimezone(timezone.utc).date().isoformat()
+    except ValueError:
+        return value
+
+
+class _DayParser:
+    """ISO timestamp -> days before `today` (NEVER if empty or unparseable).
+
+    Only the UTC date is used, and it is parsed once per distinct date:
+    a tenant has a few hundred distinct days, not one per user. A
+    timestamp with a non-UTC offset is converted to UTC first.
+    """
+
+    def __init__(self, today):
+        self.today = today.toordinal()
+        self.cache = {"": NEVER}
+
+    def __call__(self, value):
+        value = value or ""
+        offset = value[19:].lstrip(".0123456789")  # after "YYYY-MM-DDTHH:MM:SS" and any fraction
+        if offset not in ("", "Z", "+00:00", "-00:00"):
+            value = _utc_date(value)
+        key = value[:10]
+        days = self.cache.get(key)
+        if days is None:
+            try:
+                days = max(0, self.today - date.fromisoformat(key).toordinal())
+            except ValueError:
+                days = NEVER
+            self.cache[key] = days
+        return days
+
+
+class _Column:
+    """Users with access to one product and their days of inactivity"""
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.rows = array("l")  # index into ActivityReport.users
+        self.days = array("l")  # parallel to rows
+        self._sorted = None
+
+    def sorted_days(self):
+        if self._sorted is None:
+            self._sorted = array("l", sorted(self.days))
+        return self._sorted
+
+    def count_at_least(self, days):
+        ordered = self.sorted_days()
+        return len(ordered) - bisect_left(ordered, days)
+
+
+class ActivityReport:
+    """Days since last activity for every Org API user, account-wide and per product.
+
+    Days are whole calendar days between the UTC date of last_active and
+    `as_of` (default: today). A user with several entries for the same
+    product key (e.g. two sites) counts their most recent one.
+    """
+
+    def __init__(self, users, as_of=None):
+        self.users = list(users)
+        self.as_of = _today(as_of)
+        parse = _DayParser(self.as_of)
+
+        overall = _Column(ANY_PRODUCT, "Any product")
+        overall.rows = array("l", range(len(self.users)))
+        overall.days = array("l", [parse(u.get("last_active")) for u in self.users])
+        self.columns = {ANY_PRODUCT: overall}
+
+        for row, u in enumerate(self.users):
+            seen = {}
+            for p in u.get("product_access") or ():
+                key = p.get("key") or p.get("name") or "unknown"
+                days = parse(p.get("last_active"))
+                if key in seen:
+                    column, pos = seen[key]
+                    column.days[pos] = min(column.days[pos], days)
+                    continue
+                column = self.columns.get(key)
+                if column is None:
+                    column = self.columns[key] = _Column(key, p.get("name") or key)
+                seen[key] = (column, len(column.rows))
+                column.rows.append(row)
+                column.days.append(days)
+
+    def product_key(self, product):
+        """Report key for a product key or name (None if unknown); None/"" -> any product"""
+        if not product:
+            return ANY_PRODUCT
+        if product in self.columns:
+            return product
+        wanted = product.lower()
+        for key, column in self.columns.items():
+            if column.name.lower() == wanted or key.lower() == wanted:
+                return key
+        return None
+
+    def summary(self, thresholds=THRESHOLDS):
+        """One row per product (any product first): users with access, never active, and N+ days inactive counts"""
+        rows = []
+        for key, column in sorted(self.columns.items(), key=lambda kv: (kv[0] != ANY_PRODUCT, kv[1].name)):
+            rows.append({
+                "product": key,
+                "name": column.name,
+                "users": len(column.rows),
+                "never": column.count_at_least(NEVER),
+                "inactive": {days: column.count_at_least(days) for days in thresholds},
+            })
+        return rows
+
+    def stale(self, days, product=None, statuses=None):
+        """Users with no activity in `product` (default: any) for `days`+ days, never-active first.
+
+        Returns [{"account_id", "name", "email", "status", "product", "last_active", "days_inactive"}]
+        (days_inactive is None for never-active users). `statuses` limits the
+        account_status values included (e.g. ("active",) for a deactivation plan).
+        """
+        key = self.product_key(product)
+        if key is None:
+            return []
+        column = self.columns[key]
+        wanted = {s.lower() for s in statuses} if statuses else None
+        hits = sorted(
+            ((d, r) for r, d in zip(column.rows, column.days) if d >= days),
+            key=lambda hit: hit[0],
+            reverse=True,
+        )
+        result = []
+        for d, r in hits:
+            u = self.users[r]
+            status = u.get("account_status", "")
+            if wanted is not None and status.lower() not in wanted:
+                continue
+            result.append({
+                "account_id": u.get("account_id", ""),
+                "name": u.get("name", ""),
+                "email": org_user_email(u),
+                "status": status,
+                "product": column.name if key != ANY_PRODUCT else "",
+                "last_active": self._last_active(u, key),
+                "days_inactive": None if d >= NEVER else d,
+            })
+        return result
+
+    def plan(self, days, product=None, statuses=DEFAULT_STATUSES):
+        """Users for a bulk deactivate / remove-from-group run"""
+        return plan_users(self.stale(days, product, statuses))
+
+    @staticmethod
+    def _last_active(u, key):
+        if key == ANY_PRODUCT:
+            return u.get("last_active", "") or ""
+        values = [
+            p.get("last_active") or "" for p in u.get("product_access") or ()
+            if (p.get("key") or p.get("name") or "unknown") == key
+        ]
+        return max(values, default="")
+
+
+def plan_users(rows):
+    """stale() rows -> the user dicts run_bulk_action takes ({"account_id", "name", "email", "status"})"""
+    return [
+        {"account_id": r["account_id"], "name": r["name"] or r["account_id"], "email": r["email"], "status": r["status"]}
+        for r in rows
+    ]
+
+
+def stale_users(users, days, product=None, as_of=None, statuses=None):
+    """Org API users with no activity in the last `days` days (never-active included).
+
+    With `product` (a product key or name), activity in that product is
+    used instead of the account-wide last_active, and only users with
+    access to it are considered. See ActivityReport.stale for the rows.
+    """
+    return ActivityReport(users, as_of).stale(days, product, statuses)
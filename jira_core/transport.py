@@ -0,0 +1,75 @@
+"""Instrumented requests session: every outbound call records its latency,
+status, size, retries and Retry-After waits in a RequestMetrics."""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .instrumentation import _request_context, classify_endpoint
+
+
+class InstrumentedRetry(Retry):
+    """Retry that reports each retry and its backoff / Retry-After sleep"""
+
+    def sleep(self, response=None):
+        start = time.perf_counter()
+        super().sleep(response)
+        metrics = getattr(_request_context, "metrics", None)
+        if metrics is not None:
+            rate_limited = response is not None and (
+                response.status == 429 or bool(response.headers.get("Retry-After"))
+            )
+            waited = time.perf_counter() - start
+            _request_context.waited += waited
+            metrics.record_retry(_request_context.endpoint, waited, rate_limited)
+
+
+class InstrumentedSession(requests.Session):
+    """requests.Session that records latency, status and size of every call"""
+
+    def __init__(self, metrics):
+        super().__init__()
+        self.metrics = metrics
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = classify_endpoint(method, url)
+        _request_context.metrics = self.metrics
+        _request_context.endpoint = endpoint
+        _request_context.waited = 0.0
+        start = time.perf_counter()
+        response = None
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            return response
+        finally:
+            # Retry sleeps are already reported as waits; latency is time on the wire
+            elapsed = time.perf_counter() - start - _request_context.waited
+            _request_context.metrics = None
+            if response is not None:
+                body = response.request.body if response.request is not None else None
+                self.metrics.record_request(
+                    endpoint,
+                    elapsed,
+                    status=response.status_code,
+                    bytes_in=len(response.content or b""),
+                    bytes_out=len(body) if body else 0,
+                )
+            else:
+                self.metrics.record_request(endpoint, elapsed)
+
+
+# Configure requests session with retry logic
+def create_session(metrics=None):
+    session = InstrumentedSession(metrics) if metrics is not None else requests.Session()
+    retry = InstrumentedRetry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"]
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
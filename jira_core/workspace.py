@@ -0,0 +1,356 @@
+"""Workspace: several sites / organizations crawled in parallel into one merged view.
+
+A profile is one site (and optionally its organization) with its own
+credentials. crawl_workspace() crawls every profile at once, one thread
+and client each. Clients that talk to the same host share one request
+budget (HostBudgets), so two profiles of one site, or the Org API crawls
+of several organizations (all on api.atlassian.com), stay within one
+host's rate limit while different sites run at full speed side by side.
+
+The finished crawls go into a MergedDirectory tagged by profile name.
+Atlassian accounts are the same on every site, so users are joined on
+accountId: one row per person with the sites they are on. Groups stay
+per site; product access is joined on product and URL.
+
+Profiles (without secrets) are kept in ~/.jira_user_app/workspace.json;
+API tokens and Org API keys go to the system keyring.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .bulk import RateLimiter
+from .checkpoint import (
+    GROUPS, MEMBERS, USERS_ORG, USERS_STANDARD, CrawlCheckpoint, checkpointed_pages, crawl_members, default_crawl_dir,
+)
+from .joined import SiteUsersCrawl, join_site_users, join_summary
+from .model import Directory, account_id_of, analyze_products, most_recent_activity
+from .quality import user_fields
+
+logger = logging.getLogger(__name__)
+
+HOST_RATE = 5.0  # requests per second per host, across all profiles
+WORKERS = 4  # profiles crawled at the same time
+SECRET_FIELDS = ("api_token", "org_api_key")
+
+
+def workspace_path():
+    return os.path.join(os.path.expanduser("~"), ".jira_user_app", "workspace.json")
+
+
+class Profile:
+    """One site / org and its credentials"""
+
+    def __init__(self, name, jira_url="", email="", org_id="", org_mode=False, api_token="", org_api_key=""):
+        self.name = name
+        self.jira_url = (jira_url or "").strip().rstrip("/")
+        self.email = (email or "").strip()
+        self.org_id = (org_id or "").strip()
+        self.org_mode = bool(org_mode)
+        self.api_token = api_token or ""
+        self.org_api_key = org_api_key or ""
+
+    def credentials(self):
+        """JiraClient keyword arguments"""
+        return {
+            "jira_url": self.jira_url,
+            "email": self.email,
+            "api_token": self.api_token,
+            "org_id": self.org_id,
+            "org_api_key": self.org_api_key if self.org_mode else "",
+        }
+
+    def to_dict(self):
+        """Everything but the secrets"""
+        return {"name": self.name, "jira_url": self.jira_url, "email": self.email, "org_id": self.org_id, "org_mode": self.org_mode}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: data.get(k, "") for k in ("name", "jira_url", "email", "org_id", "org_mode", *SECRET_FIELDS)})
+
+
+def load_profiles(path=None):
+    """[Profile] from the workspace file (secrets not filled in; see load_secrets)"""
+    try:
+        with open(path or workspace_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    return [Profile.from_dict(p) for p in data.get("profiles", [])]
+
+
+def save_profiles(profiles, path=None):
+    path = path or workspace_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"profiles": [p.to_dict() for p in profiles]}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _secret_key(profile, field):
+    return f"profile:{profile.name}:{field}"
+
+
+def load_secrets(profiles, service):
+    """Fill in the profiles' API tokens / Org API keys from the keyring (missing ones stay empty)"""
+    try:
+        import keyring
+        for p in profiles:
+            for field in SECRET_FIELDS:
+                if not getattr(p, field):
+                    setattr(p, field, keyring.get_password(service, _secret_key(p, field)) or "")
+    except Exception as e:
+        logger.warning("Could not read profile secrets: %s", e)
+
+
+def save_secrets(profile, service):
+    import keyring
+    for field in SECRET_FIELDS:
+        if getattr(profile, field):
+            keyring.set_password(service, _secret_key(profile, field), getattr(profile, field))
+
+
+def fill_session_secrets(profiles, jira_url, email, org_id="", api_token="", org_api_key=""):
+    """Give the credentials entered for this session to the profile(s) they were entered for.
+
+    Only profiles of the same site and email get the API token, and the Org
+    API key also needs the same organization (or none recorded yet); other
+    profiles keep their own secrets. Returns the names of the profiles left
+    without an API token.
+    """
+    site = (jira_url or "").strip().rstrip("/").lower()
+    email = (email or "").strip().lower()
+    for p in profiles:
+        if p.jira_url.lower() != site or p.email.lower() != email:
+            continue
+        p.api_token = p.api_token or api_token or ""
+        if not p.org_id or p.org_id == (org_id or "").strip():
+            p.org_api_key = p.org_api_key or org_api_key or ""
+    return [p.name for p in profiles if not p.api_token]
+
+
+def delete_secrets(profile, service):
+    import keyring
+    for field in SECRET_FIELDS:
+        try:
+            keyring.delete_password(service, _secret_key(profile, field))
+        except Exception:
+            pass
+
+
+class HostBudgets:
+    """One RateLimiter per host; used as JiraClient.limiter"""
+
+    def __init__(self, rate=HOST_RATE):
+        self.rate = rate
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.rate)
+            return limiter
+
+
+def crawl_directory(client, org_mode, groups=False, members=False, resume=True, job=None, log=None, root=None,
+                    join_site=False):
+    """Crawl one site into a Directory, checkpointed (see jira_core.checkpoint).
+
+    An interrupted crawl of the same site (checkpoints under `root`,
+    default_crawl_dir() by default) is resumed unless resume=False.
+    log(message) gets a line per finished stage. With org_mode and
+    join_site the site's own users are crawled alongside the Org API and
+    joined in (see jira_core.joined).
+    """
+    log = log or (lambda message: logger.info("%s", message))
+    if org_mode and not client.org_id and client.org_api_key:
+        client.org_id, org_name = client.fetch_org()
+        log(f"Using organization {org_name} ({client.org_id})")
+    root = root or default_crawl_dir(client.jira_url)
+    directory = Directory(org_mode=org_mode, site=client.jira_url)
+    site = None
+    if org_mode:
+        checkpoint = CrawlCheckpoint(root, USERS_ORG, client.org_id)
+        fetch = lambda cursor: client.users_org_pages(job, cursor)
+        if join_site:
+            site = SiteUsersCrawl(client.copy(), job, CrawlCheckpoint(root, USERS_STANDARD), resume)
+    else:
+        checkpoint = CrawlCheckpoint(root, USERS_STANDARD)
+        fetch = lambda start: client.users_standard_pages(job, start)
+    try:
+        for batch in checkpointed_pages(checkpoint, fetch, resume):
+            directory.users.extend(batch)
+    except BaseException:
+        if site is not None:
+            site.stop()
+        raise
+    if site is not None:
+        directory.users = join_site_users(directory.users, site.result())
+        log(f"{len(directory.users)} users fetched ({join_summary(directory.users)})")
+    else:
+        log(f"{len(directory.users)} users fetched")
+    if groups or members:
+        checkpoint = CrawlCheckpoint(root, GROUPS)
+        for batch in checkpointed_pages(checkpoint, lambda start: client.groups_pages(job, start), resume):
+            directory.groups.extend(batch)
+        log(f"{len(directory.groups)} groups fetched")
+    if members:
+        def progress(done, total):
+            if done % 50 == 0:
+                log(f"Members loaded for {done}/{total} groups")
+
+        names = [g["name"] for g in directory.groups]
+        directory.members = crawl_members(CrawlCheckpoint(root, MEMBERS), client, names, job, resume, progress)
+    return directory
+
+
+def crawl_workspace(profiles, make_client, groups=True, members=False, rate=HOST_RATE, workers=WORKERS,
+                    resume=True, job=None, progress=None):
+    """Crawl every profile in parallel; returns a MergedDirectory.
+
+    make_client(profile) gives a new JiraClient (closed here). A profile
+    whose crawl fails is left out and its error kept in `errors`.
+    progress(profile name, message) reports each stage, from the threads.
+    """
+    budgets = HostBudgets(rate)
+    merged = MergedDirectory()
+
+    def crawl(profile):
+        client = make_client(profile)
+        client.limiter = budgets
+        log = (lambda message: progress(profile.name, message)) if progress is not None else (lambda message: None)
+        # Checkpoints per profile: two profiles of one site must not share them
+        root = os.path.join(default_crawl_dir(profile.jira_url), "profiles", "".join(c if c.isalnum() or c in ".-" else "_" for c in profile.name))
+        try:
+            merged.add(profile.name, crawl_directory(client, profile.org_mode, groups, members, resume, job, log, root))
+            log("done")
+        except Exception as e:
+            merged.fail(profile.name, e)
+            log(f"failed: {e}")
+            if job is not None and job.cancelled:
+                raise
+        finally:
+            client.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(profiles)))) as pool:
+        list(pool.map(crawl, profiles))
+    return merged
+
+
+class MergedDirectory:
+    """Directories of several sites, tagged by profile name"""
+
+    def __init__(self):
+        self.sources = {}  # profile name -> Directory
+        self.errors = {}  # profile name -> error of a failed crawl
+        self._lock = threading.Lock()
+
+    def add(self, name, directory):
+        with self._lock:
+            self.sources[name] = directory
+
+    def fail(self, name, error):
+        with self._lock:
+            self.errors[name] = str(error)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def users(self):
+        """[{"account_id", "name", "email", "type", "sites", "status", "last_active", "products"}], one per account.
+
+        "sites" lists the profiles the account was found on, "status" each
+        site's status where they differ, "products" the products granted
+        on any of them (Org API profiles only).
+        """
+        merged = {}
+        for source, directory in sorted(self.sources.items()):
+            for u in directory.users:
+                account_id = account_id_of(u)
+                if not account_id:
+                    continue
+                name, email, account_type, status, last_active = user_fields(u)
+                row = merged.get(account_id)
+                if row is None:
+                    row = merged[account_id] = {
+                        "account_id": account_id, "name": name, "email": email, "type": account_type,
+                        "sites": [], "statuses": {}, "last_active": "", "products": set(),
+                    }
+                row["name"] = row["name"] or name
+                row["email"] = row["email"] or email
+                row["sites"].append(source)
+                row["statuses"][source] = status
+                row["last_active"] = max(row["last_active"], last_active or "")
+                row["products"].update(p.get("name") or p.get("key") or "" for p in u.get("product_access") or ())
+        rows = []
+        for row in merged.values():
+            statuses = row["statuses"]
+            distinct = set(statuses.values())
+            rows.append({
+                "account_id": row["account_id"],
+                "name": row["name"],
+                "email": row["email"],
+                "type": row["type"],
+                "sites": ", ".join(row["sites"]),
+                "status": distinct.pop() if len(distinct) == 1 else ", ".join(f"{s}: {v}" for s, v in statuses.items()),
+                "last_active": row["last_active"],
+                "products": ", ".join(sorted(row["products"] - {""})),
+            })
+        rows.sort(key=lambda r: (r["name"].lower(), r["account_id"]))
+        return rows
+
+    def groups(self):
+        """[{"site", "name", "group_id", "members"}] ("members" is empty when they were not loaded)"""
+        rows = []
+        for source, directory in sorted(self.sources.items()):
+            for g in directory.groups:
+                members = directory.members.get(g.get("name"))
+                rows.append({
+                    "site": source,
+                    "name": g.get("name", ""),
+                    "group_id": g.get("groupId", ""),
+                    "members": len(members) if members is not None else "",
+                })
+        rows.sort(key=lambda r: (r["name"].lower(), r["site"]))
+        return rows
+
+    def products(self):
+        """[{"name", "key", "url", "sites", "users", "most_recent"}], one per product and URL across the Org API profiles.
+
+        Two profiles of one organization see the same grants; users are
+        counted once per product.
+        """
+        merged = {}
+        for source, directory in sorted(self.sources.items()):
+            if not directory.org_mode:
+                continue
+            for pid, p in analyze_products(directory.users).items():
+                row = merged.get(pid)
+                if row is None:
+                    row = merged[pid] = {"name": p["name"], "key": p["key"], "url": p["url"], "sites": [], "ids": set(), "most_recent": "Never"}
+                row["sites"].append(source)
+                row["ids"].update(u["id"] for u in p["users"])
+                recent = most_recent_activity(p)
+                if recent != "Never" and (row["most_recent"] == "Never" or recent > row["most_recent"]):
+                    row["most_recent"] = recent
+        rows = [
+            {"name": r["name"], "key": r["key"], "url": r["url"], "sites": ", ".join(r["sites"]), "users": len(r["ids"]), "most_recent": r["most_recent"]}
+            for r in merged.values()
+        ]
+        rows.sort(key=lambda r: (r["name"].lower(), r["url"]))
+        return rows
+
+    def summary_text(self):
+        sites = ", ".join(f"{name}: {len(d.users)} users, {len(d.groups)} groups" for name, d in sorted(self.sources.items()))
+        text = f"{len(self.sources)} site(s) - {sites}" if self.sources else "No sites loaded"
+        if self.errors:
+            text += "\nFailed: " + ", ".join(f"{name} ({error})" for name, error in sorted(self.errors.items()))
+        return text
@@ -1,38 +1,517 @@
+import time
+STARTUP_T0 = time.perf_counter()  # the startup report measures from here
+
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox
-from tkcalendar import DateEntry  # pip install tkcalendar
-import requests
-from requests.auth import HTTPBasicAuth
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from datetime import datetime
-import csv
+import hashlib
+import logging
+import os
 import threading
-import keyring
-from dateutil import parser  # pip install python-dateutil
 import webbrowser
-import json
-import time
-from functools import partial
+import sys
+from collections import deque
+from contextlib import contextmanager
+from functools import partial, wraps
+from urllib.parse import urlsplit
+
+# Only light modules are imported up front. requests (via jira_core.client
+# and jira_core.bulk), dateutil, keyring and tkcalendar are imported where
+# they are first needed, or warmed up in the background after first paint.
+from jira_core.checkpoint import (
+    GROUPS, KIND_LABELS as CRAWL_LABELS, MEMBERS, USERS_ORG, USERS_STANDARD, CrawlCheckpoint, checkpointed_pages,
+    crawl_members, default_crawl_dir,
+)
+from jira_core.diff import KIND_LABELS, KINDS, SnapshotDiff, diff_directories
+from jira_core.exporters import (
+    timestamped_filename, write_changes_csv, write_group_summary_csv, write_groups_csv, write_json,
+    write_overlap_csv, write_products_csv, write_quality_csv, write_reconcile_csv, write_stale_csv, write_users_csv,
+)
+from jira_core.history import HistoryStore, default_history_dir, directory_state
+from jira_core.indexes import GroupIndex, ProductIndex, UserIndex
+from jira_core.instrumentation import RequestMetrics, percentile
+from jira_core.jobs import LANE_BACKGROUND, LANE_INTERACTIVE, JobCancelled, JobScheduler
+from jira_core.logs import LEVELS, current_level, default_log_file, set_level, setup_logging
+from jira_core.model import (
+    Directory, Selection, UserFilter, account_id_of, filter_groups, filter_users, format_timestamp,
+    org_user_values, parse_date_range, standard_user_values, status_tag,
+)
+from jira_core.overlap import DEFAULT_THRESHOLD, GroupOverlap
+from jira_core.quality import ISSUE_LABELS, ISSUES, DataQualityIndex
+from jira_core.reports import THRESHOLDS, ActivityReport, plan_users
+
+IMPORTS_DONE = time.perf_counter()
+
+logger = logging.getLogger("jira_user_app")
 
 SERVICE_NAME = "jira_user_app"
 
-# Configure requests session with retry logic
-def create_session():
-    session = requests.Session()
-    retry = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+# Users shown per step when a product is expanded in the Products tab
+PRODUCT_PAGE_SIZE = 500
+USER_COLUMNS = ("name", "email", "id", "type", "status", "last_active")  # Users view columns after "select"
+REPORT_ROWS_SHOWN = 5000  # rows shown in the report dialogs (the exports have all of them)
+
+# Imported after first paint so the first click does not pay for them
+WARM_UP_MODULES = ("jira_core.client", "jira_core.bulk", "dateutil.parser", "keyring", "tkcalendar")
+
+# ---------------- Startup Timing ---------------- #
+class StartupTimer:
+    """Milestones (ms since STARTUP_T0) for the startup report"""
+
+    def __init__(self, t0=STARTUP_T0):
+        self.t0 = t0
+        self.marks = []  # (name, ms since t0, ms the step itself took)
+        self._lock = threading.Lock()
+
+    def mark(self, name, since=None, at=None):
+        """Record a milestone; `since` is the perf_counter() the step started at"""
+        now = at if at is not None else time.perf_counter()
+        with self._lock:
+            self.marks.append((name, (now - self.t0) * 1000, (now - since) * 1000 if since is not None else None))
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, since=start)
+
+    def elapsed_ms(self, name):
+        with self._lock:
+            return next((at for n, at, _ in self.marks if n == name), None)
+
+    def report(self):
+        with self._lock:
+            marks = list(self.marks)
+        lines = ["=== Startup ==="]
+        for name, at, took in marks:
+            detail = f"  ({took:.0f} ms)" if took is not None else ""
+            lines.append(f"{at:8.0f} ms  {name}{detail}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "milestones": [
+                    {"name": name, "at_ms": round(at, 1), "took_ms": round(took, 1) if took is not None else None}
+                    for name, at, took in self.marks
+                ]
+            }
+
+
+# ---------------- UI Watchdog ---------------- #
+class LatencyStats:
+    """Rolling samples (ms) for one measured quantity"""
+
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+        self.samples = deque(maxlen=500)
+
+    def add(self, ms):
+        self.count += 1
+        self.last = ms
+        self.max = max(self.max, ms)
+        self.total += ms
+        self.samples.append(ms)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "last_ms": round(self.last, 1),
+            "avg_ms": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(percentile(self.samples, 50), 1),
+            "p95_ms": round(percentile(self.samples, 95), 1),
+            "max_ms": round(self.max, 1),
+        }
+
+
+class UIWatchdog:
+    """Measures Tk event-loop responsiveness.
+
+    A heartbeat scheduled with root.after measures how late the loop runs it
+    (event-loop latency). A sampler thread notices when the heartbeat stops
+    for longer than `threshold_ms`, samples the main thread's stack to name
+    the handler that is blocking, and the stall is recorded with its
+    duration once the loop recovers.
+
+    On top of that, handlers decorated with @ui_handler report their own
+    duration, and user-facing latencies (time-to-first-row, filter-to-render,
+    sort, expand) are measured with start_latency()/finish_latency().
+    """
+
+    # Frames that only dispatch work and never name the real handler
+    _DISPATCH_FRAMES = {"_drain", "wrapper", "_run", "<lambda>", "mainloop", "__call__"}
+
+    def __init__(self, root, threshold_ms=100, interval_ms=50):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stall_handler = None  # handler sampled during the current stall
+        self._pending_latencies = {}  # name -> start time
+        self._running = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.loop_latency = LatencyStats()
+            self.stalls = deque(maxlen=200)
+            self.handlers = {}  # handler name -> LatencyStats
+            self.latencies = {}  # user-facing latency name -> LatencyStats
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._last_beat = time.perf_counter()
+        self.root.after(self.interval_ms, self._heartbeat, self._last_beat + self.interval_ms / 1000.0)
+        threading.Thread(target=self._sampler, name="ui-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+
+    # -- heartbeat / stall detection -- #
+    def _heartbeat(self, expected):
+        now = time.perf_counter()
+        gap_ms = (now - self._last_beat) * 1000.0
+        with self._lock:
+            self.loop_latency.add(max(0.0, (now - expected) * 1000.0))
+            if gap_ms > self.threshold_ms + self.interval_ms:
+                self.stalls.append({
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "handler": self._stall_handler or "(unknown)",
+                    "duration_ms": round(gap_ms - self.interval_ms, 1),
+                })
+            self._stall_handler = None
+        self._last_beat = now
+        if self._running:
+            self.root.after(self.interval_ms, self._heartbeat, now + self.interval_ms / 1000.0)
+
+    def _sampler(self):
+        poll = self.interval_ms / 2000.0
+        while self._running:
+            time.sleep(poll)
+            stalled_ms = (time.perf_counter() - self._last_beat) * 1000.0
+            if stalled_ms > self.threshold_ms + self.interval_ms and self._stall_handler is None:
+                self._stall_handler = self._sample_main_thread()
+
+    def _sample_main_thread(self):
+        """Name the outermost app function currently running on the Tk thread"""
+        frame = sys._current_frames().get(self._main_ident)
+        name = None
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename == __file__ and code.co_name not in self._DISPATCH_FRAMES:
+                name = code.co_name
+            frame = frame.f_back
+        return name
+
+    # -- explicit measurements -- #
+    def record_handler(self, name, ms):
+        with self._lock:
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = LatencyStats()
+            stats.add(ms)
+
+    @contextmanager
+    def handler(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_handler(name, (time.perf_counter() - start) * 1000.0)
+
+    def start_latency(self, name):
+        """Start (or restart) a user-facing latency measurement"""
+        self._pending_latencies[name] = time.perf_counter()
+
+    def finish_latency(self, name):
+        """Finish `name` once Tk has redrawn (the next idle point after this call)"""
+        start = self._pending_latencies.pop(name, None)
+        if start is None:
+            return
+
+        def record():
+            with self._lock:
+                stats = self.latencies.get(name)
+                if stats is None:
+                    stats = self.latencies[name] = LatencyStats()
+                stats.add((time.perf_counter() - start) * 1000.0)
+
+        self.root.after_idle(record)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "loop_latency": self.loop_latency.to_dict(),
+                "stalls": list(self.stalls),
+                "handlers": {k: v.to_dict() for k, v in sorted(self.handlers.items())},
+                "latencies": {k: v.to_dict() for k, v in sorted(self.latencies.items())},
+            }
+
+
+def ui_handler(fn=None, latency=None):
+    """Record the duration of a Tk-thread handler in the app's UIWatchdog.
+
+    With latency="name", the time from the call until Tk has redrawn is also
+    recorded as a user-facing latency.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if latency:
+                self.watchdog.start_latency(latency)
+            try:
+                with self.watchdog.handler(fn.__name__):
+                    return fn(self, *args, **kwargs)
+            finally:
+                if latency:
+                    self.watchdog.finish_latency(latency)
+        return wrapper
+    return decorate(fn) if fn is not None else decorate
+
+
+# ---------------- UI Update Queue ---------------- #
+class UIUpdateQueue:
+    """Thread-safe queue of UI work that the Tk main loop drains at a fixed frame rate.
+
+    Worker threads never touch Tk directly. They can:
+    - post(fn, *args): run a callback on the UI thread, in order
+    - configure(widget, **options): update a widget; repeated updates to the
+      same widget within a frame are merged so only the latest options apply
+    - append_rows(key, rows, flush): queue rows that are handed to flush() in
+      bounded chunks, so a long crawl inserts a steady trickle of rows per
+      frame instead of one callback per row or one huge insert at the end
+    Entries are applied in the order they were queued; a posted callback
+    never runs before rows queued ahead of it have been flushed.
+    """
+
+    def __init__(self, root, interval_ms=40, max_rows_per_frame=500):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_rows_per_frame = max_rows_per_frame
+        self._lock = threading.Lock()
+        self._pending = deque()  # ["call", fn, args] / ["rows", key, flush, deque(rows)]
+        self._configs = {}  # widget -> merged options awaiting the next frame
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        self._running = False
+
+    def post(self, fn, *args):
+        with self._lock:
+            self._pending.append(["call", fn, args])
+
+    def configure(self, widget, **options):
+        with self._lock:
+            merged = self._configs.get(widget)
+            if merged is None:
+                self._configs[widget] = dict(options)
+                self._pending.append(["call", self._apply_config, (widget,)])
+            else:
+                merged.update(options)
+
+    def append_rows(self, key, rows, flush):
+        with self._lock:
+            # Extend the trailing batch for the same key instead of queueing a new one
+            if self._pending and self._pending[-1][0] == "rows" and self._pending[-1][1] == key:
+                self._pending[-1][3].extend(rows)
+            else:
+                self._pending.append(["rows", key, flush, deque(rows)])
+
+    def pending(self):
+        """Number of queued entries not applied yet"""
+        with self._lock:
+            return len(self._pending)
+
+    def discard_rows(self, key):
+        """Drop rows for `key` that have not been flushed yet"""
+        with self._lock:
+            self._pending = deque(e for e in self._pending if not (e[0] == "rows" and e[1] == key))
+
+    def _apply_config(self, widget):
+        with self._lock:
+            options = self._configs.pop(widget, None)
+        if options:
+            widget.config(**options)
+
+    def _drain(self):
+        """Apply the work queued before this frame started, within the row budget"""
+        try:
+            budget = self.max_rows_per_frame
+            with self._lock:
+                count = len(self._pending)
+            while count > 0:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    entry = self._pending[0]
+                    if entry[0] == "rows":
+                        queued = entry[3]
+                        chunk = [queued.popleft() for _ in range(min(budget, len(queued)))]
+                        if not queued:
+                            self._pending.popleft()
+                            count -= 1
+                    else:
+                        self._pending.popleft()
+                        count -= 1
+                try:
+                    if entry[0] == "rows":
+                        if chunk:
+                            entry[2](chunk)
+                        budget -= len(chunk)
+                        if budget <= 0:
+                            break
+                    else:
+                        entry[1](*entry[2])
+                except Exception:
+                    logger.exception("UI update failed")
+        finally:
+            if self._running:
+                self.root.after(self.interval_ms, self._drain)
+
+
+# ---------------- Group Picker ---------------- #
+class GroupPicker(ttk.Frame):
+    """Group list for the add / remove dialogs, searched through a GroupIndex.
+
+    The Listbox only ever holds the lines that fit on screen: the matches
+    stay in a Python list and scrolling moves a window over it, so neither
+    typing nor scrolling inserts more than a screenful of lines, whatever
+    the number of groups. Each line shows the group's member count and,
+    with `members` ({group name: accountIds of the selected users in it}),
+    how many of the selected users are in it; `within` limits the list.
+    """
+
+    def __init__(self, parent, index, search_var, within=None, members=None, selected_count=0, on_change=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.index = index
+        self.search_var = search_var
+        self.within = within
+        self.members = members or {}
+        self.selected_count = selected_count
+        self.on_change = on_change  # on_change(shown, total) after every search
+        self.matches = []
+        self.top = 0  # match shown on the first line
+        self.rows = 10  # lines that fit, updated on resize
+        self.pos = None  # selected match
+
+        self.scrollbar = ttk.Scrollbar(self, command=self._scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(self, font=("", 10), activestyle="dotbox", exportselection=False)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self._line = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+
+        self.listbox.bind("<Configure>", self._resize)
+        self.listbox.bind("<<ListboxSelect>>", self._clicked)
+        self.listbox.bind("<MouseWheel>", lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._wheel(-1))
+        self.listbox.bind("<Button-5>", lambda e: self._wheel(1))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"), ("<Home>", "home"), ("<End>", "end")):
+            self.listbox.bind(key, lambda e, step=step: self.move(step))
+        search_var.trace("w", lambda *args: self.search())
+        self.search()
+
+    def get(self):
+        """Selected group name (None if nothing is selected)"""
+        return self.matches[self.pos] if self.pos is not None else None
+
+    def search(self):
+        """Show the matches for the search box, best match selected"""
+        self.matches = self.index.search(self.search_var.get(), self.within)
+        self.top = 0
+        self.pos = 0 if self.matches else None
+        self._render()
+        if self.on_change:
+            self.on_change(len(self.matches), len(self.within) if self.within is not None else len(self.index))
+
+    def move(self, step):
+        """Move the selection (by lines, "page" / "-page", "home" or "end") and keep it on screen"""
+        if not self.matches:
+            return "break"
+        pos = self.pos or 0
+        if step == "home":
+            pos = 0
+        elif step == "end":
+            pos = len(self.matches) - 1
+        elif step in ("page", "-page"):
+            pos += self.rows if step == "page" else -self.rows
+        else:
+            pos += step
+        self.pos = max(0, min(pos, len(self.matches) - 1))
+        if self.pos < self.top:
+            self.top = self.pos
+        elif self.pos >= self.top + self.rows:
+            self.top = self.pos - self.rows + 1
+        self._render()
+        return "break"
+
+    def _text(self, name):
+        text = name
+        count = self.index.member_count(name)
+        if count is not None:
+            text += f"  ·  {count} members"
+        if self.selected_count > 1 and name in self.members:
+            text += f"  ·  {len(self.members[name])} of {self.selected_count} selected"
+        return text
+
+    def _render(self):
+        total = len(self.matches)
+        self.top = max(0, min(self.top, total - self.rows))
+        window = self.matches[self.top:self.top + self.rows]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *(self._text(name) for name in window))
+        if self.pos is not None and self.top <= self.pos < self.top + len(window):
+            self.listbox.selection_set(self.pos - self.top)
+            self.listbox.activate(self.pos - self.top)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _resize(self, event):
+        rows = max(1, (event.height - 4) // self._line)
+        if rows != self.rows:
+            self.rows = rows
+            self._render()
+
+    def _clicked(self, _):
+        picked = self.listbox.curselection()
+        if picked:
+            self.pos = self.top + picked[0]
+
+    def _wheel(self, units):
+        self._scroll("scroll", units * 3, "units")
+        return "break"
+
+    def _scroll(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.matches))
+        elif args[0] == "scroll":
+            self.top += int(args[1]) * (self.rows if args[2] == "pages" else 1)
+        self._render()
+
 
 class JiraUserApp:
     def __init__(self, root):
+        self.startup = StartupTimer()
+        self.startup.mark("modules imported", at=IMPORTS_DONE)
+        self.startup.mark("Tk root created")
         self.root = root
         self.root.title("Jira User & Group Management")
         self.root.geometry("1400x850")
@@ -46,24 +525,55 @@ class JiraUserApp:
         self.search_var = tk.StringVar()
         self.remember_creds = tk.BooleanVar(value=True)
         self.use_org_api = tk.BooleanVar(value=False)
+        self.join_site_users = tk.BooleanVar(value=False)  # Org API fetches also crawl /users/search and join it in
+        self.keep_history = tk.BooleanVar(value=False)
 
         self.users_data = []
         self.groups_data = []
+        self.group_index = GroupIndex()  # group name search for the group pickers, built when groups are fetched
         self.groups_members = {}
         self.users_product_access = {}  # Store product access data
-        self.products_data = {}  # Store products with their users
+        self.product_index = ProductIndex()  # products -> users, updated as user pages arrive
+        self.quality_index = DataQualityIndex()  # duplicates / email / invite checks, updated as user pages arrive
+        self.user_index = UserIndex()  # accountId / email -> user, for the selection and bulk dialogs
+        self._products_rendered = None  # (index, version) last shown in the Products tab
+        self.previous_crawl = None  # Directory of the last user crawl, to diff the next one against
+        self.last_diff = None  # SnapshotDiff: changes found by the last user crawl
+        self.profiles = []  # workspace.Profile: the sites of the Sites tab
+        self.workspace = None  # workspace.MergedDirectory of the last "Fetch All Sites"
+        self._workspace_rows = {}  # merged view ("users" / "groups" / "products") -> rows, computed off the Tk thread
         self.current_view = "users"
 
         self.sort_column = None
         self.sort_reverse = False
 
+        # Workers hand all UI work to this queue; the main loop drains it
+        # at a fixed frame rate
+        self.ui = UIUpdateQueue(self.root)
+        # Tracks event-loop stalls and user-facing latencies (Diagnostics tab)
+        self.watchdog = UIWatchdog(self.root)
+        # Every outbound call is recorded here (see the Diagnostics tab)
+        self.metrics = RequestMetrics()
+        self.http = None  # shared session for one-off calls, created on first use
+        # All background work goes through the scheduler; UI callbacks are
+        # marshalled back onto the Tk thread through the UI queue
+        self.scheduler = JobScheduler(self.ui.post, metrics=self.metrics)
+        self._row_count = 0  # top-level rows currently shown in the tree
+        self._rows = set()  # top-level items of the current view, shown or detached by a filter
+        self._attached = []  # the shown ones, in order
+        self._rows_view = None  # view ("users" / "groups") the items in _rows belong to
+        self._sort_keys = {}  # column -> {accountId: sort key} for the Users view
+
         self.setup_ui()
+        self.ui.start()
+        self.watchdog.start()
         self.load_credentials()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after_idle(self._on_first_paint)
 
     # ---------------- UI ---------------- #
     def setup_ui(self):
-        print("=== Starting UI Setup ===")
+        logger.debug("Starting UI setup")
         
         # Main container with notebook (tabs)
         notebook = ttk.Notebook(self.root)
@@ -72,7 +582,79 @@ class JiraUserApp:
         # Tab 1: Configuration
         config_tab = ttk.Frame(notebook, padding=15)
         notebook.add(config_tab, text="⚙️ Configuration")
+        with self.startup.step("Configuration tab built"):
+            self.setup_config_tab(config_tab)
+        
+        # Tab 2: Data (Users & Groups with sub-tabs)
+        data_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(data_tab, text="👥 Data")
         
+        # Tab 3: Products
+        products_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(products_tab, text="📦 Products")
+        
+        # Tab 4: Sites (several sites / orgs crawled together)
+        sites_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(sites_tab, text="🌐 Sites")
+        
+        # Tab 5: Diagnostics
+        diagnostics_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(diagnostics_tab, text="📈 Diagnostics")
+        self.diagnostics_tab = diagnostics_tab
+        
+        # The other tabs are built the first time they are shown (or when
+        # an action needs their widgets, see ensure_tab)
+        self._tab_builders = {
+            "data": (data_tab, self.setup_users_tab),
+            "products": (products_tab, self.setup_products_tab),
+            "sites": (sites_tab, self.setup_sites_tab),
+            "diagnostics": (diagnostics_tab, self.setup_diagnostics_tab),
+        }
+        self._built_tabs = set()
+        notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # Store notebook reference for tab switching
+        self.notebook = notebook
+        self.root.after(2000, self._diagnostics_tick)
+        
+        logger.debug("UI setup complete")
+    
+    def ensure_tab(self, name):
+        """Build a deferred tab ("data", "products", "sites", "diagnostics") if it has not been built yet"""
+        if name in self._built_tabs:
+            return
+        self._built_tabs.add(name)
+        frame, build = self._tab_builders[name]
+        with self.startup.step(f"{name.title()} tab built"):
+            build(frame)
+    
+    def on_tab_changed(self, event):
+        selected = self.notebook.select()
+        for name, (frame, _) in self._tab_builders.items():
+            if str(frame) == selected:
+                self.ensure_tab(name)
+                if name == "diagnostics":
+                    self.refresh_diagnostics()
+                elif name == "products" and self._products_rendered != (self.product_index, self.product_index.version):
+                    self.refresh_products()
+    
+    def _on_first_paint(self):
+        """The window is up and responsive; warm up the heavy imports in the background"""
+        self.startup.mark("first paint (interactive)")
+        threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
+    
+    def _warm_up(self):
+        start = time.perf_counter()
+        for module in WARM_UP_MODULES:
+            try:
+                __import__(module)
+            except ImportError as e:
+                logger.warning("Warm-up: %s not available (%s)", module, e)
+        self.startup.mark("background imports done", since=start)
+        logger.info("%s", self.startup.report())
+    
+    def setup_config_tab(self, config_tab):
+        """Setup the Configuration tab (built eagerly - it is the first thing shown)"""
         # Jira Configuration Section
         jira_frame = ttk.LabelFrame(config_tab, text="Jira Connection", padding=15)
         jira_frame.pack(fill="x", pady=(0, 10))
@@ -134,34 +716,21 @@ class JiraUserApp:
             text="Remember credentials (Jira URL, Email)",
             variable=self.remember_creds
         ).pack(side="left")
+        ttk.Checkbutton(
+            settings_frame,
+            text="Keep snapshot history (every user fetch)",
+            variable=self.keep_history
+        ).pack(side="left", padx=(20, 0))
         
         # Action buttons
         action_frame = ttk.Frame(config_tab)
         action_frame.pack(fill="x")
         
         ttk.Button(action_frame, text="✓ Validate Token", command=self.validate_token_async, width=20).pack(side="left", padx=(0, 5))
-        
-        # Tab 2: Data (Users & Groups with sub-tabs)
-        data_tab = ttk.Frame(notebook, padding=10)
-        notebook.add(data_tab, text="👥 Data")
-        
-        # Tab 3: Products
-        products_tab = ttk.Frame(notebook, padding=10)
-        notebook.add(products_tab, text="📦 Products")
-        
-        # Setup Data tab (contains Users/Groups sub-tabs)
-        self.setup_users_tab(data_tab)
-        
-        # Setup Products tab
-        self.setup_products_tab(products_tab)
-        
-        # Store notebook reference for tab switching
-        self.notebook = notebook
-        
-        print("=== UI Setup Complete ===")
     
     def setup_users_tab(self, parent):
         """Setup the Users tab with compact filters"""
+        from tkcalendar import DateEntry  # pip install tkcalendar
         
         # Top action bar with fetch buttons back
         action_bar = ttk.Frame(parent)
@@ -175,6 +744,12 @@ class JiraUserApp:
         self.bulk_edit_btn.pack(side="left", padx=(0, 5))
         
         ttk.Button(action_bar, text="💾 Export CSV", command=self.export_csv, width=15).pack(side="left", padx=(0, 5))
+        self.changes_btn = ttk.Button(action_bar, text="🔀 Changes", command=self.show_changes_dialog, width=12, state="disabled")
+        self.changes_btn.pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🩺 Data Quality", command=self.show_data_quality, width=16).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🧩 Group Overlap", command=self.show_group_overlap, width=17).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="📑 Reconcile Groups", command=self.show_reconcile, width=19).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="⏹ Cancel", command=self.cancel_background_jobs, width=10).pack(side="left", padx=(0, 5))
         
         # Separator
         ttk.Separator(action_bar, orient="vertical").pack(side="left", fill="y", padx=10)
@@ -186,6 +761,11 @@ class JiraUserApp:
             variable=self.use_org_api,
             command=self.toggle_org_api
         ).pack(side="left", padx=(0, 10))
+        ttk.Checkbutton(
+            action_bar,
+            text="+ Site status",
+            variable=self.join_site_users
+        ).pack(side="left", padx=(0, 10))
         
         # Separator
         ttk.Separator(action_bar, orient="vertical").pack(side="left", fill="y", padx=10)
@@ -337,8 +917,8 @@ class JiraUserApp:
             self.tree.heading(col, text=col.replace("_", " ").title(), command=partial(self.sort_by_column, col))
             self.tree.column(col, width=w, minwidth=w, stretch=True)
         
-        # Track selected items
-        self.selected_items = set()
+        # Selected users, by accountId (user rows use the accountId as item id)
+        self.selection = Selection()
 
         ysb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         xsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
@@ -464,17 +1044,10 @@ class JiraUserApp:
             if self.groups_data:
                 self.display_groups()  # Show all groups
     
+    @ui_handler
     def display_groups(self):
         """Display all groups (unfiltered)"""
-        self.clear_tree()
-        for g in self.groups_data:
-            item = self.tree.insert(
-                "",
-                "end",
-                values=("", g["name"], "", g["groupId"], "", g.get("memberCount", "")),
-                tags=("group",)
-            )
-            self.tree.insert(item, "end", values=("", "Loading...", "", "", "", "", ""), tags=("placeholder",))
+        self._show_groups(self.groups_data)
         
         # Update count
         if hasattr(self, 'result_count_label'):
@@ -501,6 +1074,7 @@ class JiraUserApp:
         
         ttk.Button(action_bar, text="📊 Analyze Products", command=self.analyze_products, width=20).pack(side="left", padx=(20, 5))
         ttk.Button(action_bar, text="💾 Export Products CSV", command=self.export_products_csv, width=20).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🕒 Stale Accounts", command=self.show_stale_report, width=18).pack(side="left", padx=(0, 5))
         
         # Separator
         ttk.Separator(action_bar, orient="vertical").pack(side="left", fill="y", padx=10)
@@ -550,8 +1124,10 @@ class JiraUserApp:
         tree_frame.columnconfigure(0, weight=1)
         
         self.products_tree.bind("<<TreeviewOpen>>", self.on_product_expand)
+        self.products_tree.bind("<Double-Button-1>", self.on_product_double_click)
         self.products_tree.tag_configure("product", background="#e8f4f8")
         self.products_tree.tag_configure("user", background="#f0f0f0")
+        self.products_tree.tag_configure("more", foreground="#0066cc")
         
         # Footer
         footer_frame = ttk.Frame(parent)
@@ -567,13 +1143,216 @@ class JiraUserApp:
         )
         self.products_count_label.pack(side="left", padx=10)
     
+    def _set_log_level(self, level):
+        set_level(level)
+        logger.info("Log level set to %s", level)
+    
+    def open_log_folder(self):
+        folder = os.path.dirname(default_log_file())
+        os.makedirs(folder, exist_ok=True)
+        webbrowser.open(folder)
+    
+    def setup_diagnostics_tab(self, parent):
+        """Setup the Diagnostics tab with per-endpoint HTTP metrics and operation timings"""
+        action_bar = ttk.Frame(parent)
+        action_bar.pack(fill="x", pady=(0, 10))
+        
+        ttk.Button(action_bar, text="🔄 Refresh", command=self.refresh_diagnostics, width=15).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🧹 Reset", command=self.reset_diagnostics, width=15).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="💾 Export JSON", command=self.export_diagnostics_json, width=15).pack(side="left", padx=(0, 5))
+        
+        # Log level (console and ~/.jira_user_app/logs); DEBUG adds per-page and per-row detail
+        ttk.Label(action_bar, text="Log level:").pack(side="left", padx=(15, 5))
+        log_level = ttk.Combobox(action_bar, values=LEVELS, width=9, state="readonly")
+        log_level.set(current_level())
+        log_level.pack(side="left")
+        log_level.bind("<<ComboboxSelected>>", lambda e: self._set_log_level(log_level.get()))
+        ttk.Button(action_bar, text="📂 Log Folder", command=self.open_log_folder, width=13).pack(side="left", padx=(5, 0))
+        
+        self.diagnostics_status = ttk.Label(action_bar, text="", foreground="gray", font=("", 9))
+        self.diagnostics_status.pack(side="left", padx=10)
+        
+        # Per-endpoint metrics
+        endpoints_frame = ttk.LabelFrame(parent, text="🌐 HTTP Endpoints", padding=8)
+        endpoints_frame.pack(fill="both", expand=True, pady=(0, 10))
+        
+        columns = ("calls", "status", "avg", "p50", "p95", "max", "bytes_in", "retries", "rate_limited", "waits")
+        self.endpoints_tree = ttk.Treeview(endpoints_frame, columns=columns, show="tree headings", height=8)
+        self.endpoints_tree.heading("#0", text="Endpoint")
+        self.endpoints_tree.column("#0", width=200)
+        for col, label, w in zip(
+            columns,
+            ("Calls", "Status Codes", "Avg ms", "p50 ms", "p95 ms", "Max ms", "KB In", "Retries", "429s", "Wait / Pacing s"),
+            (60, 160, 70, 70, 70, 70, 80, 60, 60, 110)
+        ):
+            self.endpoints_tree.heading(col, text=label)
+            self.endpoints_tree.column(col, width=w, anchor="e" if col != "status" else "w")
+        self.endpoints_tree.pack(fill="both", expand=True)
+        self.endpoints_tree.bind("<<TreeviewSelect>>", lambda e: self._show_endpoint_histogram())
+        
+        self.histogram_label = ttk.Label(endpoints_frame, text="Select an endpoint to see its latency histogram", font=("Courier", 9), foreground="gray", justify="left")
+        self.histogram_label.pack(fill="x", pady=(5, 0))
+        
+        # Per-operation breakdown
+        ops_frame = ttk.LabelFrame(parent, text="⏱️ Operations (wall time = HTTP + waiting + client-side)", padding=8)
+        ops_frame.pack(fill="both", expand=True)
+        
+        op_columns = ("runs", "wall", "http", "wait", "client", "last")
+        self.operations_tree = ttk.Treeview(ops_frame, columns=op_columns, show="tree headings", height=6)
+        self.operations_tree.heading("#0", text="Operation")
+        self.operations_tree.column("#0", width=200)
+        for col, label, w in zip(
+            op_columns,
+            ("Runs", "Wall s", "HTTP s", "Waiting s", "Client s", "Last Run (wall / http / wait)"),
+            (60, 80, 80, 80, 80, 260)
+        ):
+            self.operations_tree.heading(col, text=label)
+            self.operations_tree.column(col, width=w, anchor="e" if col != "last" else "w")
+        self.operations_tree.pack(fill="both", expand=True)
+        
+        # UI thread responsiveness
+        ui_frame = ttk.LabelFrame(parent, text=f"🐢 UI Responsiveness (stalls over {self.watchdog.threshold_ms} ms)", padding=8)
+        ui_frame.pack(fill="both", expand=True, pady=(10, 0))
+        
+        ui_columns = ("count", "last", "p50", "p95", "max")
+        self.ui_latency_tree = ttk.Treeview(ui_frame, columns=ui_columns, show="tree headings", height=7)
+        self.ui_latency_tree.heading("#0", text="Measurement")
+        self.ui_latency_tree.column("#0", width=220)
+        for col, label in zip(ui_columns, ("Count", "Last ms", "p50 ms", "p95 ms", "Max ms")):
+            self.ui_latency_tree.heading(col, text=label)
+            self.ui_latency_tree.column(col, width=80, anchor="e")
+        self.ui_latency_tree.pack(side="left", fill="both", expand=True)
+        
+        self.stalls_tree = ttk.Treeview(ui_frame, columns=("handler", "duration"), show="headings", height=7)
+        self.stalls_tree.heading("handler", text="Stalled In")
+        self.stalls_tree.heading("duration", text="Duration ms")
+        self.stalls_tree.column("handler", width=220)
+        self.stalls_tree.column("duration", width=100, anchor="e")
+        self.stalls_tree.pack(side="left", fill="both", expand=True, padx=(10, 0))
+        
+        # Cold start milestones
+        startup_frame = ttk.LabelFrame(parent, text="🚀 Startup", padding=8)
+        startup_frame.pack(fill="x", pady=(10, 0))
+        self.startup_label = ttk.Label(startup_frame, text="", font=("Courier", 9), justify="left")
+        self.startup_label.pack(fill="x")
+    
+    def _diagnostics_tick(self):
+        """Refresh the Diagnostics tab periodically while it is visible"""
+        try:
+            if self.notebook.select() == str(self.diagnostics_tab):
+                self.refresh_diagnostics()
+        finally:
+            self.root.after(2000, self._diagnostics_tick)
+    
+    def refresh_diagnostics(self):
+        snapshot = self.metrics.snapshot()
+        self._diagnostics_snapshot = snapshot
+        
+        selected = self.endpoints_tree.selection()
+        self.endpoints_tree.delete(*self.endpoints_tree.get_children())
+        for name, ep in snapshot["endpoints"].items():
+            latency = ep["latency_ms"]
+            statuses = ", ".join(f"{code}×{n}" for code, n in ep["status_codes"].items())
+            if ep["errors"]:
+                statuses += f", err×{ep['errors']}"
+            self.endpoints_tree.insert(
+                "",
+                "end",
+                iid=name,
+                text=name,
+                values=(
+                    ep["calls"],
+                    statuses,
+                    latency["avg"],
+                    latency["p50"],
+                    latency["p95"],
+                    latency["max"],
+                    f"{ep['bytes_in'] / 1024:.1f}",
+                    ep["retries"],
+                    ep["rate_limited"],
+                    f"{ep['wait_seconds']:.1f} / {ep['pacing_seconds']:.1f}"
+                )
+            )
+        if selected and self.endpoints_tree.exists(selected[0]):
+            self.endpoints_tree.selection_set(selected[0])
+        
+        self.operations_tree.delete(*self.operations_tree.get_children())
+        for name, op in snapshot["operations"].items():
+            last = op["last"] or {}
+            self.operations_tree.insert(
+                "",
+                "end",
+                text=name,
+                values=(
+                    op["runs"],
+                    op["wall_seconds"],
+                    op["http_seconds"],
+                    op["wait_seconds"],
+                    op["client_seconds"],
+                    f"{last.get('wall_seconds', 0)} / {last.get('http_seconds', 0)} / {last.get('wait_seconds', 0)}"
+                )
+            )
+        
+        ui = self.watchdog.snapshot()
+        self.ui_latency_tree.delete(*self.ui_latency_tree.get_children())
+        
+        def add_row(parent, name, stats):
+            return self.ui_latency_tree.insert(
+                parent,
+                "end",
+                text=name,
+                values=(stats["count"], stats["last_ms"], stats["p50_ms"], stats["p95_ms"], stats["max_ms"]),
+                open=True
+            )
+        
+        add_row("", "Event-loop latency", ui["loop_latency"])
+        for title, section in (("User-facing latencies", ui["latencies"]), ("Handlers", ui["handlers"])):
+            parent = self.ui_latency_tree.insert("", "end", text=title, open=True)
+            for name, stats in section.items():
+                add_row(parent, name, stats)
+        
+        self.stalls_tree.delete(*self.stalls_tree.get_children())
+        for stall in reversed(ui["stalls"]):
+            self.stalls_tree.insert("", "end", values=(f"{stall['at'][11:]}  {stall['handler']}", stall["duration_ms"]))
+        
+        self.startup_label.config(text=self.startup.report())
+        self.diagnostics_status.config(text=f"Updated {datetime.now().strftime('%H:%M:%S')}")
+    
+    def _show_endpoint_histogram(self):
+        selection = self.endpoints_tree.selection()
+        snapshot = getattr(self, "_diagnostics_snapshot", None)
+        if not selection or not snapshot or selection[0] not in snapshot["endpoints"]:
+            return
+        histogram = snapshot["endpoints"][selection[0]]["latency_ms"]["histogram"]
+        peak = max(histogram.values()) or 1
+        lines = [f"{selection[0]} latency (ms)"]
+        for bucket, count in histogram.items():
+            lines.append(f"{bucket:>8} | {'█' * int(40 * count / peak):<40} {count}")
+        self.histogram_label.config(text="\n".join(lines), foreground="black")
+    
+    def reset_diagnostics(self):
+        self.metrics.reset()
+        self.watchdog.reset()
+        self.refresh_diagnostics()
+    
+    def export_diagnostics_json(self):
+        """Export the current metrics snapshot to a JSON file"""
+        filename = timestamped_filename("jira_diagnostics", "json")
+        snapshot = self.metrics.snapshot()
+        snapshot["ui"] = self.watchdog.snapshot()
+        snapshot["startup"] = self.startup.to_dict()
+        write_json(filename, snapshot)
+        messagebox.showinfo("Exported", f"Diagnostics exported to {filename}")
+    
     def clear_products_search(self):
         self.products_search_var.set("")
         self.filter_products()
     
+    @ui_handler
     def analyze_products(self):
-        """Analyze product access from user data"""
-        if not self.users_data:
+        """Show product access (the index is kept current while users are fetched)"""
+        self.ensure_tab("products")
+        if not self.users_data and not len(self.product_index):
             messagebox.showwarning("No Data", "Please fetch users first (with Org API enabled)")
             return
         
@@ -581,95 +1360,57 @@ class JiraUserApp:
             messagebox.showwarning("Org API Required", "Please enable Organization API and fetch users again to see product access")
             return
         
-        self.products_status.config(text="Analyzing products...", foreground="orange")
-        
-        # Build product dictionary
-        products = {}
-        
-        for user in self.users_data:
-            user_name = user.get("name", "")
-            user_email = user.get("email", "") or "(No email)"
-            user_id = user.get("account_id", "")
-            user_status = user.get("account_status", "")
-            
-            product_access = user.get("product_access", [])
-            
-            for product in product_access:
-                product_name = product.get("name", "Unknown")
-                product_key = product.get("key", "")
-                product_url = product.get("url", "")
-                last_active = product.get("last_active", "")
-                
-                # Format last active
-                if last_active:
-                    try:
-                        dt = parser.isoparse(last_active)
-                        last_active_formatted = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        last_active_formatted = last_active
-                else:
-                    last_active_formatted = "Never"
-                
-                # Create unique product identifier
-                product_id = f"{product_name}|{product_url}"
-                
-                if product_id not in products:
-                    products[product_id] = {
-                        "name": product_name,
-                        "key": product_key,
-                        "url": product_url,
-                        "users": []
-                    }
-                
-                products[product_id]["users"].append({
-                    "name": user_name,
-                    "email": user_email,
-                    "id": user_id,
-                    "status": user_status,
-                    "last_active": last_active_formatted
-                })
-        
-        self.products_data = products
-        self.display_products(products)
-        
-        self.products_status.config(text=f"{len(products)} products found", foreground="green")
-        self.products_count_label.config(text=f"Showing {len(products)} product(s)", foreground="green")
+        if not len(self.product_index) and self.users_data:
+            # Users loaded without the incremental index (nothing to stream)
+            self.product_index = ProductIndex(self.users_data)
+        self.refresh_products()
+        self.products_status.config(text=f"{len(self.product_index)} products found", foreground="green")
     
-    def display_products(self, products):
-        """Display products in the tree"""
-        # Clear existing
-        for item in self.products_tree.get_children():
-            self.products_tree.delete(item)
-        
-        if not products:
-            self.products_tree.insert("", "end", values=("No products found", "", "", ""))
-            return
+    def _products_changed(self):
+        """A page of users was added to the product index; re-render if the Products tab is showing"""
+        if "products" in self._built_tabs and self.notebook.select() == str(self._tab_builders["products"][0]):
+            self.refresh_products()
+    
+    @ui_handler
+    def refresh_products(self):
+        """Render the product index (filtered by the search box), updating rows in place"""
+        index = self.product_index
+        rows = index.rows()
+        term = self.products_search_var.get()
+        if term:
+            keep = index.search(term)
+            rows = [r for r in rows if r[0] in keep]
+        self._products_rendered = (index, index.version)
+        
+        tree = self.products_tree
+        shown = set()
+        for position, (pid, name, url, count, last_active) in enumerate(rows):
+            values = (f"📦 {name}", f"{count} users", url, last_active)
+            shown.add(pid)
+            if tree.exists(pid):
+                if tree.item(pid, "values")[1] != values[1]:
+                    # Membership changed: reload the user list on next expand
+                    children = tree.get_children(pid)
+                    if children and "placeholder" not in tree.item(children[0], "tags"):
+                        tree.delete(*children)
+                        tree.insert(pid, "end", values=("Loading users...", "", "", ""), tags=("placeholder",))
+                        tree.item(pid, open=False)
+                tree.item(pid, values=values)
+                tree.move(pid, "", position)
+            else:
+                tree.insert("", position, iid=pid, values=values, tags=("product",))
+                # Add placeholder for expansion
+                tree.insert(pid, "end", values=("Loading users...", "", "", ""), tags=("placeholder",))
         
-        # Sort products by name
-        sorted_products = sorted(products.items(), key=lambda x: x[1]["name"])
+        stale = [item for item in tree.get_children() if item not in shown]
+        if stale:
+            tree.delete(*stale)
+        if not rows:
+            tree.insert("", "end", values=("No products found", "", "", ""))
         
-        for product_id, product_data in sorted_products:
-            user_count = len(product_data["users"])
-            
-            # Get most recent last_active across all users
-            last_actives = [u["last_active"] for u in product_data["users"] if u["last_active"] != "Never"]
-            most_recent = max(last_actives) if last_actives else "Never"
-            
-            product_item = self.products_tree.insert(
-                "",
-                "end",
-                values=(
-                    f"📦 {product_data['name']}",
-                    f"{user_count} users",
-                    product_data['url'],
-                    most_recent
-                ),
-                tags=("product",)
-            )
-            
-            # Add placeholder for expansion
-            self.products_tree.insert(product_item, "end", values=("Loading users...", "", "", ""), tags=("placeholder",))
+        self.products_count_label.config(text=f"Showing {len(rows)} product(s)", foreground="green" if rows else "gray")
     
+    @ui_handler(latency="expand_product")
     def on_product_expand(self, _):
         """Handle product expansion to show users"""
         item = self.products_tree.focus()
@@ -684,22 +1425,15 @@ class JiraUserApp:
         # Clear placeholder
         self.products_tree.delete(*children)
         
-        # Get product info from the item
-        values = self.products_tree.item(item, "values")
-        product_name = values[0].replace("📦 ", "")
-        product_url = values[2]
-        product_id = f"{product_name}|{product_url}"
-        
-        product_data = self.products_data.get(product_id)
-        if not product_data:
-            return
-        
-        # Display users sorted by name
-        users = sorted(product_data["users"], key=lambda x: x["name"])
-        
+        # Product rows are keyed by product id; users come presorted by name
+        self._insert_product_users(item, 0)
+    
+    def _insert_product_users(self, pid, start):
+        """Insert one page of a product's users, plus a "more" row if there are more"""
+        users, total = self.product_index.page(pid, start, PRODUCT_PAGE_SIZE)
         for user in users:
             self.products_tree.insert(
-                item,
+                pid,
                 "end",
                 values=(
                     f"  👤 {user['name']}",
@@ -709,54 +1443,666 @@ class JiraUserApp:
                 ),
                 tags=("user",)
             )
+        remaining = total - start - len(users)
+        if remaining > 0:
+            self.products_tree.insert(
+                pid,
+                "end",
+                values=(f"  ⋯ {remaining} more users (double-click to show {min(remaining, PRODUCT_PAGE_SIZE)} more)", "", "", ""),
+                tags=("more",)
+            )
+    
+    @ui_handler
+    def on_product_double_click(self, event):
+        """Double-click on a "more" row loads the product's next page of users"""
+        item = self.products_tree.identify_row(event.y)
+        if not item or "more" not in self.products_tree.item(item, "tags"):
+            return
+        pid = self.products_tree.parent(item)
+        loaded = len(self.products_tree.get_children(pid)) - 1
+        self.products_tree.delete(item)
+        self._insert_product_users(pid, loaded)
+        return "break"
     
     def filter_products(self):
         """Filter products based on search term"""
-        if not self.products_data:
+        self.refresh_products()
+    
+    @ui_handler
+    def export_products_csv(self):
+        """Export products and their users to CSV"""
+        products = self.product_index.snapshot()
+        if not products:
+            messagebox.showwarning("No Data", "Please fetch users with the Organization API first")
             return
         
-        term = self.products_search_var.get().lower()
+        filename = timestamped_filename("jira_products")
+        write_products_csv(filename, products)
         
-        if not term:
-            self.display_products(self.products_data)
+        messagebox.showinfo("Exported", f"Products exported to {filename}")
+        self.products_status.config(text="Export complete", foreground="green")
+
+    # ---------------- Stale Accounts ---------------- #
+    def show_stale_report(self):
+        """Per-product counts of inactive users, and a deactivate / remove-from-group plan from them"""
+        if not self.users_data or not self.use_org_api.get():
+            messagebox.showwarning("Org API Required", "Please fetch users with the Organization API enabled first (last active data)")
             return
+        self.products_status.config(text="Computing stale accounts...", foreground="orange")
+        self.scheduler.submit("stale_report", self._stale_report_thread, self.users_data, lane=LANE_INTERACTIVE)
+    
+    def _stale_report_thread(self, job, users):
+        report = ActivityReport(users)
+        summary = report.summary()
+        self.ui.configure(self.products_status, text=f"Stale accounts as of {report.as_of}", foreground="green")
+        self.ui.post(self._show_stale_report_dialog, report, summary)
+    
+    def _show_stale_report_dialog(self, report, summary):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Stale Accounts")
+        dialog.geometry("820x540")
+        dialog.transient(self.root)
         
-        # Filter products
-        filtered = {
-            pid: pdata for pid, pdata in self.products_data.items()
-            if term in pdata["name"].lower() or 
-               term in pdata["url"].lower() or
-               any(term in u["name"].lower() or term in u["email"].lower() for u in pdata["users"])
-        }
+        ttk.Label(dialog, text="🕒 Stale Accounts", font=("", 14, "bold")).pack(pady=(15, 0))
+        ttk.Label(
+            dialog,
+            text=f"Users with access and no activity for N+ days, as of {report.as_of} (never-active users are counted in every column)",
+            font=("", 9),
+            foreground="gray"
+        ).pack(pady=(0, 10))
+        
+        # Per-product counts
+        table_frame = ttk.Frame(dialog)
+        table_frame.pack(fill="both", expand=True, padx=20)
+        columns = ("users", "never") + tuple(str(d) for d in THRESHOLDS)
+        table = ttk.Treeview(table_frame, columns=columns, show="tree headings", height=10, selectmode="browse")
+        table.heading("#0", text="Product")
+        table.column("#0", width=240)
+        for col, label in zip(columns, ["Users", "Never"] + [f"{d}+ days" for d in THRESHOLDS]):
+            table.heading(col, text=label)
+            table.column(col, width=80, anchor="e")
+        for row in summary:
+            table.insert(
+                "",
+                "end",
+                iid=f"product:{row['product']}",
+                text=f"📦 {row['name']}" if row["product"] else f"🌐 {row['name']}",
+                values=(row["users"], row["never"]) + tuple(row["inactive"][d] for d in THRESHOLDS)
+            )
+        ysb = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=ysb.set)
+        table.pack(side="left", fill="both", expand=True)
+        ysb.pack(side="right", fill="y")
+        table.selection_set(table.get_children()[0])
+        
+        # Plan options
+        options = ttk.LabelFrame(dialog, text="🎯 Plan", padding=10)
+        options.pack(fill="x", padx=20, pady=10)
+        ttk.Label(options, text="Inactive for at least").pack(side="left")
+        days_box = ttk.Combobox(options, values=THRESHOLDS, width=6)
+        days_box.set(90)
+        days_box.pack(side="left", padx=5)
+        ttk.Label(options, text="days").pack(side="left")
+        active_only = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Only active accounts", variable=active_only).pack(side="left", padx=(20, 0))
+        plan_label = ttk.Label(options, text="", font=("", 10, "bold"))
+        plan_label.pack(side="right")
+        
+        plan = {"users": [], "rows": []}
+        
+        def update_plan(*_):
+            try:
+                days = int(days_box.get())
+            except ValueError:
+                plan_label.config(text="Enter a number of days", foreground="red")
+                return
+            selection = table.selection()
+            key = selection[0].split(":", 1)[1] if selection else ""
+            statuses = ("active",) if active_only.get() else None
+            plan["rows"] = report.stale(days, key, statuses)
+            plan["users"] = plan_users(plan["rows"])
+            scope = table.item(selection[0], "text") if selection else ""
+            plan_label.config(text=f"{len(plan['users'])} user(s) in plan ({scope.split(' ', 1)[-1]}, {days}+ days)", foreground="black")
+        
+        table.bind("<<TreeviewSelect>>", update_plan)
+        days_box.bind("<<ComboboxSelected>>", update_plan)
+        days_box.bind("<KeyRelease>", update_plan)
+        active_only.trace_add("write", update_plan)
+        update_plan()
+        
+        # Actions
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill="x", padx=20, pady=(0, 15))
         
-        self.display_products(filtered)
-        self.products_count_label.config(text=f"Showing {len(filtered)} product(s)", foreground="green")
-    
-    def export_products_csv(self):
-        """Export products and their users to CSV"""
-        if not self.products_data:
-            messagebox.showwarning("No Data", "Please analyze products first")
+        def export_plan():
+            filename = timestamped_filename("jira_stale_accounts")
+            count = write_stale_csv(filename, plan["rows"])
+            messagebox.showinfo("Exported", f"{count} stale account(s) exported to {filename}", parent=dialog)
+        
+        def run(action):
+            users = plan["users"]
+            if not users:
+                messagebox.showwarning("Empty Plan", "No users match the selected product and threshold.", parent=dialog)
+                return
+            if action == "deactivate":
+                bulk_plan = self._plan_bulk_action(users, "deactivate")
+                if not self._confirm_bulk_plan(bulk_plan, parent=dialog):
+                    return
+                dialog.destroy()
+                self._submit_bulk_action(bulk_plan)
+            else:
+                dialog.destroy()
+                self._bulk_group_action(users, "remove_group")
+        
+        ttk.Button(btn_frame, text="💾 Export CSV", command=export_plan, width=16).pack(side="left", padx=(0, 5))
+        ttk.Button(btn_frame, text="🚫 Deactivate...", command=lambda: run("deactivate"), width=18).pack(side="left", padx=(0, 5))
+        ttk.Button(btn_frame, text="➖ Remove from Group...", command=lambda: run("remove_group"), width=22).pack(side="left", padx=(0, 5))
+        ttk.Button(btn_frame, text="✖ Close", command=dialog.destroy, width=12).pack(side="right")
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    # ---------------- Changes ---------------- #
+    def show_changes_dialog(self):
+        """What changed between the last two user crawls, filterable by kind and exportable"""
+        diff = self.last_diff
+        if diff is None:
+            messagebox.showinfo("No Changes", "Fetch users twice (or keep snapshot history) to see what changed between crawls.")
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Changes Since Previous Crawl")
+        dialog.geometry("960x560")
+        dialog.transient(self.root)
+        
+        ttk.Label(dialog, text="🔀 Changes Since Previous Crawl", font=("", 14, "bold")).pack(pady=(15, 0))
+        ttk.Label(dialog, text=f"{diff.old_label} → {diff.new_label}", font=("", 9), foreground="gray").pack()
+        ttk.Label(dialog, text=diff.summary_text(), wraplength=900).pack(pady=(5, 10))
+        
+        # Filter
+        counts = diff.counts()
+        kinds = [k for k in KINDS if k in counts]
+        choices = ["All changes"] + [f"{KIND_LABELS[k]} ({counts[k]})" for k in kinds]
+        filter_frame = ttk.Frame(dialog)
+        filter_frame.pack(fill="x", padx=20)
+        ttk.Label(filter_frame, text="Show:").pack(side="left")
+        kind_box = ttk.Combobox(filter_frame, values=choices, state="readonly", width=36)
+        kind_box.current(0)
+        kind_box.pack(side="left", padx=5)
+        shown_label = ttk.Label(filter_frame, text="", foreground="gray")
+        shown_label.pack(side="right")
+        
+        # Changes table
+        table_frame = ttk.Frame(dialog)
+        table_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        columns = ("kind", "name", "email", "group", "old", "new")
+        table = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
+        for col, label, width in zip(
+            columns,
+            ("Change", "Name", "Email", "Group", "Before", "After"),
+            (160, 170, 200, 170, 110, 110)
+        ):
+            table.heading(col, text=label)
+            table.column(col, width=width)
+        ysb = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=ysb.set)
+        table.pack(side="left", fill="both", expand=True)
+        ysb.pack(side="right", fill="y")
+        
+        shown = {"changes": diff.changes}
+        
+        def show(*_):
+            index = kind_box.current()
+            shown["changes"] = diff.of_kind(kinds[index - 1]) if index > 0 else diff.changes
+            table.delete(*table.get_children())
+            rows = shown["changes"][:REPORT_ROWS_SHOWN]
+            for c in rows:
+                table.insert("", "end", values=(
+                    KIND_LABELS[c["kind"]], c["name"] or c["account_id"], c["email"], c["group"], c["old"], c["new"]
+                ))
+            more = len(shown["changes"]) - len(rows)
+            shown_label.config(text=f"{len(rows)} shown" + (f", {more} more in the export" if more else ""))
+        
+        kind_box.bind("<<ComboboxSelected>>", show)
+        show()
+        
+        # Actions
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill="x", padx=20, pady=(0, 15))
+        
+        def export_changes():
+            filename = timestamped_filename("jira_changes")
+            count = write_changes_csv(filename, shown["changes"])
+            messagebox.showinfo("Exported", f"{count} change(s) exported to {filename}", parent=dialog)
+        
+        ttk.Button(btn_frame, text="💾 Export CSV", command=export_changes, width=16).pack(side="left")
+        ttk.Button(btn_frame, text="✖ Close", command=dialog.destroy, width=12).pack(side="right")
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    # ---------------- Data Quality ---------------- #
+    def show_data_quality(self):
+        """Duplicate accounts, missing / malformed emails, never-active invites and users in no group"""
+        if not self.users_data:
+            messagebox.showwarning("No Users", "Please fetch users first")
             return
+        if len(self.quality_index) == 0:
+            self.quality_index = DataQualityIndex(self.users_data)  # users loaded before the index existed
+        self.status.config(text="Checking data quality...", foreground="orange")
+        self.scheduler.submit(
+            "data_quality", self._data_quality_thread, self.quality_index, dict(self.groups_members), len(self.groups_data),
+            lane=LANE_INTERACTIVE
+        )
+
+    def _data_quality_thread(self, job, index, members, group_count):
+        rows = index.rows(members=members or None)
+        counts = {}
+        for r in rows:
+            counts[r["issue"]] = counts.get(r["issue"], 0) + 1
+        self.ui.configure(self.status, text=f"Data quality: {len(rows)} issue(s) in {len(index)} users", foreground="green")
+        self.ui.post(self._show_data_quality_dialog, index, rows, counts, len(members), group_count)
+
+    def _show_data_quality_dialog(self, index, rows, counts, loaded_groups, group_count):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Data Quality")
+        dialog.geometry("960x580")
+        dialog.transient(self.root)
+        
+        ttk.Label(dialog, text="🩺 Data Quality", font=("", 14, "bold")).pack(pady=(15, 0))
+        if loaded_groups:
+            groups_note = f"'In no group' uses the members loaded for {loaded_groups} of {group_count} group(s)"
+        else:
+            groups_note = "Load group members (Group Overlap or expanding groups) to find users in no group"
+        ttk.Label(dialog, text=f"{len(index)} users checked. {groups_note}", font=("", 9), foreground="gray").pack(pady=(0, 10))
+        
+        results = ttk.Notebook(dialog)
+        results.pack(fill="both", expand=True, padx=20)
+        
+        # Issues, filterable by kind and text
+        issues_tab = ttk.Frame(results, padding=5)
+        results.add(issues_tab, text=f"Issues ({len(rows)})")
+        filter_frame = ttk.Frame(issues_tab)
+        filter_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Show:").pack(side="left")
+        kinds = [k for k in ISSUES if counts.get(k)]
+        kind_box = ttk.Combobox(
+            filter_frame, values=["All issues"] + [f"{ISSUE_LABELS[k]} ({counts[k]})" for k in kinds], state="readonly", width=32
+        )
+        kind_box.current(0)
+        kind_box.pack(side="left", padx=5)
+        ttk.Label(filter_frame, text="Search:").pack(side="left", padx=(15, 0))
+        search_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=search_var, width=30).pack(side="left", padx=5)
+        shown_label = ttk.Label(filter_frame, text="", foreground="gray")
+        shown_label.pack(side="right")
+        
+        table_frame = ttk.Frame(issues_tab)
+        table_frame.pack(fill="both", expand=True)
+        columns = ("issue", "name", "email", "account_id", "status", "detail")
+        table = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
+        for col, label, width in zip(
+            columns,
+            ("Issue", "Name", "Email", "Account ID", "Status", "Details"),
+            (150, 160, 200, 170, 70, 220)
+        ):
+            table.heading(col, text=label)
+            table.column(col, width=width)
+        ysb = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=ysb.set)
+        table.pack(side="left", fill="both", expand=True)
+        ysb.pack(side="right", fill="y")
+        
+        shown = {"rows": rows}
+        
+        def show(*_):
+            selected = kind_box.current()
+            matches = [r for r in rows if r["issue"] == kinds[selected - 1]] if selected > 0 else rows
+            term = search_var.get().strip().lower()
+            if term:
+                matches = [r for r in matches if term in r["name"].lower() or term in r["email"].lower() or term in r["account_id"].lower()]
+            shown["rows"] = matches
+            table.delete(*table.get_children())
+            for r in matches[:REPORT_ROWS_SHOWN]:
+                table.insert("", "end", values=(
+                    ISSUE_LABELS[r["issue"]], r["name"], r["email"], r["account_id"], r["status"], r["detail"]
+                ))
+            more = len(matches) - min(len(matches), REPORT_ROWS_SHOWN)
+            shown_label.config(text=f"{len(matches)} row(s)" + (f", first {REPORT_ROWS_SHOWN} shown" if more else ""))
+        
+        kind_box.bind("<<ComboboxSelected>>", show)
+        search_var.trace_add("write", show)
+        show()
+        
+        # Email domains
+        domains_frame = ttk.Frame(results, padding=5)
+        domains = ttk.Treeview(domains_frame, columns=("domain", "users"), show="headings")
+        domains.heading("domain", text="Email Domain")
+        domains.heading("users", text="Users")
+        domains.column("domain", width=400)
+        domains.column("users", width=100, anchor="e")
+        for domain, count in index.domains():
+            domains.insert("", "end", values=(domain, count))
+        domains.pack(fill="both", expand=True)
+        results.add(domains_frame, text=f"Email domains ({len(index.by_domain)})")
+        
+        # Actions
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill="x", padx=20, pady=15)
+        
+        def export_issues():
+            filename = timestamped_filename("jira_data_quality")
+            count = write_quality_csv(filename, shown["rows"])
+            messagebox.showinfo("Exported", f"{count} row(s) exported to {filename}", parent=dialog)
+        
+        ttk.Button(btn_frame, text="💾 Export CSV", command=export_issues, width=16).pack(side="left")
+        ttk.Button(btn_frame, text="✖ Close", command=dialog.destroy, width=12).pack(side="right")
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    # ---------------- Group Overlap ---------------- #
+    def show_group_overlap(self):
+        """Near-duplicate, subset, empty and single-member groups, from the loaded group members"""
+        self.run_after_groups_loaded("group_overlap_start", self._start_group_overlap)
+
+    def _start_group_overlap(self):
+        missing = [g["name"] for g in self.groups_data if g["name"] not in self.groups_members]
+        if missing and messagebox.askyesno(
+            "Load Group Members",
+            f"Members are loaded for {len(self.groups_data) - len(missing)} of {len(self.groups_data)} groups.\n\n"
+            f"Load the other {len(missing)} now? (one request per group)\n\n"
+            "Choose No to analyze the loaded groups only."
+        ):
+            self.progress.pack(fill="x", padx=10, pady=(0,10))
+            self.progress.start()
+            checkpoint, resume = self._crawl_checkpoint(MEMBERS)
+            self.scheduler.submit(
+                "load_group_members", self._load_group_members_thread, self.client(dedicated=True), missing, checkpoint, resume
+            )
+            self.scheduler.submit("group_overlap", self._group_overlap_thread, after="load_group_members", lane=LANE_INTERACTIVE)
+        else:
+            self.scheduler.submit("group_overlap", self._group_overlap_thread, lane=LANE_INTERACTIVE)
+
+    def _load_group_members_thread(self, job, client, names, checkpoint, resume=False):
+        """Every member of each group in `names`, saved group by group so an interrupted load can be resumed"""
+        def progress(done, total):
+            if done % 10 == 0 or done == total:
+                self.ui.configure(self.status, text=f"Loading group members... {done}/{total}", foreground="orange")
+        
+        try:
+            self.groups_members.update(crawl_members(checkpoint, client, names, job, resume, progress))
+        except JobCancelled:
+            self.ui.configure(self.status, text="Loading group members cancelled", foreground="blue")
+            raise
+        except Exception as e:
+            self.ui.configure(self.status, text=f"Error loading group members: {e}", foreground="red")
+            raise
+        finally:
+            client.close()
+            self.ui.post(self._stop_progress)
+
+    def _group_overlap_thread(self, job):
+        overlap = GroupOverlap(dict(self.groups_members), self.groups_data)
+        subsets = overlap.subsets()
+        similar = overlap.similar(DEFAULT_THRESHOLD)  # last, so overlap.checked counts its comparisons
+        self.ui.configure(self.status, text=f"Group overlap: {len(similar)} similar pair(s), {len(subsets)} subset(s)", foreground="green")
+        self.ui.post(self._show_group_overlap_dialog, overlap, similar, subsets)
+
+    def _show_group_overlap_dialog(self, overlap, similar, subsets):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Group Overlap")
+        dialog.geometry("900x560")
+        dialog.transient(self.root)
+        
+        ttk.Label(dialog, text="🧩 Group Overlap", font=("", 14, "bold")).pack(pady=(15, 0))
+        note = f"{len(overlap)} groups with members loaded, {len(overlap.index)} distinct members"
+        if overlap.unloaded:
+            note += f" ({len(overlap.unloaded)} group(s) without loaded members skipped)"
+        ttk.Label(dialog, text=note, font=("", 9), foreground="gray").pack(pady=(0, 10))
+        
+        results = ttk.Notebook(dialog)
+        results.pack(fill="both", expand=True, padx=20)
+        
+        def table(parent, columns, labels, widths):
+            frame = ttk.Frame(parent)
+            tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode="browse")
+            for col, label, width in zip(columns, labels, widths):
+                tree.heading(col, text=label)
+                tree.column(col, width=width, anchor="w" if col in ("group", "other") else "e")
+            ysb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=ysb.set)
+            tree.pack(side="left", fill="both", expand=True)
+            ysb.pack(side="right", fill="y")
+            return frame, tree
+        
+        # Similar pairs, with an adjustable threshold
+        similar_tab = ttk.Frame(results, padding=5)
+        results.add(similar_tab, text="Similar pairs")
+        options = ttk.Frame(similar_tab)
+        options.pack(fill="x", pady=(0, 5))
+        ttk.Label(options, text="Jaccard similarity at least").pack(side="left")
+        threshold_box = ttk.Combobox(options, values=("0.3", "0.5", "0.7", "0.8", "0.9", "1.0"), width=6)
+        threshold_box.set(str(DEFAULT_THRESHOLD))
+        threshold_box.pack(side="left", padx=5)
+        checked_label = ttk.Label(options, text="", foreground="gray")
+        checked_label.pack(side="right")
+        frame, similar_tree = table(
+            similar_tab,
+            ("jaccard", "relation", "group", "size", "other", "other_size", "shared"),
+            ("Similarity", "Relation", "Group", "Members", "Other Group", "Members", "Shared"),
+            (80, 80, 220, 70, 220, 70, 70)
+        )
+        frame.pack(fill="both", expand=True)
         
-        filename = f"jira_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        state = {"similar": similar}
+        pairs = len(overlap) * (len(overlap) - 1) // 2
         
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Product Name", "Product URL", "User Name", "User Email", "User Status", "Last Active in Product"])
+        def update_similar(*_):
+            try:
+                state["similar"] = overlap.similar(float(threshold_box.get()))
+            except ValueError:
+                checked_label.config(text="Enter a number between 0 and 1", foreground="red")
+                return
+            checked_label.config(text=f"{overlap.checked} of {pairs} pairs compared", foreground="gray")
+            show_similar()
+        
+        def show_similar():
+            similar_tree.delete(*similar_tree.get_children())
+            for p in state["similar"][:REPORT_ROWS_SHOWN]:
+                similar_tree.insert("", "end", values=(
+                    f"{p['jaccard']:.0%}", p["relation"], p["group"], p["size"], p["other"], p["other_size"], p["shared"]
+                ))
+            results.tab(similar_tab, text=f"Similar pairs ({len(state['similar'])})")
+        
+        threshold_box.bind("<<ComboboxSelected>>", update_similar)
+        threshold_box.bind("<Return>", update_similar)
+        checked_label.config(text=f"{overlap.checked} of {pairs} pairs compared")
+        show_similar()
+        
+        # Subsets
+        frame, subset_tree = table(
+            results,
+            ("group", "size", "other", "other_size"),
+            ("Group", "Members", "Contained In", "Members"),
+            (300, 80, 300, 80)
+        )
+        results.add(frame, text=f"Subsets ({len(subsets)})")
+        for p in subsets[:REPORT_ROWS_SHOWN]:
+            subset_tree.insert("", "end", values=(p["group"], p["size"], p["other"], p["other_size"]))
+        
+        # Empty and single-member groups
+        empty, single = overlap.empty(), overlap.single_member()
+        frame, small_tree = table(results, ("group", "size"), ("Group", "Members"), (500, 80))
+        results.add(frame, text=f"Empty / single-member ({len(empty) + len(single)})")
+        for name in empty:
+            small_tree.insert("", "end", values=(name, 0))
+        for name in single:
+            small_tree.insert("", "end", values=(name, 1))
+        
+        # Actions
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill="x", padx=20, pady=15)
+        
+        def export_overlap():
+            filename = timestamped_filename("jira_group_overlap")
+            count = write_overlap_csv(filename, state["similar"], subsets, empty, single)
+            messagebox.showinfo("Exported", f"{count} row(s) exported to {filename}", parent=dialog)
+        
+        ttk.Button(btn_frame, text="💾 Export CSV", command=export_overlap, width=16).pack(side="left")
+        ttk.Button(btn_frame, text="✖ Close", command=dialog.destroy, width=12).pack(side="right")
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    # ---------------- Group Reconciliation ---------------- #
+    def show_reconcile(self):
+        """Make group memberships match a CSV / JSON file of desired members (plan first, then apply)"""
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Desired group memberships",
+            filetypes=[("CSV or JSON", "*.csv *.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.progress.pack(fill="x", padx=10, pady=(0,10))
+        self.progress.start()
+        self.status.config(text="Reading desired memberships...", foreground="orange")
+        self.scheduler.submit("reconcile_plan", self._reconcile_plan_thread, self.client_factory(), path, self.use_org_api.get())
+
+    def _reconcile_plan_thread(self, job, make_client, path, org_mode):
+        from jira_core.reconcile import load_members, read_desired
+        try:
+            desired = read_desired(path)
+            index = self.user_index
+            if not len(index) and any("@" in key for keys in desired.values() for key in keys):
+                # Emails need the directory: without it every email is "not found"
+                self.ui.configure(self.status, text="Loading users to resolve the file's emails...", foreground="orange")
+                client = make_client()
+                try:
+                    index = UserIndex(client.fetch_users(org_mode, job))
+                finally:
+                    client.close()
+            
+            def progress(done, total):
+                if done % 10 == 0 or done == total:
+                    self.ui.configure(self.status, text=f"Reading group members... {done}/{total}", foreground="orange")
             
-            for product_id, product_data in sorted(self.products_data.items(), key=lambda x: x[1]["name"]):
-                for user in sorted(product_data["users"], key=lambda x: x["name"]):
-                    writer.writerow([
-                        product_data["name"],
-                        product_data["url"],
-                        user["name"],
-                        user["email"],
-                        user["status"],
-                        user["last_active"]
-                    ])
+            current, errors = load_members(make_client, desired, job=job, progress=progress)
+            job.raise_if_cancelled()
+        except JobCancelled:
+            self.ui.configure(self.status, text="Reconcile cancelled", foreground="blue")
+            raise
+        except Exception as e:
+            error_msg = f"Could not plan the reconcile: {e}"
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Reconcile Groups", error_msg))
+            self.ui.configure(self.status, text="Reconcile failed", foreground="red")
+            raise
+        finally:
+            self.ui.post(self._stop_progress)
+        self.groups_members.update(current)  # complete member lists, reused by the other group views
+        self.ui.configure(self.status, text=f"Read the members of {len(current)} group(s)", foreground="green")
+        self.ui.post(self._show_reconcile_dialog, path, desired, current, errors, index)
+
+    def _show_reconcile_dialog(self, path, desired, current, errors, index):
+        from jira_core.reconcile import ReconcilePlan
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Reconcile Groups")
+        dialog.geometry("900x560")
+        dialog.transient(self.root)
         
-        messagebox.showinfo("Exported", f"Products exported to {filename}")
-        self.products_status.config(text="Export complete", foreground="green")
+        ttk.Label(dialog, text="📑 Reconcile Groups", font=("", 14, "bold")).pack(pady=(15, 0))
+        ttk.Label(dialog, text=path, font=("", 9), foreground="gray").pack(pady=(0, 5))
+        summary_label = ttk.Label(dialog, text="", justify="left")
+        summary_label.pack(fill="x", padx=20, pady=(0, 5))
+        
+        options = ttk.Frame(dialog)
+        options.pack(fill="x", padx=20, pady=(0, 5))
+        remove = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Remove members who are not in the file", variable=remove).pack(side="left")
+        shown_label = ttk.Label(options, text="", foreground="gray")
+        shown_label.pack(side="right")
+        
+        table_frame = ttk.Frame(dialog)
+        table_frame.pack(fill="both", expand=True, padx=20)
+        columns = ("group", "action", "name", "email", "account_id", "result")
+        table = ttk.Treeview(table_frame, columns=columns, show="headings")
+        for col, label, width in zip(columns, ("Group", "Change", "Name", "Email", "Account ID", "Result"), (200, 90, 160, 200, 170, 160)):
+            table.heading(col, text=label)
+            table.column(col, width=width)
+        ysb = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=ysb.set)
+        table.pack(side="left", fill="both", expand=True)
+        ysb.pack(side="right", fill="y")
+        
+        change_labels = {
+            "add_group": "➕ Add", "remove_group": "➖ Remove", "unknown_user": "Not found", "unknown_group": "No group",
+            "invalid_row": "Blank row", "removals_held": "⚠ Kept all",
+        }
+        state = {}
+        
+        def show(rows):
+            state["rows"] = rows
+            table.delete(*table.get_children())
+            for r in rows[:REPORT_ROWS_SHOWN]:
+                result = r["result"] + (f": {r['error']}" if r["error"] else "")
+                table.insert("", "end", values=(r["group"], change_labels.get(r["action"], r["action"]), r["name"], r["email"], r["account_id"], result))
+            more = len(rows) - REPORT_ROWS_SHOWN
+            shown_label.config(text=f"{min(len(rows), REPORT_ROWS_SHOWN)} shown" + (f", {more} more in the export" if more > 0 else ""))
+        
+        def replan(*_):
+            state["plan"] = ReconcilePlan(desired, current, index, remove=remove.get(), errors=errors)
+            summary_label.config(text=state["plan"].summary_text(self.metrics.latency("POST group/user")))
+            show(state["plan"].rows())
+        
+        remove.trace_add("write", replan)
+        replan()
+        
+        # Actions
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill="x", padx=20, pady=15)
+        
+        def export_rows():
+            filename = timestamped_filename("jira_reconcile")
+            count = write_reconcile_csv(filename, state["rows"])
+            messagebox.showinfo("Exported", f"{count} row(s) exported to {filename}", parent=dialog)
+        
+        def apply():
+            plan = state["plan"]
+            if not len(plan):
+                messagebox.showinfo("Nothing to Do", "Every listed group already has the listed members.", parent=dialog)
+                return
+            if not messagebox.askyesno(
+                "Confirm Reconcile",
+                f"{plan.summary_text(self.metrics.latency('POST group/user'))}\n\n⚠️ This changes group memberships on the site!",
+                parent=dialog
+            ):
+                return
+            apply_btn.config(state="disabled")
+            self.scheduler.submit("reconcile_apply", self._reconcile_apply_thread, self.client_factory(), plan, show)
+        
+        ttk.Button(btn_frame, text="💾 Export CSV", command=export_rows, width=16).pack(side="left")
+        apply_btn = ttk.Button(btn_frame, text="▶ Apply Changes", command=apply, width=18)
+        apply_btn.pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="✖ Close", command=dialog.destroy, width=12).pack(side="right")
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    def _reconcile_apply_thread(self, job, make_client, plan, show):
+        from jira_core.reconcile import apply_plan, result_counts
+        total = len(plan)
+        
+        def progress(done, _):
+            self.ui.configure(self.status, text=f"Reconciling groups... {done}/{total}", foreground="orange")
+        
+        rows = apply_plan(make_client, plan, job=job, progress=progress)
+        counts = result_counts(rows)
+        for group in {r["group"] for r in rows if r["result"] == "done"}:
+            self.groups_members.pop(group, None)  # changed: reload when next needed
+        text = f"Reconcile complete: {counts.get('done', 0)} done, {counts.get('failed', 0)} failed"
+        if counts.get("cancelled"):
+            text = f"Reconcile cancelled: {counts.get('done', 0)} done, {counts.get('failed', 0)} failed, {counts['cancelled']} not sent"
+        self.ui.configure(self.status, text=text, foreground="red" if counts.get("failed") else "green")
+        
+        def report():
+            try:
+                show(rows)  # results into the plan dialog, if still open
+            except tk.TclError:
+                pass
+            messagebox.showinfo("Reconcile Groups", text.replace(": ", ":\n\n", 1))
+        
+        self.ui.post(report)
 
     def toggle_org_api(self):
         if self.use_org_api.get():
@@ -842,18 +2188,226 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         
         self.tree.configure(displaycolumns=visible_cols)
 
+    # ---------------- Sites (Workspace) ---------------- #
+    def setup_sites_tab(self, parent):
+        """Setup the Sites tab: saved site / org profiles, crawled in parallel into one merged view"""
+        from jira_core.workspace import load_profiles
+        
+        profiles_frame = ttk.LabelFrame(parent, text="🌐 Sites", padding=8)
+        profiles_frame.pack(fill="x", pady=(0, 10))
+        
+        action_bar = ttk.Frame(profiles_frame)
+        action_bar.pack(fill="x", pady=(0, 8))
+        ttk.Button(action_bar, text="➕ Add Current Site", command=self.add_site_profile, width=18).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🗑 Remove", command=self.remove_site_profile, width=12).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="🔄 Fetch All Sites", command=self.fetch_all_sites, width=17).pack(side="left", padx=(0, 5))
+        ttk.Button(action_bar, text="⏹ Cancel", command=lambda: self.scheduler.cancel("workspace_fetch"), width=10).pack(side="left", padx=(0, 5))
+        self.sites_members = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_bar, text="Include group members", variable=self.sites_members).pack(side="left", padx=10)
+        
+        columns = ("site", "email", "org", "state")
+        self.sites_tree = ttk.Treeview(profiles_frame, columns=columns, show="tree headings", height=5)
+        self.sites_tree.heading("#0", text="Name")
+        self.sites_tree.column("#0", width=160)
+        for col, label, width in zip(columns, ("Site", "Email", "Org API", "Last Fetch"), (260, 200, 160, 320)):
+            self.sites_tree.heading(col, text=label)
+            self.sites_tree.column(col, width=width)
+        self.sites_tree.pack(fill="x")
+        
+        merged_frame = ttk.LabelFrame(parent, text="🔗 All Sites", padding=8)
+        merged_frame.pack(fill="both", expand=True)
+        
+        view_bar = ttk.Frame(merged_frame)
+        view_bar.pack(fill="x", pady=(0, 8))
+        self.sites_view = tk.StringVar(value="users")
+        for value, label in (("users", "Users"), ("groups", "Groups"), ("products", "Product Access")):
+            ttk.Radiobutton(view_bar, text=label, value=value, variable=self.sites_view, command=self.refresh_sites_view).pack(side="left", padx=(0, 10))
+        ttk.Label(view_bar, text="Search:").pack(side="left", padx=(10, 5))
+        self.sites_search = tk.StringVar()
+        self.sites_search.trace_add("write", lambda *_: self.refresh_sites_view())
+        ttk.Entry(view_bar, textvariable=self.sites_search, width=30).pack(side="left")
+        ttk.Button(view_bar, text="💾 Export CSV", command=self.export_sites_csv, width=16).pack(side="right")
+        
+        table_frame = ttk.Frame(merged_frame)
+        table_frame.pack(fill="both", expand=True)
+        self.sites_table = ttk.Treeview(table_frame, show="headings")
+        ysb = ttk.Scrollbar(table_frame, orient="vertical", command=self.sites_table.yview)
+        self.sites_table.configure(yscrollcommand=ysb.set)
+        self.sites_table.pack(side="left", fill="both", expand=True)
+        ysb.pack(side="right", fill="y")
+        
+        self.sites_summary = ttk.Label(merged_frame, text="Add each site with ➕ (its credentials are the ones on the Configuration tab), then fetch them all at once", foreground="gray")
+        self.sites_summary.pack(fill="x", pady=(5, 0))
+        
+        self.profiles = load_profiles()
+        self._show_profiles()
+        if self.profiles:
+            self.scheduler.submit("load_profile_secrets", self._load_profile_secrets_thread, list(self.profiles), lane=LANE_INTERACTIVE)
+    
+    def _load_profile_secrets_thread(self, job, profiles):
+        from jira_core.workspace import load_secrets
+        load_secrets(profiles, SERVICE_NAME)  # the keyring can be slow
+    
+    def _show_profiles(self, states=None):
+        states = states or {}
+        self.sites_tree.delete(*self.sites_tree.get_children())
+        for p in self.profiles:
+            org = f"✓ {p.org_id or '(looked up on fetch)'}" if p.org_mode else ""
+            self.sites_tree.insert("", "end", iid=p.name, text=p.name, values=(p.jira_url, p.email, org, states.get(p.name, "")))
+    
+    def add_site_profile(self):
+        """Save the Configuration tab's credentials as a site profile"""
+        from tkinter import simpledialog
+        from jira_core.workspace import Profile, save_profiles
+        credentials = self._credentials()
+        if not credentials["jira_url"] or not credentials["api_token"]:
+            messagebox.showwarning("Add Site", "Enter the Jira URL, email and API token on the Configuration tab first.")
+            return
+        default = urlsplit(credentials["jira_url"]).netloc.split(".")[0] or credentials["jira_url"]
+        name = simpledialog.askstring("Add Site", "Name for this site:", initialvalue=default, parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if any(p.name == name for p in self.profiles) and not messagebox.askyesno("Add Site", f"Replace the site '{name}'?"):
+            return
+        profile = Profile(name, org_mode=self.use_org_api.get(), **credentials)
+        self.profiles = [p for p in self.profiles if p.name != name] + [profile]
+        save_profiles(self.profiles)
+        self._show_profiles()
+        self.scheduler.submit(f"save_profile:{name}", self._save_profile_secrets_thread, profile, lane=LANE_INTERACTIVE)
+    
+    def _save_profile_secrets_thread(self, job, profile):
+        from jira_core.workspace import save_secrets
+        try:
+            save_secrets(profile, SERVICE_NAME)
+        except Exception as e:
+            logger.warning("Could not save the secrets of %s: %s", profile.name, e)
+            self.ui.configure(self.status, text=f"{profile.name}: API token kept for this session only (no keyring)", foreground="orange")
+    
+    def remove_site_profile(self):
+        from jira_core.workspace import delete_secrets, save_profiles
+        selected = self.sites_tree.selection()
+        if not selected or not messagebox.askyesno("Remove Site", f"Remove {', '.join(selected)} from the sites?"):
+            return
+        removed = [p for p in self.profiles if p.name in selected]
+        self.profiles = [p for p in self.profiles if p.name not in selected]
+        save_profiles(self.profiles)
+        self._show_profiles()
+        self.scheduler.submit("delete_profile_secrets", lambda job: [delete_secrets(p, SERVICE_NAME) for p in removed], lane=LANE_INTERACTIVE)
+    
+    def fetch_all_sites(self):
+        """Crawl every site in parallel (one request budget per host) and merge them"""
+        from jira_core.client import JiraClient
+        from jira_core.transport import create_session
+        if not self.profiles:
+            messagebox.showinfo("Fetch All Sites", "No sites yet: add each site with ➕ Add Current Site.")
+            return
+        from jira_core.workspace import fill_session_secrets
+        # The Configuration tab's secrets only go to the profile(s) of that site and email
+        missing = fill_session_secrets(self.profiles, **self._credentials())
+        if missing:
+            messagebox.showwarning(
+                "Fetch All Sites",
+                f"No API token saved for {', '.join(missing)}.\n\n"
+                "Enter that site's credentials on the Configuration tab and add it again with ➕ Add Current Site."
+            )
+            return
+        metrics = self.metrics
+        make_client = lambda profile: JiraClient(metrics=metrics, session=create_session(metrics), **profile.credentials())
+        self._show_profiles({p.name: "waiting..." for p in self.profiles})
+        self.status.config(text=f"Fetching {len(self.profiles)} site(s) in parallel...", foreground="orange")
+        self.scheduler.submit("workspace_fetch", self._fetch_all_sites_thread, list(self.profiles), make_client, self.sites_members.get())
+    
+    def _fetch_all_sites_thread(self, job, profiles, make_client, members):
+        from jira_core.workspace import crawl_workspace
+        
+        def progress(name, message):
+            self.ui.post(self._set_profile_state, name, message)
+        
+        try:
+            merged = crawl_workspace(profiles, make_client, groups=True, members=members, job=job, progress=progress)
+        except JobCancelled:
+            self.ui.configure(self.status, text="Fetch cancelled", foreground="blue")
+            raise
+        rows = {"users": merged.users(), "groups": merged.groups(), "products": merged.products()}  # joined here, off the Tk thread
+        states = {name: f"{len(d.users)} users, {len(d.groups)} groups" for name, d in merged.sources.items()}
+        states.update((name, f"failed: {error}") for name, error in merged.errors.items())
+        self.ui.post(self._workspace_loaded, merged, rows, states)
+    
+    def _set_profile_state(self, name, message):
+        if self.sites_tree.exists(name):
+            self.sites_tree.set(name, "state", message)
+    
+    def _workspace_loaded(self, merged, rows, states):
+        self.workspace = merged
+        self._workspace_rows = rows
+        self._show_profiles(states)
+        self.refresh_sites_view()
+        self.status.config(
+            text=f"{len(merged)} site(s) loaded: {len(rows['users'])} distinct users" + (f", {len(merged.errors)} failed" if merged.errors else ""),
+            foreground="red" if merged.errors else "green"
+        )
+    
+    def refresh_sites_view(self):
+        from jira_core.exporters import WORKSPACE_COLUMNS
+        view = self.sites_view.get()
+        columns = WORKSPACE_COLUMNS[view]
+        table = self.sites_table
+        table.delete(*table.get_children())
+        table.configure(columns=columns)
+        for col in columns:
+            table.heading(col, text=col.replace("_", " ").title())
+            table.column(col, width=110 if col in ("users", "members", "type", "status") else 180)
+        rows = self._workspace_rows.get(view, [])
+        term = self.sites_search.get().strip().lower()
+        if term:
+            rows = [r for r in rows if any(term in str(v).lower() for v in r.values())]
+        for r in rows[:REPORT_ROWS_SHOWN]:
+            table.insert("", "end", values=[r[c] for c in columns])
+        if self.workspace is not None:
+            shown = f"{min(len(rows), REPORT_ROWS_SHOWN)} of {len(rows)} row(s) shown" if len(rows) > REPORT_ROWS_SHOWN else f"{len(rows)} row(s)"
+            self.sites_summary.config(text=f"{self.workspace.summary_text()}\n{shown}", foreground="black")
+    
+    def export_sites_csv(self):
+        if self.workspace is None:
+            messagebox.showwarning("Warning", "Fetch the sites first.")
+            return
+        from jira_core.exporters import write_workspace_csv
+        view = self.sites_view.get()
+        filename = timestamped_filename(f"jira_all_sites_{view}")
+        count = write_workspace_csv(filename, view, self._workspace_rows[view])
+        messagebox.showinfo("Exported", f"{count} row(s) exported to {filename}")
+
     # ---------------- Credentials ---------------- #
     def load_credentials(self):
-        self.jira_url.set(keyring.get_password(SERVICE_NAME, "jira_url") or "")
-        self.email.set(keyring.get_password(SERVICE_NAME, "email") or "")
+        """Read the remembered Jira URL / email off the Tk thread (some keyring backends are slow)"""
         self.org_id.set("")  # Don't load org_id from keyring
         self.api_token.set("")
         self.org_api_key.set("")
+        self.scheduler.submit("load_credentials", self._load_credentials_thread, lane=LANE_INTERACTIVE)
 
-    def save_credentials(self):
-        if self.remember_creds.get():
-            keyring.set_password(SERVICE_NAME, "jira_url", self.jira_url.get())
-            keyring.set_password(SERVICE_NAME, "email", self.email.get())
+    def _load_credentials_thread(self, job):
+        try:
+            import keyring
+            saved = {key: keyring.get_password(SERVICE_NAME, key) or "" for key in ("jira_url", "email")}
+        except Exception as e:
+            logger.warning("Could not read saved credentials: %s", e)
+            saved = {}
+        self.ui.post(self._apply_saved_credentials, saved)
+
+    def _apply_saved_credentials(self, saved):
+        # Don't overwrite anything typed while the keyring was being read
+        for key, var in (("jira_url", self.jira_url), ("email", self.email)):
+            if saved.get(key) and not var.get():
+                var.set(saved[key])
+        self.startup.mark("credentials loaded")
+
+    def save_credentials(self, jira_url, email, remember):
+        """Runs on a worker thread; the values are read on the Tk thread by on_close"""
+        import keyring
+        if remember:
+            keyring.set_password(SERVICE_NAME, "jira_url", jira_url)
+            keyring.set_password(SERVICE_NAME, "email", email)
             # Don't save org_id
         else:
             try:
@@ -869,12 +2423,46 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             pass
 
     def on_close(self):
-        self.save_credentials()
+        credentials = (self.jira_url.get(), self.email.get(), self.remember_creds.get())
+        self.scheduler.shutdown()
+        self.ui.stop()
+        self.watchdog.stop()
         self.root.destroy()
+        # Close the window right away; the keyring write finishes before the process exits
+        threading.Thread(target=self.save_credentials, args=credentials, name="save-credentials").start()
 
     # ---------------- Utilities ---------------- #
-    def auth(self):
-        return HTTPBasicAuth(self.email.get().strip(), self.api_token.get().strip())
+    def client(self, dedicated=False):
+        """JiraClient for the current credentials (read here, on the Tk thread, for the workers).
+
+        dedicated=True gives it its own session (for long crawls, which close it)."""
+        from jira_core.client import JiraClient
+        from jira_core.transport import create_session
+        if dedicated:
+            session = create_session(self.metrics)
+        else:
+            if self.http is None:
+                self.http = create_session(self.metrics)
+            session = self.http
+        return JiraClient(metrics=self.metrics, session=session, **self._credentials())
+
+    def client_factory(self):
+        """make_client() for worker pools (bulk.run_concurrent): a dedicated client per call.
+
+        The credentials are read now, on the Tk thread."""
+        from jira_core.client import JiraClient
+        from jira_core.transport import create_session
+        credentials, metrics = self._credentials(), self.metrics
+        return lambda: JiraClient(metrics=metrics, session=create_session(metrics), **credentials)
+
+    def _credentials(self):
+        return {
+            "jira_url": self.jira_url.get(),
+            "email": self.email.get(),
+            "api_token": self.api_token.get(),
+            "org_id": self.org_id.get(),
+            "org_api_key": self.org_api_key.get(),
+        }
 
     
     def adjust_column_widths(self):
@@ -921,19 +2509,32 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             pass
     
     def clear_tree(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        # Clear selections when clearing tree
-        self.selected_items.clear()
-        self.update_bulk_edit_button()
+        """Delete every row, including the ones detached by filters (the selection is kept)"""
+        items = self._rows.union(self.tree.get_children())
+        if items:
+            self.tree.delete(*items)
+        self._rows = set()
+        self._attached = []
+        self._rows_view = None
+        self._row_count = 0
 
     def clear_data(self):
+        self.ensure_tab("data")
         self.clear_tree()
         self.users_data = []
         self.groups_data = []
+        self.group_index = GroupIndex()
         self.groups_members = {}
         self.users_product_access = {}
-        self.products_data = {}
+        self.product_index = ProductIndex()
+        self.quality_index = DataQualityIndex()
+        self.user_index = UserIndex()
+        self.selection.clear()
+        self.update_bulk_edit_button()
+        self._sort_keys = {}
+        self.previous_crawl = None
+        self.last_diff = None
+        self.changes_btn.config(state="disabled", text="🔀 Changes")
         self.current_view = "users"
         self.tree.configure(show="headings")
         self.clear_filters()
@@ -941,509 +2542,499 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         self.result_count_label.config(text="No results loaded", foreground="gray")
         
         # Clear products tree too
-        for item in self.products_tree.get_children():
-            self.products_tree.delete(item)
-        self.products_count_label.config(text="No products analyzed", foreground="gray")
+        if "products" in self._built_tabs:
+            for item in self.products_tree.get_children():
+                self.products_tree.delete(item)
+            self.products_count_label.config(text="No products analyzed", foreground="gray")
 
     # ---------------- Organization ID ---------------- #
     def fetch_org_id_async(self):
-        threading.Thread(target=self.fetch_org_id, daemon=True).start()
+        self.ensure_tab("data")  # status messages go to the Data tab
+        self.scheduler.submit("fetch_org_id", self.fetch_org_id, self.client(), lane=LANE_INTERACTIVE)
 
-    def fetch_org_id(self):
-        org_api_key = self.org_api_key.get().strip()
-        if not org_api_key:
-            self.root.after(0, lambda: messagebox.showerror(
+    def fetch_org_id(self, job, client):
+        if not client.org_api_key:
+            self.ui.post(lambda: messagebox.showerror(
                 "Error", 
                 "Please enter your Organization API Key first.\n\nClick 'Help: Create Org API Key' for instructions."
             ))
             return
             
-        self.root.after(0, lambda: self.status.config(text="Fetching organization ID...", foreground="orange"))
-        session = create_session()
+        self.ui.configure(self.status, text="Fetching organization ID...", foreground="orange")
         try:
-            r = session.get(
-                "https://api.atlassian.com/admin/v1/orgs",
-                headers={
-                    "Accept": "application/json",
-                    "Authorization": f"Bearer {org_api_key}"
-                },
-                timeout=30
-            )
-            r.raise_for_status()
-            data = r.json()
-            
-            if data.get("data") and len(data["data"]) > 0:
-                org = data["data"][0]
-                org_id = org.get("id")
-                org_name = org.get("attributes", {}).get("name", "Unknown")
-                
-                self.org_id.set(org_id)
-                self.root.after(0, lambda: messagebox.showinfo(
-                    "Organization Found", 
-                    f"Organization: {org_name}\nID: {org_id}"
-                ))
-                self.root.after(0, lambda: self.status.config(text="Organization ID retrieved", foreground="green"))
-            else:
-                raise Exception("No organizations found for this account")
+            org_id, org_name = client.fetch_org()
+            self.ui.post(self.org_id.set, org_id)
+            self.ui.post(lambda: messagebox.showinfo(
+                "Organization Found", 
+                f"Organization: {org_name}\nID: {org_id}"
+            ))
+            self.ui.configure(self.status, text="Organization ID retrieved", foreground="green")
         except Exception as e:
             error_msg = f"Could not fetch org ID: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text="Failed to get org ID", foreground="red"))
-        finally:
-            session.close()
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text="Failed to get org ID", foreground="red")
 
     # ---------------- Token Validation ---------------- #
     def validate_token_async(self):
-        threading.Thread(target=self.validate_token, daemon=True).start()
+        self.ensure_tab("data")  # status messages go to the Data tab
+        self.scheduler.submit("validate_token", self.validate_token, self.client(), lane=LANE_INTERACTIVE)
 
-    def validate_token(self):
-        self.root.after(0, lambda: self.status.config(text="Validating token...", foreground="orange"))
+    def validate_token(self, job, client):
+        self.ui.configure(self.status, text="Validating token...", foreground="orange")
         try:
-            r = requests.get(
-                f"{self.jira_url.get().rstrip('/')}/rest/api/3/myself",
-                auth=self.auth(),
-                headers={"Accept": "application/json"}
-            )
-            if r.status_code == 200:
-                self.root.after(0, lambda: messagebox.showinfo("Success", "API token is valid"))
-                self.root.after(0, lambda: self.status.config(text="Token valid", foreground="green"))
-            else:
-                raise Exception(r.text)
+            client.myself()
+            self.ui.post(lambda: messagebox.showinfo("Success", "API token is valid"))
+            self.ui.configure(self.status, text="Token valid", foreground="green")
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Invalid Token", str(e)))
-            self.root.after(0, lambda: self.status.config(text="Token invalid", foreground="red"))
+            self.ui.post(messagebox.showerror, "Invalid Token", str(e))
+            self.ui.configure(self.status, text="Token invalid", foreground="red")
     
     def validate_and_fetch_all(self):
         """Validate token and automatically fetch users and groups"""
-        threading.Thread(target=self._validate_and_fetch_all_thread, daemon=True).start()
+        self.ensure_tab("data")
+        validate = self.scheduler.submit("validate_token", self._validate_and_fetch_all_thread, self.client(), lane=LANE_INTERACTIVE)
+        # Runs only if validation succeeded
+        self.scheduler.submit("load_after_validate", self._on_token_validated, after=validate, on_ui=True)
+    
+    def _on_token_validated(self, job):
+        """Start the initial loads once the token is known to be good (users first; the two crawls do not wait for each other)"""
+        self.fetch_users_async()
+        self._submit_fetch_groups()
+        self.notebook.select(1)  # Tab index 1 is Users
+        messagebox.showinfo(
+            "Success", 
+            "Token validated!\nUsers and groups are loading..."
+        )
     
-    def _validate_and_fetch_all_thread(self):
+    def _validate_and_fetch_all_thread(self, job, client):
         """Thread worker for validating and fetching all data"""
-        self.root.after(0, lambda: self.status.config(text="Validating token...", foreground="orange"))
+        self.ui.configure(self.status, text="Validating token...", foreground="orange")
         try:
-            # Validate token first
-            r = requests.get(
-                f"{self.jira_url.get().rstrip('/')}/rest/api/3/myself",
-                auth=self.auth(),
-                headers={"Accept": "application/json"}
-            )
-            if r.status_code != 200:
-                raise Exception(r.text)
-            
-            self.root.after(0, lambda: self.status.config(text="Token valid! Loading data...", foreground="green"))
-            
-            # Auto-fetch users
-            self.root.after(100, self.fetch_users_async)
-            
-            # Auto-fetch groups (after a small delay)
-            self.root.after(1000, self.fetch_groups_async)
-            
-            # Switch to Users tab
-            self.root.after(1500, lambda: self.notebook.select(1))  # Tab index 1 is Users
-            
-            self.root.after(2000, lambda: messagebox.showinfo(
-                "Success", 
-                "Token validated!\nUsers and groups are loading..."
-            ))
-            
+            client.myself()
+            self.ui.configure(self.status, text="Token valid! Loading data...", foreground="green")
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Invalid Token", str(e)))
-            self.root.after(0, lambda: self.status.config(text="Token invalid", foreground="red"))
+            self.ui.post(messagebox.showerror, "Invalid Token", str(e))
+            self.ui.configure(self.status, text="Token invalid", foreground="red")
+            raise  # fail the job so the chained loads are cancelled
 
     # ---------------- Async Wrappers ---------------- #
-    def fetch_users_async(self):
+    def fetch_users_async(self, after=()):
+        self.ensure_tab("data")
         # Auto-switch to Users view
         self.data_notebook.select(0)  # Index 0 = Users View
         self.progress.pack(fill="x", padx=10, pady=(0,10))
         self.progress.start()
-        threading.Thread(target=self.fetch_users, daemon=True).start()
+        if not self.scheduler.is_running("fetch_users"):
+            self.watchdog.start_latency("time_to_first_row")
+        # A second click while a crawl is running joins the existing job
+        existing = self.scheduler.get("fetch_users")
+        if existing is not None and not existing.cancelled:
+            return existing
+        history = None
+        if self.keep_history.get():
+            history = default_history_dir(self.jira_url.get())
+        org_mode = self.use_org_api.get()
+        checkpoint, resume = self._crawl_checkpoint(USERS_ORG, self.org_id.get()) if org_mode else self._crawl_checkpoint(USERS_STANDARD)
+        # Joined mode: the site's users are crawled alongside, on a client of their own
+        site_client = self.client(dedicated=True) if org_mode and self.join_site_users.get() else None
+        return self.scheduler.submit(
+            "fetch_users", self.fetch_users, self.client(dedicated=True), org_mode, history, checkpoint, resume, site_client, after=after
+        )
 
-    def fetch_groups_async(self):
+    def fetch_groups_async(self, after=()):
         # Auto-switch to Groups view
         self.data_notebook.select(1)  # Index 1 = Groups View
         self.progress.pack(fill="x", padx=10, pady=(0,10))
         self.progress.start()
-        threading.Thread(target=self.fetch_groups, daemon=True).start()
+        return self._submit_fetch_groups(after)
+
+    def _submit_fetch_groups(self, after=()):
+        existing = self.scheduler.get("fetch_groups")
+        if existing is not None and not existing.cancelled:
+            return existing
+        checkpoint, resume = self._crawl_checkpoint(GROUPS)
+        return self.scheduler.submit("fetch_groups", self.fetch_groups, self.client(), checkpoint, resume, after=after)
+
+    def _crawl_checkpoint(self, kind, org_id=""):
+        """(checkpoint, resume) for a crawl about to start; offers to resume an interrupted one"""
+        checkpoint = CrawlCheckpoint(default_crawl_dir(self.jira_url.get()), kind, org_id)
+        resume = checkpoint.resumable and messagebox.askyesno(
+            "Resume Crawl",
+            f"An interrupted crawl of {CRAWL_LABELS[kind]} can be resumed: {checkpoint.describe()}.\n\n"
+            "Yes: load the saved pages and continue from there\n"
+            "No: start again from the first page"
+        )
+        return checkpoint, resume
+
+    def run_after_groups_loaded(self, name, callback):
+        """Run callback on the UI thread once groups are available, fetching them first if needed"""
+        if self.groups_data:
+            callback()
+            return
+        self.status.config(text="Loading groups...", foreground="orange")
+        self._submit_fetch_groups()
+        self.scheduler.submit(name, lambda job: callback(), after="fetch_groups", on_ui=True)
+
+    def cancel_background_jobs(self):
+        """Cancel running crawls and bulk runs"""
+        if self.scheduler.cancel_all(LANE_BACKGROUND):
+            self.status.config(text="Cancelling...", foreground="orange")
 
     # ---------------- Users ---------------- #
-    def fetch_users(self):
-        if self.use_org_api.get():
-            self.fetch_users_org_api()
+    def fetch_users(self, job, client, org_mode, history=None, checkpoint=None, resume=False, site_client=None):
+        """Crawl all users, streaming each page into the tree as it arrives.
+
+        With `history` (a directory), the crawl is also recorded there as a
+        snapshot generation (see jira_core.history). With a `checkpoint`
+        every page is also saved as it arrives, so an interrupted crawl can
+        be resumed (`resume`: replay the saved pages, then continue). With
+        `site_client` (Org API only) the site's own users are crawled on it
+        at the same time and joined in at the end (see jira_core.joined).
+        """
+        site = None
+        if org_mode:
+            missing = None
+            if not client.org_id:
+                missing = "Please enter an Organization ID or click 'Get Org ID' first"
+            elif not client.org_api_key:
+                missing = "Please enter your Organization API Key.\n\nClick 'Help: Create Org API Key' for instructions."
+            if missing:
+                self.ui.post(messagebox.showerror, "Error", missing)
+                self.ui.post(self._stop_progress)
+                client.close()
+                if site_client is not None:
+                    site_client.close()
+                return
+            if site_client is not None:
+                from jira_core.joined import SiteUsersCrawl
+                site_checkpoint = CrawlCheckpoint(default_crawl_dir(client.jira_url), USERS_STANDARD) if checkpoint is not None else None
+                site = SiteUsersCrawl(site_client, job, site_checkpoint, resume)  # resumed along with the Org API crawl
+            self.ui.configure(self.status, text=f"Fetching users (Org API{' + site' if site else ''})...", foreground="orange")
+            self.ui.post(self._begin_user_stream, "tree headings")
+            fetch = lambda cursor: client.users_org_pages(job, cursor)
         else:
-            self.fetch_users_standard_api()
-
-    def fetch_users_standard_api(self):
-        self.root.after(0, lambda: self.status.config(text="Fetching users (Standard API)...", foreground="orange"))
-        self.current_view = "users"
-        self.tree.configure(show="headings")
+            self.ui.configure(self.status, text="Fetching users (Standard API)...", foreground="orange")
+            self.ui.post(self._begin_user_stream, "headings")
+            fetch = lambda start: client.users_standard_pages(job, start)
+        pages = checkpointed_pages(checkpoint, fetch, resume) if checkpoint is not None else (batch for batch, _ in fetch(None))
 
         users = []
-        start = 0
-        max_results = 1000
-        
-        session = create_session()
-
+        products = self.product_index = ProductIndex()
+        quality = self.quality_index = DataQualityIndex()
+        index = self.user_index = UserIndex()
         try:
-            page = 0
-            while True:
-                page += 1
-                self.root.after(0, lambda p=page, u=len(users): self.status.config(
-                    text=f"Fetching users page {p}... ({u} so far)", 
-                    foreground="orange"
-                ))
-                
-                print(f"Fetching page {page}, start={start}...")
-                
-                r = session.get(
-                    f"{self.jira_url.get().rstrip('/')}/rest/api/3/users/search",
-                    params={
-                        "startAt": start, 
-                        "maxResults": max_results
-                    },
-                    auth=self.auth(),
-                    headers={"Accept": "application/json"},
-                    timeout=30
-                )
-                r.raise_for_status()
-                batch = r.json()
-                
-                if not batch:
-                    break
-                    
-                print(f"Page {page}: got {len(batch)} users")
+            for page, batch in enumerate(pages, 1):
                 users.extend(batch)
-                start += max_results
-                
-                time.sleep(0.3)
-
-            print(f"\nTotal users fetched: {len(users)}")
+                for u in batch:
+                    index.add(u)
+                self.ui.append_rows("users", batch, self._stream_user_rows)
+                quality.add_users(batch)
+                if org_mode:
+                    # Keep the Products tab current while the crawl runs
+                    products.add_users(batch)
+                    self.ui.post(self._products_changed)
+                self.ui.configure(self.status, text=f"Fetching users page {page + 1}... ({len(users)} so far)", foreground="orange")
+
+            logger.info("Total users fetched: %d", len(users))
+            if org_mode:
+                products.prepare()  # search text / sorted members, off the Tk thread
+            joined = ""
+            if site is not None:
+                from jira_core.joined import join_site_users, join_summary
+                self.ui.configure(self.status, text=f"{len(users)} users fetched, waiting for the site's users...", foreground="orange")
+                users = join_site_users(users, site.result())
+                joined = f" ({join_summary(users)})"
+                logger.info("Joined with the site's users: %d users%s", len(users), joined)
+                self.user_index = UserIndex(users)  # the joined records replace the streamed ones
+                quality.add_users(users)  # adds the site-only accounts
+                self.ui.discard_rows("users")
+                self.ui.post(self.clear_tree)  # the streamed rows lack the site status
             
             self.users_data = users
-            self.root.after(0, lambda: self.display_users(users))
-            self.root.after(0, lambda: self.status.config(
-                text=f"{len(users)} users loaded (no last login data available)", 
-                foreground="orange"
-            ))
+            self.ui.post(self._finish_user_stream, users)
+            if org_mode:
+                self.ui.configure(self.status, text=f"{len(users)} users loaded with last login data{joined}", foreground="green")
+            else:
+                self.ui.configure(self.status, text=f"{len(users)} users loaded (no last login data available)", foreground="orange")
+            crawl = Directory(users, list(self.groups_data), dict(self.groups_members), org_mode, client.jira_url)
+            store = self.record_history(history, crawl) if history else None
+            self.diff_with_previous(crawl, store)
+        except JobCancelled:
+            self.ui.discard_rows("users")
+            self.ui.configure(self.status, text="Fetch cancelled", foreground="blue")
+            raise
         except Exception as e:
-            error_msg = f"Error fetching users: {str(e)}"
-            print(error_msg)
-            import traceback
-            traceback.print_exc()
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text=error_msg, foreground="red"))
+            error_msg = f"Error fetching users{' from Org API' if org_mode else ''}: {str(e)}"
+            logger.exception("%s", error_msg)
+            if checkpoint is not None and checkpoint.resumable:
+                saved = checkpoint.describe()
+                self.ui.post(lambda: messagebox.showerror("Error", f"{error_msg}\n\nSaved so far: {saved}. Fetch again to resume."))
+            else:
+                self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text=error_msg, foreground="red")
         finally:
-            session.close()
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.progress.pack_forget())
-
-    def fetch_users_org_api(self):
-        org_id = self.org_id.get().strip()
-        org_api_key = self.org_api_key.get().strip()
-        
-        if not org_id:
-            self.root.after(0, lambda: messagebox.showerror(
-                "Error", 
-                "Please enter an Organization ID or click 'Get Org ID' first"
-            ))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.progress.pack_forget())
-            return
-        
-        if not org_api_key:
-            self.root.after(0, lambda: messagebox.showerror(
-                "Error", 
-                "Please enter your Organization API Key.\n\nClick 'Help: Create Org API Key' for instructions."
-            ))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.progress.pack_forget())
-            return
-
-        self.root.after(0, lambda: self.status.config(text="Fetching users (Org API)...", foreground="orange"))
-        self.current_view = "users"
-        self.tree.configure(show="headings")
-
-        users = []
-        cursor = None
-        page = 0
-        
-        session = create_session()
+            client.close()
+            if site is not None:
+                site.stop()  # no-op once it has finished
+            self.ui.post(self._stop_progress)
 
+    def record_history(self, path, crawl):
+        """Store this crawl (and the groups / members loaded so far) in the snapshot history; returns the store"""
         try:
-            while True:
-                page += 1
-                self.root.after(0, lambda p=page: self.status.config(
-                    text=f"Fetching users page {p}... ({len(users)} so far)", 
-                    foreground="orange"
-                ))
-                
-                params = {}
-                if cursor:
-                    params["cursor"] = cursor
+            store = HistoryStore(path)
+            entry = store.record(crawl)
+            logger.info("Snapshot %s (%s, %d bytes) saved to %s", entry["id"], entry["kind"], entry["bytes"], path)
+            return store
+        except Exception as e:
+            logger.warning("Could not save snapshot history: %s", e)
+            return None
 
-                print(f"Fetching page {page}...")
-                
-                try:
-                    r = session.get(
-                        f"https://api.atlassian.com/admin/v1/orgs/{org_id}/users",
-                        params=params,
-                        headers={
-                            "Accept": "application/json",
-                            "Authorization": f"Bearer {org_api_key}"
-                        },
-                        timeout=30
-                    )
-                    r.raise_for_status()
-                except requests.exceptions.Timeout:
-                    print(f"Timeout on page {page}, retrying...")
-                    time.sleep(2)
-                    r = session.get(
-                        f"https://api.atlassian.com/admin/v1/orgs/{org_id}/users",
-                        params=params,
-                        headers={
-                            "Accept": "application/json",
-                            "Authorization": f"Bearer {org_api_key}"
-                        },
-                        timeout=60
-                    )
-                    r.raise_for_status()
-                
-                data = r.json()
-                
-                if not users and data.get("data"):
-                    print("\nDEBUG - First user from Org API:")
-                    print(json.dumps(data["data"][0], indent=2))
-                
-                batch = data.get("data", [])
-                if not batch:
-                    break
-                    
-                users.extend(batch)
-                print(f"Page {page}: got {len(batch)} users, total: {len(users)}")
-                
-                links = data.get("links", {})
-                if links.get("next"):
-                    next_url = links["next"]
-                    if "cursor=" in next_url:
-                        cursor = next_url.split("cursor=")[-1]
-                        cursor = cursor.split("&")[0]
-                    else:
-                        break
-                else:
-                    break
-                
-                time.sleep(0.5)
+    def diff_with_previous(self, crawl, store=None):
+        """Compare a finished crawl with the previous one of this session (or the history's previous snapshot)"""
+        previous, self.previous_crawl = self.previous_crawl, crawl
+        if previous is not None and previous.org_mode == crawl.org_mode and previous.site == crawl.site:
+            diff = diff_directories(previous, crawl)
+        elif store is not None and len(store.generations) > 1 and store.generations[-2]["org_mode"] == crawl.org_mode:
+            before = store.generations[-2]
+            diff = SnapshotDiff(store.state(before["id"]), directory_state(crawl), before["taken_at"], crawl.fetched_at)
+        else:
+            return  # nothing comparable yet
+        logger.info("Changes since %s: %s", diff.old_label, diff.summary_text())
+        self.last_diff = diff
+        self.ui.post(self._changes_found, diff)
+
+    def _changes_found(self, diff):
+        self.changes_btn.config(state="normal", text=f"🔀 Changes ({len(diff)})")
+        if len(diff):
+            self.status.config(text=f"{self.status.cget('text')} - {len(diff)} change(s) since the previous crawl")
+
+    # ---------------- Streaming Display ---------------- #
+    def _stop_progress(self):
+        self.progress.stop()
+        self.progress.pack_forget()
 
-            print(f"\nTotal users fetched: {len(users)}")
-            
-            self.users_data = users
-            self.root.after(0, lambda: self.display_users_org(users))
-            self.root.after(0, lambda: self.status.config(
-                text=f"{len(users)} users loaded with last login data", 
-                foreground="green"
-            ))
-        except Exception as e:
-            error_msg = f"Error fetching users from Org API: {str(e)}"
-            print(error_msg)
-            import traceback
-            traceback.print_exc()
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text=error_msg, foreground="red"))
-        finally:
-            session.close()
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.progress.pack_forget())
+    def _filters_active(self):
+        """True if any user filter is set (streamed pages are then rendered once, at the end)"""
+        return bool(
+            self.search_var.get() or
+            self.status_filter.get() != "All" or
+            self.type_filter.get() != "All" or
+            self.date_from_picker.get().strip() or
+            self.date_to_picker.get().strip()
+        )
 
-    def display_users(self, users):
+    def _begin_user_stream(self, show):
+        """Prepare the tree for rows streamed in while a user crawl runs"""
+        self.current_view = "users"
+        self.tree.configure(show=show)
         self.clear_tree()
-        # For standard API, we don't have product access data
-        # So we won't make users expandable
-        for idx, u in enumerate(users):
-            last_active = "N/A (use Org API)"
-            
-            email = u.get("emailAddress", "")
-            # Debug: print if email seems incomplete
-            if email and "@" not in email:
-                print(f"DEBUG - Incomplete email for user {u.get('displayName', 'Unknown')}: '{email}'")
-                print(f"  Full user data: {u}")
-            
-            # Show "(No email)" if email is empty
-            if not email:
-                email = "(No email)"
-            
-            # Determine status and tags
-            is_active = u.get("active")
-            status_text = "Active" if is_active else "Inactive"
-            
-            # Build tags list: alternating row + status + user
-            tags = ["user"]
-            tags.append("oddrow" if idx % 2 == 0 else "evenrow")
-            tags.append("active" if is_active else "inactive")
+        self._rows_view = "users"
+        self._sort_keys = {}
 
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    "☐",  # Checkbox - unchecked by default
-                    u.get("displayName", ""),
-                    email,
-                    u.get("accountId", ""),
-                    u.get("accountType", ""),
-                    status_text,
-                    last_active
-                ),
-                tags=tuple(tags)
-            )
+    @ui_handler
+    def _stream_user_rows(self, users):
+        """Append one chunk of freshly fetched users to the tree"""
+        if self.current_view != "users" or self._filters_active():
+            return
+        self._append_user_rows(users)
+        self.watchdog.finish_latency("time_to_first_row")
+        self.result_count_label.config(text=f"Showing {self._row_count} user(s) (loading...)", foreground="orange")
+
+    @ui_handler
+    def _finish_user_stream(self, users):
+        """Crawl finished: render with filters if any, otherwise the streamed rows are already complete"""
+        self.selection.retain(self.user_index.by_id)
+        self.update_bulk_edit_button()
+        if self.current_view != "users":
+            return
+        if self._filters_active() or self._row_count != len(users):
+            self.filter_data()
+            self.watchdog.finish_latency("time_to_first_row")
+            return
+        self.result_count_label.config(text=f"Showing {len(users)} user(s)", foreground="green")
+        self.root.after(10, self.adjust_column_widths)
+
+    @ui_handler
+    def display_users(self, users):
+        self._show_users(users)
         
         # Update footer count
         self.result_count_label.config(
-            text=f"Showing {len(users)} user(s)",
+            text=f"Showing {self._row_count} user(s)",
             foreground="green"
         )
         
         # Adjust column widths to fill window
         self.root.after(10, self.adjust_column_widths)
 
+    @ui_handler
     def display_users_org(self, users):
-        self.clear_tree()
         # Enable tree view for expandable users
         self.tree.configure(show="tree headings")
-        
-        for idx, u in enumerate(users):
-            account_id = u.get("account_id", "")
-            name = u.get("name", "")
-            
-            # Try multiple possible email fields (Org API can vary)
-            email = (
-                u.get("email") or 
-                u.get("emailAddress") or 
-                u.get("user_email") or
-                ""
-            )
-            
-            # For invited users, email might be in a nested field
-            if not email and "account" in u:
-                email = u["account"].get("email", "")
-            
-            account_type = u.get("account_type", "")
-            account_status = u.get("account_status", "")
-            
-            # Debug: print user data if no email found for invited users
-            if not email and account_status and "invited" in account_status.lower():
-                print(f"DEBUG - No email found for invited user: {name}")
-                print(f"  Account status: {account_status}")
-                print(f"  Available fields: {list(u.keys())}")
-                print(f"  Full user data: {json.dumps(u, indent=2)}")
-            
-            # Debug: print if email seems incomplete
-            if email and "@" not in email:
-                print(f"DEBUG - Incomplete email for user {name}: '{email}'")
-                print(f"  Full user data: {u}")
-            
-            # Show "(No email)" if email is empty or show invited status
-            if not email:
-                if account_status and "invited" in account_status.lower():
-                    email = "(Invited - email pending)"
+        self.display_users(users)
+
+    # ---------------- Tree Rows ---------------- #
+    def _sync_rows(self, view, keys, insert):
+        """Make the top-level rows exactly `keys` (item ids), in that order.
+
+        Rows stay in the tree when a filter hides them (detached, with their
+        children and open state), so narrowing a filter detaches the rows
+        that left and widening it reattaches them; only rows never shown
+        before are inserted, through insert(key, index). When the kept rows
+        are still in order and few rows come back, each is moved into place;
+        otherwise the whole order is set in one set_children call.
+        """
+        if self._rows_view != view:
+            self.clear_tree()
+            self._rows_view = view
+        rows, current = self._rows, self._attached
+        wanted = set(keys)
+        removed = [key for key in current if key not in wanted]
+        if removed:
+            self.tree.detach(*removed)
+            current = [key for key in current if key in wanted]
+        remaining = iter(keys)
+        in_order = all(key in remaining for key in current)  # kept rows are a subsequence of keys
+        if in_order and (len(keys) - len(current)) * 10 <= len(keys) + 100:
+            kept = 0
+            for index, key in enumerate(keys):
+                if kept < len(current) and current[kept] == key:
+                    kept += 1
+                elif key in rows:
+                    self.tree.move(key, "", index)
                 else:
-                    email = "(No email)"
-            
-            last_active = u.get("last_active", "")
-            
-            if last_active:
-                try:
-                    dt = parser.isoparse(last_active)
-                    last_active = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception as e:
-                    print(f"Error parsing date for {name}: {e}, raw value: {last_active}")
-            else:
-                last_active = "Never logged in"
-            
-            # Determine tags based on status
-            tags = ["user"]
-            tags.append("oddrow" if idx % 2 == 0 else "evenrow")
-            
-            # Add status-based tag
-            if account_status:
-                status_lower = account_status.lower()
-                if "active" in status_lower and "inactive" not in status_lower:
-                    tags.append("active")
-                elif "inactive" in status_lower:
-                    tags.append("inactive")
-                elif "invited" in status_lower:
-                    tags.append("invited")
-
-            # Insert user as expandable item
-            user_item = self.tree.insert(
-                "",
-                "end",
-                values=(
-                    "☐",  # Checkbox - unchecked by default
-                    name,
-                    email,
-                    account_id,
-                    account_type,
-                    account_status,
-                    last_active
-                ),
-                tags=tuple(tags)
-            )
-            
-            # Store product access data for this user
-            product_access = u.get("product_access", [])
-            if product_access:
-                self.users_product_access[account_id] = product_access
-                # Add placeholder to make it expandable (7 values to match column count)
-                self.tree.insert(user_item, "end", values=("", "Loading products...", "", "", "", "", ""), tags=("placeholder",))
-                print(f"DEBUG: Added expandable placeholder for user {name} with {len(product_access)} products")
-            else:
-                print(f"DEBUG: User {name} has no product_access data")
-        
-        # Update footer count
-        self.result_count_label.config(
-            text=f"Showing {len(users)} user(s)",
-            foreground="green"
+                    insert(key, index)
+        else:
+            for key in keys:
+                if key not in rows:
+                    insert(key, "end")
+            self.tree.set_children("", *keys)
+        changed = bool(removed) or len(keys) != len(current)
+        self._attached = list(keys)
+        self._row_count = len(keys)
+        return changed
+
+    def _restripe(self):
+        """Alternate the row backgrounds by position, with bulk tag commands instead of a call per row"""
+        tree = str(self.tree)
+        for tag in ("oddrow", "evenrow"):
+            self.tree.tk.call(tree, "tag", "remove", tag)
+        if self._attached:
+            self.tree.tk.call(tree, "tag", "add", "oddrow", self._attached[0::2])
+            self.tree.tk.call(tree, "tag", "add", "evenrow", self._attached[1::2])
+
+    def _show_users(self, users):
+        """Show `users` in the Users view (sorted if a column sort is active), reusing existing rows"""
+        if self.sort_column:
+            users = self._sorted_users(users)
+        by_id = {}
+        for u in users:
+            account_id = account_id_of(u)
+            if account_id and account_id not in by_id:
+                by_id[account_id] = u
+        keys = list(by_id)
+        if self._sync_rows("users", keys, lambda key, index: self._insert_user_row(by_id[key], index)) or self.sort_column:
+            self._restripe()
+
+    def _append_user_rows(self, users):
+        """Add freshly fetched users at the end of the Users view"""
+        for u in users:
+            account_id = account_id_of(u)
+            if not account_id or account_id in self._rows:
+                continue
+            self._insert_user_row(u, "end", len(self._attached))
+            self._attached.append(account_id)
+        self._row_count = len(self._attached)
+
+    def _insert_user_row(self, u, index="end", position=0):
+        """Insert one user row, with the accountId as item id; Org API users get an expandable product list"""
+        org_user = "account_id" in u
+        values = org_user_values(u) if org_user else standard_user_values(u)
+        name, _, account_id, _, account_status, _ = values
+        
+        # Determine tags based on status (the stripe is redone by _restripe when rows move)
+        tags = ["user", "oddrow" if position % 2 == 0 else "evenrow"]
+        if org_user:
+            tag = status_tag(account_status)
+            if tag:
+                tags.append(tag)
+        else:
+            tags.append("active" if u.get("active") else "inactive")
+
+        user_item = self.tree.insert(
+            "",
+            index,
+            iid=account_id,
+            values=("☑" if account_id in self.selection else "☐",) + values,
+            tags=tuple(tags)
         )
-        
-        # Adjust column widths to fill window
-        self.root.after(10, self.adjust_column_widths)
+        self._rows.add(account_id)
+        if not org_user:
+            return  # the standard API has no product access data
+        
+        # Store product access data for this user
+        product_access = u.get("product_access", [])
+        if product_access:
+            self.users_product_access[account_id] = product_access
+            # Add placeholder to make it expandable (7 values to match column count)
+            self.tree.insert(user_item, "end", values=("", "Loading products...", "", "", "", "", ""), tags=("placeholder",))
+            logger.debug("Added expandable placeholder for user %s with %d products", name, len(product_access))
+        else:
+            logger.debug("User %s has no product_access data", name)
+
+    def _sorted_users(self, users):
+        """`users` ordered like the active column sort (by the text shown in that column)"""
+        column = USER_COLUMNS.index(self.sort_column)
+        keys = self._sort_keys.setdefault(self.sort_column, {})
+        
+        def sort_key(u):
+            account_id = account_id_of(u)
+            key = keys.get(account_id)
+            if key is None:
+                values = org_user_values(u) if "account_id" in u else standard_user_values(u)
+                key = keys[account_id] = (values[column] or "").lower()
+            return key
+        
+        return sorted(users, key=sort_key, reverse=self.sort_reverse)
+
+    def _show_groups(self, groups):
+        """Show `groups` in the Groups view, reusing existing rows (item id: groupId)"""
+        by_key = {}
+        for g in groups:
+            key = g.get("groupId") or f"group:{g.get('name', '')}"
+            by_key.setdefault(key, g)
+        self._sync_rows("groups", list(by_key), lambda key, index: self._insert_group_row(by_key[key], index))
+
+    def _insert_group_row(self, g, index="end"):
+        key = g.get("groupId") or f"group:{g.get('name', '')}"
+        item = self.tree.insert(
+            "",
+            index,
+            iid=key,
+            values=("", g["name"], "", g.get("groupId", ""), "", g.get("memberCount", "")),  # Empty checkbox for groups
+            tags=("group",)
+        )
+        self.tree.insert(item, "end", values=("", "Loading...", "", "", "", "", ""), tags=("placeholder",))
+        self._rows.add(key)
 
     # ---------------- Groups ---------------- #
-    def fetch_groups(self):
-        self.root.after(0, lambda: self.status.config(text="Fetching groups...", foreground="orange"))
-        self.current_view = "groups"
-        self.tree.configure(show="tree headings")
-        self.clear_tree()
-
-        groups = []
-        start = 0
-        max_results = 50
+    def fetch_groups(self, job, client, checkpoint=None, resume=False):
+        self.ui.configure(self.status, text="Fetching groups...", foreground="orange")
 
         try:
-            while True:
-                r = requests.get(
-                    f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/bulk",
-                    params={"startAt": start, "maxResults": max_results},
-                    auth=self.auth(),
-                    headers={"Accept": "application/json"}
-                )
-                r.raise_for_status()
-                data = r.json()
-                groups.extend(data.get("values", []))
-                if data.get("isLast", True):
-                    break
-                start += max_results
-
+            if checkpoint is not None:
+                groups = [g for batch in checkpointed_pages(checkpoint, lambda start: client.groups_pages(job, start), resume) for g in batch]
+            else:
+                groups = client.fetch_groups(job)
+            self.group_index = GroupIndex(groups)  # built here, off the UI thread
             self.groups_data = groups
 
             def populate():
-                for g in groups:
-                    item = self.tree.insert(
-                        "",
-                        "end",
-                        values=("", g["name"], "", g["groupId"], "", g.get("memberCount", "")),  # Empty checkbox for groups
-                        tags=("group",)
-                    )
-                    self.tree.insert(item, "end", values=("", "Loading...", "", "", "", "", ""), tags=("placeholder",))
+                self.current_view = "groups"
+                self.tree.configure(show="tree headings")
+                self.clear_tree()  # fresh group data: no rows to reuse
+                self._show_groups(groups)
                 self.status.config(text=f"{len(groups)} groups loaded", foreground="green")
                 self.progress.stop()
                 self.progress.pack_forget()
@@ -1454,14 +3045,19 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                     foreground="green"
                 )
 
-            self.root.after(0, populate)
+            self.ui.post(populate)
+        except JobCancelled:
+            self.ui.configure(self.status, text="Fetch cancelled", foreground="blue")
+            self.ui.post(self._stop_progress)
+            raise
         except Exception as e:
             error_msg = f"Error fetching groups: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: self.status.config(text=error_msg, foreground="red"))
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.progress.pack_forget())
+            logger.error("%s", error_msg)
+            self.ui.configure(self.status, text=error_msg, foreground="red")
+            self.ui.post(self._stop_progress)
+            raise  # fail the job so chained dialogs don't open without groups
 
+    @ui_handler(latency="expand")
     def on_group_expand(self, _):
         item = self.tree.focus()
         tags = self.tree.item(item, "tags")
@@ -1471,25 +3067,17 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             values = self.tree.item(item, "values")
             group_name = values[1] if len(values) > 1 else ""  # Index 1 because of checkbox column at index 0
             
-            if not group_name or group_name in self.groups_members:
-                return
+            children = self.tree.get_children(item)
+            if not group_name or not children or "placeholder" not in self.tree.item(children[0], "tags"):
+                return  # members already shown (the row keeps them while a filter hides it)
 
-            self.tree.delete(*self.tree.get_children(item))
+            self.tree.delete(*children)
 
             try:
-                r = requests.get(
-                    f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/member",
-                    params={
-                        "groupname": group_name, 
-                        "maxResults": 1000
-                    },
-                    auth=self.auth(),
-                    headers={"Accept": "application/json"}
-                )
-                r.raise_for_status()
-
-                members = r.json().get("values", [])
-                self.groups_members[group_name] = members
+                members = self.groups_members.get(group_name)
+                if members is None:
+                    members = self.client().group_members(group_name)
+                    self.groups_members[group_name] = members
 
                 for m in members:
                     last_active = "N/A"
@@ -1509,7 +3097,7 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                         tags=("member",)
                     )
             except Exception as e:
-                print(f"Error loading group members: {e}")
+                logger.error("Error loading group members: %s", e)
         
         # Handle user expansion (show product access)
         elif "user" in tags:
@@ -1540,17 +3128,7 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             for product in product_access:
                 product_name = product.get("name", "Unknown")
                 product_url = product.get("url", "")
-                product_last_active = product.get("last_active", "")
-                
-                # Format last active date
-                if product_last_active:
-                    try:
-                        dt = parser.isoparse(product_last_active)
-                        product_last_active = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        pass
-                else:
-                    product_last_active = "Never"
+                product_last_active = format_timestamp(product.get("last_active", ""), "Never")
                 
                 self.tree.insert(
                     item,
@@ -1590,11 +3168,9 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                 self.on_group_expand(event)
 
     # ---------------- Sorting ---------------- #
+    @ui_handler(latency="sort")
     def sort_by_column(self, col):
         """Sort tree contents by column - improved for cross-platform compatibility"""
-        # Get only top-level items (not children)
-        items = [(self.tree.set(i, col), i) for i in self.tree.get_children("")]
-        
         # Toggle sort direction
         if self.sort_column == col:
             self.sort_reverse = not self.sort_reverse
@@ -1602,19 +3178,29 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             self.sort_reverse = False
             self.sort_column = col
         
-        # Sort items
-        try:
-            items.sort(
-                reverse=self.sort_reverse, 
-                key=lambda x: (x[0].lower() if isinstance(x[0], str) else str(x[0]))
-            )
-        except Exception as e:
-            print(f"Sort error: {e}")
-            return
-        
-        # Reorder items in the tree
-        for idx, (_, iid) in enumerate(items):
-            self.tree.move(iid, "", idx)
+        users = [self.user_index.by_id.get(key) for key in self._attached] if self._rows_view == "users" else [None]
+        if None not in users:
+            # Users: sort the model (later filters keep this order) and reorder in one call
+            self._attached = [account_id_of(u) for u in self._sorted_users(users)]
+            self.tree.set_children("", *self._attached)
+            self._restripe()
+        else:
+            # Get only top-level items (not children)
+            items = [(self.tree.set(i, col), i) for i in self.tree.get_children("")]
+            
+            # Sort items
+            try:
+                items.sort(
+                    reverse=self.sort_reverse, 
+                    key=lambda x: (x[0].lower() if isinstance(x[0], str) else str(x[0]))
+                )
+            except Exception as e:
+                logger.error("Sort error: %s", e)
+                return
+            
+            # Reorder items in the tree
+            self._attached = [iid for _, iid in items]
+            self.tree.set_children("", *self._attached)
         
         # Update column heading to show sort direction
         for column in ("name", "email", "id", "type", "status", "last_active"):
@@ -1627,127 +3213,45 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                 self.tree.heading(column, text=heading_text)
 
     # ---------------- Filtering ---------------- #
+    @ui_handler(latency="filter_to_render")
     def filter_data(self):
         if self.current_view == "users":
             self.filter_users()
         elif self.current_view == "groups":
             self.filter_groups()
     
+    def current_user_filter(self):
+        """UserFilter for the current state of the filter widgets"""
+        date_from, date_to = parse_date_range(
+            self.date_from_picker.get().strip(),
+            self.date_to_picker.get().strip()
+        )
+        return UserFilter(
+            term=self.search_var.get(),
+            status=self.status_filter.get(),
+            account_type=self.type_filter.get(),
+            date_from=date_from,
+            date_to=date_to
+        )
+    
+    @ui_handler
     def filter_users(self):
-        term = self.search_var.get().lower()
-        status_filter = self.status_filter.get()
-        type_filter = self.type_filter.get()
-        
-        # Get dates from DateEntry widgets
-        date_from_str = self.date_from_picker.get().strip()
-        date_to_str = self.date_to_picker.get().strip()
-        
-        # Parse date filters
-        date_from = None
-        date_to = None
-        try:
-            if date_from_str:
-                date_from = datetime.strptime(date_from_str, "%Y-%m-%d")
-            if date_to_str:
-                date_to = datetime.strptime(date_to_str, "%Y-%m-%d")
-                date_to = date_to.replace(hour=23, minute=59, second=59)
-        except ValueError:
-            pass
-        
-        if self.use_org_api.get():
-            filtered = []
-            for u in self.users_data:
-                # Search filter
-                if term:
-                    if not (term in (u.get("name", "").lower() or "") or
-                           term in (u.get("email", "").lower() or "") or
-                           term in (u.get("account_id", "").lower() or "")):
-                        continue
-                
-                # Status filter
-                if status_filter != "All":
-                    user_status = u.get("account_status", "")
-                    if user_status.lower() != status_filter.lower():
-                        continue
-                
-                # Type filter
-                if type_filter != "All":
-                    user_type = u.get("account_type", "")
-                    if user_type != type_filter:
-                        continue
-                
-                # Date filter
-                if date_from or date_to:
-                    last_active = u.get("last_active", "")
-                    if last_active:
-                        try:
-                            user_date = parser.isoparse(last_active)
-                            if date_from and user_date < date_from:
-                                continue
-                            if date_to and user_date > date_to:
-                                continue
-                        except:
-                            continue
-                    else:
-                        continue
-                
-                filtered.append(u)
-            
+        org_mode = self.use_org_api.get()
+        filtered = filter_users(self.users_data, self.current_user_filter(), org_mode)
+        if org_mode:
             self.display_users_org(filtered)
         else:
-            filtered = []
-            for u in self.users_data:
-                # Search filter
-                if term:
-                    if not (term in (u.get("displayName", "").lower() or "") or
-                           term in (u.get("emailAddress", "").lower() or "") or
-                           term in (u.get("accountId", "").lower() or "")):
-                        continue
-                
-                # Status filter
-                if status_filter != "All":
-                    is_active = u.get("active", False)
-                    if status_filter == "Active" and not is_active:
-                        continue
-                    if status_filter == "Inactive" and is_active:
-                        continue
-                
-                # Type filter
-                if type_filter != "All":
-                    user_type = u.get("accountType", "")
-                    if user_type != type_filter:
-                        continue
-                
-                filtered.append(u)
-            
             self.display_users(filtered)
     
+    @ui_handler
     def filter_groups(self):
         # Get search term - if groups_search_var doesn't exist or is empty, show all
         term = ""
         if hasattr(self, 'groups_search_var'):
-            term = self.groups_search_var.get().lower()
-        
-        if term:
-            # Filter groups by search term
-            filtered_groups = [
-                g for g in self.groups_data
-                if term in (g.get("name", "").lower() or "") or
-                   term in (g.get("groupId", "").lower() or "")
-            ]
-        else:
-            # Show all groups when no search term
-            filtered_groups = self.groups_data
+            term = self.groups_search_var.get()
         
-        self.clear_tree()
-        for g in filtered_groups:
-            item = self.tree.insert(
-                "",
-                "end",
-                values=("", g["name"], "", g["groupId"], "", g.get("memberCount", "")),  # Empty checkbox for groups
-                tags=("group",)
-            )
-            self.tree.insert(item, "end", values=("", "Loading...", "", "", "", "", ""), tags=("placeholder",))
+        filtered_groups = filter_groups(self.groups_data, term)
+        self._show_groups(filtered_groups)
         
         # Update result count label
         if hasattr(self, 'result_count_label'):
@@ -1773,55 +3277,62 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                     return "break"  # Prevent default behavior
     
     def toggle_item_selection(self, item):
-        """Toggle selection state of an item"""
-        if item in self.selected_items:
-            self.selected_items.remove(item)
-            self.tree.set(item, "select", "☐")
-        else:
-            self.selected_items.add(item)
-            self.tree.set(item, "select", "☑")
+        """Toggle selection state of the user shown in a row"""
+        account_id = self.tree.set(item, "id")
+        if not account_id:
+            return
+        selected = self.selection.toggle(account_id)
+        self.tree.set(item, "select", "☑" if selected else "☐")
         
         # Update bulk edit button state
         self.update_bulk_edit_button()
     
+    @ui_handler
     def toggle_select_all(self):
-        """Toggle selection of all visible items"""
-        if self.current_view != "users":
+        """Select every user matching the current filters, or deselect them if all already are.
+
+        Works on the model: only the rows currently in the tree are redrawn.
+        """
+        if self.current_view != "users" or not self.users_data:
             return
-        
-        # Get all top-level items with "user" tag
-        all_items = [item for item in self.tree.get_children("") if "user" in self.tree.item(item, "tags")]
-        
-        if not all_items:
+        criteria = self.current_user_filter()
+        matching = filter_users(self.users_data, criteria, self.use_org_api.get()) if criteria.active else self.users_data
+        if not matching:
             return
         
         # If all are selected, deselect all. Otherwise, select all
-        if len(self.selected_items) == len(all_items):
-            # Deselect all
-            for item in all_items:
-                self.selected_items.discard(item)
-                self.tree.set(item, "select", "☐")
+        if self.selection.covers(matching):
+            self.selection.deselect(matching)
+            glyph = "☐"
         else:
-            # Select all
-            for item in all_items:
-                self.selected_items.add(item)
-                self.tree.set(item, "select", "☑")
-        
+            self.selection.select(matching)
+            glyph = "☑"
+        rows = self._rows if self._rows_view == "users" else ()
+        self._set_checkboxes([account_id_of(u) for u in matching if account_id_of(u) in rows], glyph)
         self.update_bulk_edit_button()
     
+    def _set_checkboxes(self, items, glyph):
+        """Set the select column of many rows in one Tcl call (a Python loop costs a round trip per row)"""
+        if items:
+            self.tree.tk.call(
+                "apply", "{tree items glyph} {foreach i $items {$tree set $i select $glyph}}",
+                str(self.tree), items, glyph
+            )
+    
     def clear_all_selections(self):
         """Clear all selections"""
-        for item in list(self.selected_items):
-            self.tree.set(item, "select", "☐")
-        self.selected_items.clear()
+        rows = self._rows if self._rows_view == "users" else ()
+        self._set_checkboxes([account_id for account_id in self.selection if account_id in rows], "☐")
+        self.selection.clear()
         self.update_bulk_edit_button()
     
     def update_bulk_edit_button(self):
         """Enable/disable bulk edit button based on selection"""
-        if len(self.selected_items) > 0:
-            self.bulk_edit_btn.config(state="normal")
+        count = len(self.selection)
+        if count > 0:
+            self.bulk_edit_btn.config(state="normal", text=f"⚡ Bulk Edit ({count})")
         else:
-            self.bulk_edit_btn.config(state="disabled")
+            self.bulk_edit_btn.config(state="disabled", text="⚡ Bulk Edit")
     
     # ---------------- Context Menu ---------------- #
     def show_context_menu(self, event):
@@ -1861,7 +3372,7 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         # The user management URL format
         profile_url = f"https://admin.atlassian.com/s/{site_name}/users/{account_id}"
         
-        print(f"Opening user profile: {profile_url}")
+        logger.info("Opening user profile: %s", profile_url)
         webbrowser.open(profile_url)
     
     def copy_account_id(self):
@@ -1936,17 +3447,18 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         if not confirm:
             return
         
-        threading.Thread(target=self._deactivate_user_thread, args=(user,), daemon=True).start()
+        self.scheduler.submit(f"deactivate:{user['account_id']}", self._deactivate_user_thread, self.client(), user, lane=LANE_INTERACTIVE)
     
-    def _deactivate_user_thread(self, user):
+    def _deactivate_user_thread(self, job, client, user):
         """Thread worker for deactivating user"""
+        from jira_core.client import write_succeeded
         try:
-            self.root.after(0, lambda: self.status.config(text=f"Deactivating {user['name']}...", foreground="orange"))
+            self.ui.configure(self.status, text=f"Deactivating {user['name']}...", foreground="orange")
             
             # Note: Jira Cloud doesn't have a direct API to deactivate users
             # This requires the Organization API (admin.atlassian.com)
-            if not self.org_api_key.get():
-                self.root.after(0, lambda: messagebox.showerror(
+            if not client.org_api_key:
+                self.ui.post(lambda: messagebox.showerror(
                     "Organization API Required",
                     "User deactivation requires the Organization API.\n\n"
                     "Please enable and configure the Organization API in the Configuration tab."
@@ -1954,33 +3466,24 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
                 return
             
             # Deactivate via Organization API
-            url = f"https://api.atlassian.com/users/{user['account_id']}/manage/lifecycle/disable"
-            
-            response = requests.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.org_api_key.get()}",
-                    "Accept": "application/json"
-                },
-                timeout=30
-            )
+            response = client.set_lifecycle(user['account_id'], enable=False, job=job)
             
-            if response.status_code in [200, 204]:
-                self.root.after(0, lambda: messagebox.showinfo(
+            if write_succeeded(response):
+                self.ui.post(lambda: messagebox.showinfo(
                     "Success",
                     f"User {user['name']} has been deactivated successfully."
                 ))
-                self.root.after(0, lambda: self.status.config(text="User deactivated", foreground="green"))
+                self.ui.configure(self.status, text="User deactivated", foreground="green")
                 # Refresh the user list
-                self.root.after(0, self.fetch_users_async)
+                self.ui.post(self.fetch_users_async)
             else:
                 raise Exception(f"API returned status {response.status_code}: {response.text}")
                 
         except Exception as e:
             error_msg = f"Failed to deactivate user: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text="Deactivation failed", foreground="red"))
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text="Deactivation failed", foreground="red")
     
     def reactivate_user(self):
         """Reactivate a user account"""
@@ -2000,47 +3503,39 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         if not confirm:
             return
         
-        threading.Thread(target=self._reactivate_user_thread, args=(user,), daemon=True).start()
+        self.scheduler.submit(f"reactivate:{user['account_id']}", self._reactivate_user_thread, self.client(), user, lane=LANE_INTERACTIVE)
     
-    def _reactivate_user_thread(self, user):
+    def _reactivate_user_thread(self, job, client, user):
         """Thread worker for reactivating user"""
+        from jira_core.client import write_succeeded
         try:
-            self.root.after(0, lambda: self.status.config(text=f"Reactivating {user['name']}...", foreground="orange"))
+            self.ui.configure(self.status, text=f"Reactivating {user['name']}...", foreground="orange")
             
-            if not self.org_api_key.get():
-                self.root.after(0, lambda: messagebox.showerror(
+            if not client.org_api_key:
+                self.ui.post(lambda: messagebox.showerror(
                     "Organization API Required",
                     "User reactivation requires the Organization API.\n\n"
                     "Please enable and configure the Organization API in the Configuration tab."
                 ))
                 return
             
-            url = f"https://api.atlassian.com/users/{user['account_id']}/manage/lifecycle/enable"
-            
-            response = requests.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.org_api_key.get()}",
-                    "Accept": "application/json"
-                },
-                timeout=30
-            )
+            response = client.set_lifecycle(user['account_id'], enable=True, job=job)
             
-            if response.status_code in [200, 204]:
-                self.root.after(0, lambda: messagebox.showinfo(
+            if write_succeeded(response):
+                self.ui.post(lambda: messagebox.showinfo(
                     "Success",
                     f"User {user['name']} has been reactivated successfully."
                 ))
-                self.root.after(0, lambda: self.status.config(text="User reactivated", foreground="green"))
-                self.root.after(0, self.fetch_users_async)
+                self.ui.configure(self.status, text="User reactivated", foreground="green")
+                self.ui.post(self.fetch_users_async)
             else:
                 raise Exception(f"API returned status {response.status_code}: {response.text}")
                 
         except Exception as e:
             error_msg = f"Failed to reactivate user: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text="Reactivation failed", foreground="red"))
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text="Reactivation failed", foreground="red")
     
     def add_user_to_group(self):
         """Add selected user to a group"""
@@ -2049,15 +3544,8 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             messagebox.showwarning("No Selection", "Please select a user")
             return
         
-        # Fetch groups if not already loaded
-        if not self.groups_data:
-            self.status.config(text="Loading groups...", foreground="orange")
-            self.fetch_groups()
-            # Wait a moment for groups to load
-            self.root.after(1500, lambda: self._show_group_selector(user, "add"))
-            return
-        
-        self._show_group_selector(user, "add")
+        # Fetch groups first if not already loaded
+        self.run_after_groups_loaded("group_selector", lambda: self._show_group_selector(user, "add"))
     
     def remove_user_from_group(self):
         """Remove selected user from a group"""
@@ -2066,16 +3554,48 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             messagebox.showwarning("No Selection", "Please select a user")
             return
         
-        if not self.groups_data:
-            self.status.config(text="Loading groups...", foreground="orange")
-            self.fetch_groups()
-            self.root.after(1500, lambda: self._show_group_selector(user, "remove"))
+        self.run_after_groups_loaded("group_selector", lambda: self._load_user_groups(
+            [user], "remove_single", lambda members: self._show_group_selector(user, "remove", members)
+        ))
+    
+    def _load_user_groups(self, users, action, then):
+        """Look up the groups `users` belong to, then call then({group name: {accountIds of them in it}}) on the UI thread.
+
+        A repeat for the same users and `action` (what `then` does) joins the lookup already running.
+        """
+        self.status.config(text="Loading group memberships...", foreground="orange")
+        selection = hashlib.sha1("\n".join(sorted(u["account_id"] for u in users)).encode()).hexdigest()[:16]
+        name = f"user_groups:{action}:{selection}"
+        self.scheduler.submit(name, self._user_groups_thread, self.client(dedicated=True), users, then, lane=LANE_INTERACTIVE)
+    
+    def _user_groups_thread(self, job, client, users, then):
+        members = {}
+        try:
+            for i, user in enumerate(users, 1):
+                job.raise_if_cancelled()
+                for g in client.user_groups(user["account_id"]):
+                    members.setdefault(g["name"], set()).add(user["account_id"])
+                if i % 10 == 0 or i == len(users):
+                    self.ui.configure(self.status, text=f"Loading group memberships... {i}/{len(users)}", foreground="orange")
+        except JobCancelled:
+            self.ui.configure(self.status, text="Loading group memberships cancelled", foreground="blue")
+            raise
+        except Exception as e:
+            error_msg = f"Error loading group memberships: {e}"
+            logger.error("%s", error_msg)
+            self.ui.configure(self.status, text=error_msg, foreground="red")
+            raise
+        finally:
+            client.close()
+        self.ui.configure(self.status, text=f"{len(users)} user(s) in {len(members)} group(s)", foreground="green")
+        self.ui.post(then, members)
+    
+    def _show_group_selector(self, user, action, members=None):
+        """Show dialog to select a group for add/remove action (remove: `members` holds the user's groups)"""
+        if action == "remove" and not members:
+            messagebox.showinfo("No Groups", f"{user['name']} is not a member of any group.")
             return
         
-        self._show_group_selector(user, "remove")
-    
-    def _show_group_selector(self, user, action):
-        """Show dialog to select a group for add/remove action"""
         dialog = tk.Toplevel(self.root)
         dialog.title(f"{'Add to' if action == 'add' else 'Remove from'} Group")
         dialog.geometry("500x400")
@@ -2093,117 +3613,81 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         search_entry = ttk.Entry(search_frame, textvariable=search_var)
         search_entry.pack(side="left", fill="x", expand=True, padx=5)
         
-        # Listbox with scrollbar
-        list_frame = ttk.Frame(dialog)
-        list_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-        listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set)
-        listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=listbox.yview)
-        
-        # Populate groups
-        group_names = [g["name"] for g in self.groups_data]
-        group_names.sort()
-        
-        def update_list(*args):
-            term = search_var.get().lower()
-            listbox.delete(0, tk.END)
-            for name in group_names:
-                if term in name.lower():
-                    listbox.insert(tk.END, name)
-        
-        search_var.trace("w", update_list)
-        update_list()
+        # Group list (remove: only the user's groups)
+        picker = GroupPicker(dialog, self.group_index, search_var, within=set(members) if action == "remove" else None)
+        picker.pack(fill="both", expand=True, padx=10, pady=5)
+        search_entry.focus()
         
         # Buttons
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(fill="x", padx=10, pady=10)
         
         def on_ok():
-            selection = listbox.curselection()
-            if not selection:
+            group_name = picker.get()
+            if not group_name:
                 messagebox.showwarning("No Selection", "Please select a group")
                 return
             
-            group_name = listbox.get(selection[0])
             dialog.destroy()
             
             if action == "add":
-                threading.Thread(target=self._add_user_to_group_thread, args=(user, group_name), daemon=True).start()
+                self.scheduler.submit(f"add_group:{user['account_id']}:{group_name}", self._add_user_to_group_thread, self.client(), user, group_name, lane=LANE_INTERACTIVE)
             else:
-                threading.Thread(target=self._remove_user_from_group_thread, args=(user, group_name), daemon=True).start()
+                self.scheduler.submit(f"remove_group:{user['account_id']}:{group_name}", self._remove_user_from_group_thread, self.client(), user, group_name, lane=LANE_INTERACTIVE)
         
         ttk.Button(btn_frame, text="OK", command=on_ok, width=15).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Cancel", command=dialog.destroy, width=15).pack(side="left")
         
-        # Bind double-click
-        listbox.bind("<Double-Button-1>", lambda e: on_ok())
+        # Bind double-click and Enter key
+        picker.listbox.bind("<Double-Button-1>", lambda e: on_ok())
+        dialog.bind("<Return>", lambda e: on_ok())
+        search_entry.bind("<Down>", lambda e: (picker.listbox.focus(), picker.move(1)))
     
-    def _add_user_to_group_thread(self, user, group_name):
+    def _add_user_to_group_thread(self, job, client, user, group_name):
         """Thread worker for adding user to group"""
+        from jira_core.client import write_succeeded
         try:
-            self.root.after(0, lambda: self.status.config(text=f"Adding {user['name']} to {group_name}...", foreground="orange"))
+            self.ui.configure(self.status, text=f"Adding {user['name']} to {group_name}...", foreground="orange")
             
-            response = requests.post(
-                f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/user",
-                params={"groupname": group_name},
-                json={"accountId": user['account_id']},
-                auth=self.auth(),
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json"
-                },
-                timeout=30
-            )
+            response = client.add_to_group(user['account_id'], group_name, job=job)
             
-            if response.status_code in [200, 201]:
-                self.root.after(0, lambda: messagebox.showinfo(
+            if write_succeeded(response, "add_group"):
+                self.ui.post(lambda: messagebox.showinfo(
                     "Success",
                     f"User {user['name']} added to group '{group_name}' successfully."
                 ))
-                self.root.after(0, lambda: self.status.config(text="User added to group", foreground="green"))
+                self.ui.configure(self.status, text="User added to group", foreground="green")
             else:
                 raise Exception(f"API returned status {response.status_code}: {response.text}")
                 
         except Exception as e:
             error_msg = f"Failed to add user to group: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text="Failed to add to group", foreground="red"))
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text="Failed to add to group", foreground="red")
     
-    def _remove_user_from_group_thread(self, user, group_name):
+    def _remove_user_from_group_thread(self, job, client, user, group_name):
         """Thread worker for removing user from group"""
+        from jira_core.client import write_succeeded
         try:
-            self.root.after(0, lambda: self.status.config(text=f"Removing {user['name']} from {group_name}...", foreground="orange"))
+            self.ui.configure(self.status, text=f"Removing {user['name']} from {group_name}...", foreground="orange")
             
-            response = requests.delete(
-                f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/user",
-                params={
-                    "groupname": group_name,
-                    "accountId": user['account_id']
-                },
-                auth=self.auth(),
-                headers={"Accept": "application/json"},
-                timeout=30
-            )
+            response = client.remove_from_group(user['account_id'], group_name, job=job)
             
-            if response.status_code in [200, 204]:
-                self.root.after(0, lambda: messagebox.showinfo(
+            if write_succeeded(response, "remove_group"):
+                self.ui.post(lambda: messagebox.showinfo(
                     "Success",
                     f"User {user['name']} removed from group '{group_name}' successfully."
                 ))
-                self.root.after(0, lambda: self.status.config(text="User removed from group", foreground="green"))
+                self.ui.configure(self.status, text="User removed from group", foreground="green")
             else:
                 raise Exception(f"API returned status {response.status_code}: {response.text}")
                 
         except Exception as e:
             error_msg = f"Failed to remove user from group: {str(e)}"
-            print(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
-            self.root.after(0, lambda: self.status.config(text="Failed to remove from group", foreground="red"))
+            logger.error("%s", error_msg)
+            self.ui.post(lambda: messagebox.showerror("Error", error_msg))
+            self.ui.configure(self.status, text="Failed to remove from group", foreground="red")
     
     def manage_product_access(self):
         """Manage product access for a user"""
@@ -2228,21 +3712,12 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             messagebox.showinfo("Info", "Bulk edit is only available in Users view.")
             return
         
-        if not self.selected_items:
+        if not len(self.selection):
             messagebox.showwarning("No Selection", "Please select users from the main view first.")
             return
         
-        # Get selected user data
-        selected_users = []
-        for item in self.selected_items:
-            values = self.tree.item(item, "values")
-            if len(values) >= 4:
-                selected_users.append({
-                    "name": values[1],
-                    "email": values[2],
-                    "account_id": values[3],
-                    "status": values[5] if len(values) > 5 else "Unknown"
-                })
+        # Selected users straight from the model (rows of hidden users are not needed)
+        selected_users = self.selection.users(self.user_index)
         
         if not selected_users:
             messagebox.showwarning("Error", "Could not retrieve user data for selected items.")
@@ -2291,8 +3766,7 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         preview_listbox.pack(side="left", fill="both", expand=True)
         preview_scrollbar.config(command=preview_listbox.yview)
         
-        for user in selected_users:
-            preview_listbox.insert(tk.END, f"• {user['name']} ({user['email']})")
+        preview_listbox.insert(tk.END, *(f"• {user['name']} ({user['email']})" for user in selected_users))
         
         # Action selection
         action_frame = ttk.LabelFrame(dialog, text="🎯 Select Action", padding=15)
@@ -2343,7 +3817,6 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         
         def execute_action():
             action = action_var.get()
-            count = len(selected_users)
             
             # Close the bulk edit dialog
             dialog.destroy()
@@ -2352,27 +3825,10 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
             if action in ["add_group", "remove_group"]:
                 self._bulk_group_action(selected_users, action)
             else:
-                # For direct actions (deactivate/reactivate), confirm first then execute
-                action_names = {
-                    "deactivate": "Deactivate",
-                    "reactivate": "Reactivate"
-                }
-                
-                confirm = messagebox.askyesno(
-                    "Confirm Bulk Action",
-                    f"Execute '{action_names.get(action, action)}' on {count} user(s)?\n\n"
-                    f"⚠️ This action cannot be undone!"
-                )
-                
-                if not confirm:
-                    return
-                
-                # Execute direct action
-                threading.Thread(
-                    target=self._execute_bulk_action_thread, 
-                    args=(selected_users, action), 
-                    daemon=True
-                ).start()
+                # For direct actions (deactivate/reactivate), confirm the dry run first then execute
+                plan = self._plan_bulk_action(selected_users, action)
+                if self._confirm_bulk_plan(plan):
+                    self._submit_bulk_action(plan)
         
         def cancel_action():
             dialog.destroy()
@@ -2392,14 +3848,17 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         ).pack(side="right", padx=5)
     
     
-    def _bulk_group_action(self, users, action):
-        """Handle bulk add/remove from group - requires group selection"""
+    def _bulk_group_action(self, users, action, members=None):
+        """Handle bulk add/remove from group - requires group selection (remove: the users' groups in `members`)"""
         if not self.groups_data:
-            # Auto-fetch groups if not loaded
-            self.status.config(text="Loading groups...", foreground="orange")
-            self.fetch_groups()
-            # Wait for groups to load, then retry
-            self.root.after(1500, lambda: self._bulk_group_action(users, action))
+            # Auto-fetch groups, then reopen this dialog once they are ready
+            self.run_after_groups_loaded("bulk_group_dialog", lambda: self._bulk_group_action(users, action))
+            return
+        if action == "remove_group" and members is None:
+            self._load_user_groups(users, action, lambda members: self._bulk_group_action(users, action, members))
+            return
+        if action == "remove_group" and not members:
+            messagebox.showinfo("No Groups", "None of the selected users is a member of any group.")
             return
         
         # Show enhanced group selector dialog
@@ -2440,41 +3899,15 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         list_frame = ttk.LabelFrame(dialog, text="📋 Available Groups", padding=10)
         list_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
         
-        # Listbox with scrollbar
-        listbox_frame = ttk.Frame(list_frame)
-        listbox_frame.pack(fill="both", expand=True)
-        
-        scrollbar = ttk.Scrollbar(listbox_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-        listbox = tk.Listbox(
-            listbox_frame, 
-            yscrollcommand=scrollbar.set,
-            font=("", 10),
-            activestyle="dotbox"
+        # Group list with member counts (remove: only groups the selected users are in)
+        title = "📋 Available Groups" if action == "add_group" else "📋 Groups of the Selected Users"
+        picker = GroupPicker(
+            list_frame, self.group_index, search_var,
+            within=set(members) if action == "remove_group" else None,
+            members=members, selected_count=len(users),
+            on_change=lambda shown, total: list_frame.config(text=f"{title} ({shown} of {total} shown)"),
         )
-        listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=listbox.yview)
-        
-        # Store all group names sorted
-        all_groups = sorted([g["name"] for g in self.groups_data])
-        
-        def update_list(*args):
-            """Update listbox based on search term"""
-            term = search_var.get().lower()
-            listbox.delete(0, tk.END)
-            
-            for group_name in all_groups:
-                if term in group_name.lower():
-                    listbox.insert(tk.END, group_name)
-            
-            # Show count
-            visible_count = listbox.size()
-            list_frame.config(text=f"📋 Available Groups ({visible_count} shown)")
-        
-        # Bind search
-        search_var.trace("w", update_list)
-        update_list()  # Initial population
+        picker.pack(fill="both", expand=True)
         
         # Info label
         info_label = ttk.Label(
@@ -2490,32 +3923,21 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         btn_frame.pack(fill="x", padx=20, pady=(0, 20))
         
         def on_ok():
-            selection = listbox.curselection()
-            if not selection:
+            group_name = picker.get()
+            if not group_name:
                 messagebox.showwarning("No Selection", "Please select a group")
                 return
             
-            group_name = listbox.get(selection[0])
-            
-            # Confirm the action
-            confirm = messagebox.askyesno(
-                "Confirm Bulk Group Action",
-                f"{action_text} '{group_name}' for {len(users)} user(s)?\n\n"
-                f"Users:\n" + "\n".join([f"  • {u['name']}" for u in users[:5]]) +
-                (f"\n  ... and {len(users) - 5} more" if len(users) > 5 else "")
-            )
-            
-            if not confirm:
+            # Confirm the dry run (remove: the lookup tells exactly who is in the group)
+            known = members.get(group_name, set()) if members is not None else None
+            plan = self._plan_bulk_action(users, action, group_name, known)
+            if not self._confirm_bulk_plan(plan, parent=dialog):
                 return
             
             dialog.destroy()
             
             # Execute the bulk action
-            threading.Thread(
-                target=self._execute_bulk_action_thread, 
-                args=(users, action, group_name), 
-                daemon=True
-            ).start()
+            self._submit_bulk_action(plan)
         
         def on_cancel():
             dialog.destroy()
@@ -2535,143 +3957,92 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         ).pack(side="right", padx=5)
         
         # Bind double-click and Enter key
-        listbox.bind("<Double-Button-1>", lambda e: on_ok())
-        listbox.bind("<Return>", lambda e: on_ok())
+        picker.listbox.bind("<Double-Button-1>", lambda e: on_ok())
+        dialog.bind("<Return>", lambda e: on_ok())
+        search_entry.bind("<Down>", lambda e: (picker.listbox.focus(), picker.move(1)))
         
         # Bind Escape to cancel
         dialog.bind("<Escape>", lambda e: on_cancel())
     
-    def _execute_bulk_action_thread(self, users, action, group_name=None):
-        """Execute bulk action on multiple users"""
-        total = len(users)
-        success_count = 0
-        fail_count = 0
+    def _plan_bulk_action(self, users, action, group_name=None, members=None):
+        """BulkPlan for `users`, dropping the no-ops the loaded data can tell about.
+
+        `members` are accountIds looked up per user (exact for these users);
+        otherwise the group's loaded members are used, trusted for removes
+        only if all of them are loaded.
+        """
+        from jira_core.bulk import GROUP_ACTIONS, plan_bulk_action
+        complete = members is not None
+        if members is None and action in GROUP_ACTIONS and group_name in self.groups_members:
+            members = {account_id_of(m) for m in self.groups_members[group_name]}
+            count = self.group_index.member_count(group_name)
+            complete = count is not None and len(members) >= count
+        return plan_bulk_action(users, action, group_name, members, complete)
+    
+    def _confirm_bulk_plan(self, plan, parent=None):
+        """Show the dry run of `plan` and ask to go ahead (just informs if nothing needs sending)"""
+        summary = plan.summary_text(self.metrics.latency(plan.endpoint))
+        if not plan.calls:
+            messagebox.showinfo("Nothing to Do", f"{summary}\n\nNo request needs to be sent.", parent=parent)
+            return False
+        names = "\n".join(f"  • {u['name']}" for u in plan.calls[:5])
+        if len(plan.calls) > 5:
+            names += f"\n  ... and {len(plan.calls) - 5} more"
+        return messagebox.askyesno(
+            "Confirm Bulk Action",
+            f"{summary}\n\nUsers:\n{names}\n\n⚠️ This action cannot be undone!",
+            parent=parent
+        )
+    
+    def _submit_bulk_action(self, plan):
+        """Queue a bulk run for a BulkPlan; an identical run already in flight is not started twice"""
+        name = f"bulk:{plan.action}:{plan.group_name or ''}"
+        job = self.scheduler.submit(name, self._execute_bulk_action_thread, self.client(), plan)
+        if job.args[1] is not plan:
+            messagebox.showinfo("Bulk Action Running", "The same bulk action is already running. Wait for it to finish or cancel it first.")
+        return job
+    
+    def _execute_bulk_action_thread(self, job, client, plan):
+        """Execute bulk action on multiple users (only the calls in the plan)"""
+        from jira_core.bulk import run_bulk_action
+        action = plan.action
+        self.ui.configure(self.status, text=f"Processing bulk action on {len(plan.calls)} user(s)...", foreground="orange")
         
-        self.root.after(0, lambda: self.status.config(text=f"Processing bulk action on {total} user(s)...", foreground="orange"))
+        def progress(i, total, user):
+            self.ui.configure(self.status, text=f"Processing {i}/{total}: {user['name']}...", foreground="orange")
         
-        for i, user in enumerate(users, 1):
-            try:
-                self.root.after(0, lambda u=user, idx=i: self.status.config(
-                    text=f"Processing {idx}/{total}: {u['name']}...", foreground="orange"
-                ))
-                
-                if action == "deactivate":
-                    url = f"https://api.atlassian.com/users/{user['account_id']}/manage/lifecycle/disable"
-                    response = requests.post(url, headers={"Authorization": f"Bearer {self.org_api_key.get()}"}, timeout=30)
-                
-                elif action == "reactivate":
-                    url = f"https://api.atlassian.com/users/{user['account_id']}/manage/lifecycle/enable"
-                    response = requests.post(url, headers={"Authorization": f"Bearer {self.org_api_key.get()}"}, timeout=30)
-                
-                elif action == "add_group":
-                    response = requests.post(
-                        f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/user",
-                        params={"groupname": group_name},
-                        json={"accountId": user['account_id']},
-                        auth=self.auth(),
-                        headers={"Accept": "application/json", "Content-Type": "application/json"},
-                        timeout=30
-                    )
-                
-                elif action == "remove_group":
-                    response = requests.delete(
-                        f"{self.jira_url.get().rstrip('/')}/rest/api/3/group/user",
-                        params={"groupname": group_name, "accountId": user['account_id']},
-                        auth=self.auth(),
-                        headers={"Accept": "application/json"},
-                        timeout=30
-                    )
-                
-                if response.status_code in [200, 201, 204]:
-                    success_count += 1
-                else:
-                    fail_count += 1
-                    print(f"Failed for {user['name']}: {response.status_code} - {response.text}")
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                fail_count += 1
-                print(f"Error processing {user['name']}: {str(e)}")
+        result = run_bulk_action(client, plan.calls, action, plan.group_name, job=job, progress=progress)
         
         # Show results
-        result_msg = f"Bulk action completed:\n\n✓ Success: {success_count}\n✗ Failed: {fail_count}"
-        self.root.after(0, lambda: messagebox.showinfo("Bulk Action Complete", result_msg))
-        self.root.after(0, lambda: self.status.config(text=f"Bulk action complete: {success_count} success, {fail_count} failed", foreground="green"))
+        result_msg = f"Bulk action completed:\n\n✓ Success: {result.success}\n✗ Failed: {result.failed}"
+        if result.cancelled:
+            result_msg = f"Bulk action cancelled:\n\n✓ Success: {result.success}\n✗ Failed: {result.failed}\n⏹ Skipped: {result.skipped}"
+        if plan.skipped:
+            result_msg += f"\n➖ No change needed: {len(plan.skipped)}"
+        self.ui.post(lambda: messagebox.showinfo("Bulk Action Complete", result_msg))
+        self.ui.configure(self.status, text=f"Bulk action complete: {result.success} success, {result.failed} failed", foreground="green")
         
         # Refresh user list
         if action in ["deactivate", "reactivate"]:
-            self.root.after(0, self.fetch_users_async)
+            self.ui.post(self.fetch_users_async)
 
     # ---------------- Export ---------------- #
+    @ui_handler
     def export_csv(self):
         if self.current_view == "users":
             if not self.users_data:
                 messagebox.showwarning("Warning", "No users to export.")
                 return
-            filename = f"jira_users_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Display Name", "Email", "Account ID", "Account Type", "Status", "Last Active"])
-                
-                if self.use_org_api.get():
-                    for u in self.users_data:
-                        last_active = u.get("last_active", "")
-                        if last_active:
-                            try:
-                                dt = parser.isoparse(last_active)
-                                last_active = dt.strftime("%Y-%m-%d %H:%M:%S")
-                            except:
-                                pass
-                        writer.writerow([
-                            u.get("name", ""),
-                            u.get("email", ""),
-                            u.get("account_id", ""),
-                            u.get("account_type", ""),
-                            u.get("account_status", ""),
-                            last_active
-                        ])
-                else:
-                    for u in self.users_data:
-                        writer.writerow([
-                            u.get("displayName", ""),
-                            u.get("emailAddress", ""),
-                            u.get("accountId", ""),
-                            u.get("accountType", ""),
-                            "Active" if u.get("active") else "Inactive",
-                            "N/A (use Org API)"
-                        ])
+            filename = timestamped_filename("jira_users")
+            write_users_csv(filename, self.users_data, self.use_org_api.get())
             messagebox.showinfo("Exported", f"Users exported to {filename}")
 
         elif self.current_view == "groups":
             if not self.groups_data:
                 messagebox.showwarning("Warning", "No groups to export.")
                 return
-            filename = f"jira_groups_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Group Name", "Group ID", "Member Count", "Member Name", "Member Email", "Member ID", "Member Type", "Member Status", "Last Active"])
-                for g in self.groups_data:
-                    group_name = g.get("name", "")
-                    group_id = g.get("groupId", "")
-                    members = self.groups_members.get(group_name, [])
-                    member_count = len(members)
-                    if members:
-                        for m in members:
-                            writer.writerow([
-                                group_name,
-                                group_id,
-                                member_count,
-                                m.get("displayName", ""),
-                                m.get("emailAddress", ""),
-                                m.get("accountId", ""),
-                                m.get("accountType", ""),
-                                "Active" if m.get("active") else "Inactive",
-                                "N/A"
-                            ])
-                    else:
-                        writer.writerow([group_name, group_id, member_count, "", "", "", "", "", ""])
+            filename = timestamped_filename("jira_groups")
+            write_groups_csv(filename, self.groups_data, self.groups_members)
             messagebox.showinfo("Exported", f"Groups exported to {filename}")
     
     def export_groups_csv(self):
@@ -2679,20 +4050,13 @@ Note: Use an UNSCOPED API key for full access to user endpoints.
         if not self.groups_data:
             messagebox.showwarning("Warning", "No groups to export.")
             return
-        filename = f"jira_groups_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Group Name", "Group ID", "Member Count"])
-            for g in self.groups_data:
-                writer.writerow([
-                    g.get("name", ""),
-                    g.get("groupId", ""),
-                    g.get("memberCount", "")
-                ])
+        filename = timestamped_filename("jira_groups")
+        write_group_summary_csv(filename, self.groups_data)
         messagebox.showinfo("Exported", f"Groups exported to {filename}")
 
 # ---------------- START ---------------- #
 if __name__ == "__main__":
+    setup_logging()
     root = tk.Tk()
     JiraUserApp(root)
     root.mainloop()